@@ -1,147 +1,265 @@
 `timescale 1ns / 1ps
 `default_nettype none
 
+// Fully pipelined half-precision adder.
+//
+// Each stage (DECODE -> ALIGN -> CALCULATE -> NORMALIZE -> PACK) owns its
+// registers and a valid bit, so a new operand pair can be accepted on every
+// clock. valid_out rises on the fifth clock edge after the one that samples
+// valid_in, the same latency as the original IDLE..PACK state machine, and
+// is a one-cycle pulse per result.
+//
+// The datapath keeps GUARD_BITS below the fp16 mantissa, so the bits shifted
+// out during alignment take part in the sum and the result is truncated only
+// once, after normalization. For fused multiply-add, b can be an unrounded
+// product: b_ext carries the product bits below b's mantissa (tie it to zero
+// for a plain fp16 add).
+//
+// With early_en set, operand pairs whose result needs no arithmetic (a NaN,
+// Inf or zero operand, or exponents so far apart that the smaller operand is
+// shifted out entirely) skip DECODE..NORMALIZE: valid_out rises on the edge
+// after the one that samples valid_in. Results stay in order, so a pair only
+// leaves early when no older pair is still in the pipeline, otherwise it
+// takes the full latency. early_en is sampled together with the operands.
 module fpu_adder (
     input wire clk,
     input wire rst_n,
     input wire [15:0] a,
     input wire [15:0] b,
+    input wire [10:0] b_ext,
     input wire valid_in,
+    input wire early_en,
     output reg [15:0] result,
     output reg valid_out
 );
 
-    localparam IDLE       = 3'd0;
-    localparam DECODE     = 3'd1;
-    localparam ALIGN      = 3'd2;
-    localparam CALCULATE  = 3'd3;
-    localparam NORMALIZE  = 3'd4;
-    localparam PACK       = 3'd5;
-
-    reg [2:0] state;
+    localparam GUARD_BITS = 11;
 
+    // === Stage 0: input registers ===
+    reg        s0_valid;
     reg [15:0] reg_a, reg_b;
+    reg [GUARD_BITS-1:0] reg_b_ext;
+    reg        reg_early_en;
+
+    // === Stage 1: DECODE ===
+    reg        s1_valid;
+    reg [4:0]  s1_exp_a, s1_exp_b;
+    reg        s1_sign_a, s1_sign_b;
+    reg [10+GUARD_BITS:0] s1_frac_a, s1_frac_b;
+    reg        s1_is_nan_a, s1_is_nan_b;
+    reg        s1_is_inf_a, s1_is_inf_b;
 
-    reg sign_a, sign_b;
-    reg [4:0] exp_max;
-    reg [10:0] frac_a, frac_b;
-    reg is_nan_a, is_nan_b;
-    reg is_inf_a, is_inf_b;
+    // === Stage 2: ALIGN ===
+    reg        s2_valid;
+    reg        s2_sign_a, s2_sign_b;
+    reg [4:0]  s2_exp_max;
+    reg [10+GUARD_BITS:0] s2_aligned_a, s2_aligned_b;
+    reg        s2_is_nan;
+    reg        s2_is_inf_a, s2_is_inf_b;
+    reg        s2_is_conflicting_inf;
 
-    reg [10:0] aligned_a, aligned_b;
+    // === Stage 3: CALCULATE ===
+    reg        s3_valid;
+    reg        s3_sign_a, s3_sign_b;
+    reg [4:0]  s3_exp_max;
+    reg [11+GUARD_BITS:0] s3_sum;
+    reg        s3_result_sign;
+    reg        s3_is_nan;
+    reg        s3_is_inf_a, s3_is_inf_b;
 
-    reg [11:0] sum;
-    reg result_sign;
+    // === Stage 4: NORMALIZE ===
+    reg        s4_valid;
+    reg        s4_sign_a, s4_sign_b;
+    reg [4:0]  s4_exp_max;
+    reg [10+GUARD_BITS:0] s4_norm_frac;
+    reg        s4_result_sign;
+    reg        s4_is_nan;
+    reg        s4_is_inf_a, s4_is_inf_b;
 
-    reg [10:0] norm_frac;
+    // === Early out ===
+    wire       e_nan_a  = (&reg_a[14:10]) && (|reg_a[9:0]);
+    wire       e_nan_b  = (&reg_b[14:10]) && (|reg_b[9:0]);
+    wire       e_inf_a  = (&reg_a[14:10]) && !(|reg_a[9:0]);
+    wire       e_inf_b  = (&reg_b[14:10]) && !(|reg_b[9:0]);
+    wire       e_zero_a = (reg_a[14:0] == 0);
+    wire       e_zero_b = (reg_b[14:0] == 0) && (reg_b_ext == 0);
+    wire [4:0] e_exp_a  = (reg_a[14:10] != 0) ? reg_a[14:10] : 5'd1;
+    wire [4:0] e_exp_b  = (reg_b[14:10] != 0) ? reg_b[14:10] : 5'd1;
+    // Alignment shifts the smaller fraction out of all 11 + GUARD_BITS bits
+    wire       e_far_a  = (e_exp_a > e_exp_b) && (e_exp_a - e_exp_b > 10 + GUARD_BITS);
+    wire       e_far_b  = (e_exp_b > e_exp_a) && (e_exp_b - e_exp_a > 10 + GUARD_BITS);
 
-    reg is_conflicting_inf;
+    // Same results as the full pipeline: zero + zero is +0, and the bits of
+    // the other operand (b_ext included) never reach the packed mantissa
+    wire [15:0] early_result = (e_nan_a || e_nan_b || (e_inf_a && e_inf_b && (reg_a[15] != reg_b[15]))) ?
+                                   {1'b0, 5'b11111, 10'b1} :
+                               e_inf_a ? {reg_a[15], 5'b11111, 10'b0} :
+                               e_inf_b ? {reg_b[15], 5'b11111, 10'b0} :
+                               (e_zero_a && e_zero_b) ? 16'b0 :
+                               (e_zero_b || e_far_a) ? reg_a : reg_b;
 
+    wire pipe_busy  = s1_valid || s2_valid || s3_valid || s4_valid;
+    wire early_done = s0_valid && reg_early_en && !pipe_busy &&
+                      (e_nan_a || e_nan_b || e_inf_a || e_inf_b || e_zero_a || e_zero_b || e_far_a || e_far_b);
+
+    // Valid tokens travel with the data, one stage per clock
     always @(posedge clk or negedge rst_n) begin
         if (!rst_n) begin
-            state <= IDLE;
+            s0_valid  <= 0;
+            s1_valid  <= 0;
+            s2_valid  <= 0;
+            s3_valid  <= 0;
+            s4_valid  <= 0;
             valid_out <= 0;
-            result <= 0;
         end else begin
-            case (state)
-                IDLE: begin
-                    valid_out <= 0;
-                    if (valid_in) begin
-                        reg_a <= a;
-                        reg_b <= b;
-                        state <= DECODE;
-                    end
-                end
+            s0_valid  <= valid_in;
+            s1_valid  <= s0_valid && !early_done;
+            s2_valid  <= s1_valid;
+            s3_valid  <= s2_valid;
+            s4_valid  <= s3_valid;
+            valid_out <= s4_valid || early_done;
+        end
+    end
 
-                DECODE: begin
-                    sign_a <= reg_a[15];
-                    frac_a <= (reg_a[14:10] != 0) ? {1'b1, reg_a[9:0]} : {1'b0, reg_a[9:0]};
-                    is_nan_a <= (&reg_a[14:10]) && (|reg_a[9:0]);
-                    is_inf_a <= (&reg_a[14:10]) && !(|reg_a[9:0]);
+    // Stage 0: capture operands
+    always @(posedge clk) begin
+        if (valid_in) begin
+            reg_a        <= a;
+            reg_b        <= b;
+            reg_b_ext    <= b_ext;
+            reg_early_en <= early_en;
+        end
+    end
 
-                    sign_b <= reg_b[15];
-                    frac_b <= (reg_b[14:10] != 0) ? {1'b1, reg_b[9:0]} : {1'b0, reg_b[9:0]};
-                    is_nan_b <= (&reg_b[14:10]) && (|reg_b[9:0]);
-                    is_inf_b <= (&reg_b[14:10]) && !(|reg_b[9:0]);
+    // Stage 1: DECODE
+    always @(posedge clk) begin
+        if (s0_valid) begin
+            // Subnormals share the exponent of the smallest normal (1)
+            s1_exp_a    <= (reg_a[14:10] != 0) ? reg_a[14:10] : 5'd1;
+            s1_sign_a   <= reg_a[15];
+            s1_frac_a   <= (reg_a[14:10] != 0) ? {1'b1, reg_a[9:0], {GUARD_BITS{1'b0}}} : {1'b0, reg_a[9:0], {GUARD_BITS{1'b0}}};
+            s1_is_nan_a <= (&reg_a[14:10]) && (|reg_a[9:0]);
+            s1_is_inf_a <= (&reg_a[14:10]) && !(|reg_a[9:0]);
 
-                    state <= ALIGN;
-                end
+            s1_exp_b    <= (reg_b[14:10] != 0) ? reg_b[14:10] : 5'd1;
+            s1_sign_b   <= reg_b[15];
+            s1_frac_b   <= (reg_b[14:10] != 0) ? {1'b1, reg_b[9:0], reg_b_ext} : {1'b0, reg_b[9:0], reg_b_ext};
+            s1_is_nan_b <= (&reg_b[14:10]) && (|reg_b[9:0]);
+            s1_is_inf_b <= (&reg_b[14:10]) && !(|reg_b[9:0]);
+        end
+    end
 
-                ALIGN: begin
-                    is_conflicting_inf <= is_inf_a && is_inf_b && (sign_a != sign_b);
-                    if (reg_a[14:10] > reg_b[14:10]) begin
-                        exp_max <= reg_a[14:10];
-                        aligned_a <= frac_a;
-                        aligned_b <= frac_b >> (reg_a[14:10] - reg_b[14:10]);
-                    end else begin
-                        exp_max <= reg_b[14:10];
-                        aligned_a <= frac_a >> (reg_b[14:10] - reg_a[14:10]);
-                        aligned_b <= frac_b;
-                    end
-                    state <= CALCULATE;
-                end
+    // Stage 2: ALIGN
+    always @(posedge clk) begin
+        if (s1_valid) begin
+            s2_sign_a   <= s1_sign_a;
+            s2_sign_b   <= s1_sign_b;
+            s2_is_nan   <= s1_is_nan_a || s1_is_nan_b;
+            s2_is_inf_a <= s1_is_inf_a;
+            s2_is_inf_b <= s1_is_inf_b;
+            s2_is_conflicting_inf <= s1_is_inf_a && s1_is_inf_b && (s1_sign_a != s1_sign_b);
+            if (s1_exp_a > s1_exp_b) begin
+                s2_exp_max   <= s1_exp_a;
+                s2_aligned_a <= s1_frac_a;
+                s2_aligned_b <= s1_frac_b >> (s1_exp_a - s1_exp_b);
+            end else begin
+                s2_exp_max   <= s1_exp_b;
+                s2_aligned_a <= s1_frac_a >> (s1_exp_b - s1_exp_a);
+                s2_aligned_b <= s1_frac_b;
+            end
+        end
+    end
 
-                CALCULATE: begin
-                    if (sign_a == sign_b) begin
-                        // Same signs: add magnitudes
-                        sum <= {1'b0, aligned_a} + {1'b0, aligned_b};
-                        result_sign <= sign_a;
-                    end else begin
-                        // Different signs: subtract smaller from larger
-                        if (aligned_a > aligned_b) begin
-                            sum <= {1'b0, aligned_a} - {1'b0, aligned_b};
-                            result_sign <= sign_a;
-                        end else if (aligned_b > aligned_a) begin
-                            sum <= {1'b0, aligned_b} - {1'b0, aligned_a};
-                            result_sign <= sign_b;
-                        end else begin
-                            // Equal magnitudes: result is zero
-                            sum <= 0;
-                            result_sign <= 0;
-                        end
-                    end
-                    state <= NORMALIZE;
+    // Stage 3: CALCULATE
+    always @(posedge clk) begin
+        if (s2_valid) begin
+            s3_sign_a   <= s2_sign_a;
+            s3_sign_b   <= s2_sign_b;
+            s3_exp_max  <= s2_exp_max;
+            s3_is_nan   <= s2_is_nan || s2_is_conflicting_inf;
+            s3_is_inf_a <= s2_is_inf_a;
+            s3_is_inf_b <= s2_is_inf_b;
+            if (s2_sign_a == s2_sign_b) begin
+                // Same signs: add magnitudes
+                s3_sum <= {1'b0, s2_aligned_a} + {1'b0, s2_aligned_b};
+                s3_result_sign <= s2_sign_a;
+            end else begin
+                // Different signs: subtract smaller from larger
+                if (s2_aligned_a > s2_aligned_b) begin
+                    s3_sum <= {1'b0, s2_aligned_a} - {1'b0, s2_aligned_b};
+                    s3_result_sign <= s2_sign_a;
+                end else if (s2_aligned_b > s2_aligned_a) begin
+                    s3_sum <= {1'b0, s2_aligned_b} - {1'b0, s2_aligned_a};
+                    s3_result_sign <= s2_sign_b;
+                end else begin
+                    // Equal magnitudes: result is zero
+                    s3_sum <= 0;
+                    s3_result_sign <= 0;
                 end
+            end
+        end
+    end
 
-                NORMALIZE: begin
-                    if (sum == 0) begin
-                        norm_frac <= 0;
-                        exp_max <= 0;
-                        result_sign <= 0;
-                    end else begin
-                        if (sum[11]) begin
-                            // Overflow case - shift right by 1
-                            norm_frac <= sum[11:1];
-                            exp_max <= exp_max + 1;
-                        end else begin
-                            // Normal case - shift left until MSB is 1
-                            norm_frac <= sum[10:0];
-                            if (!sum[10]) begin
-                                norm_frac <= sum[9:0] << 1;
-                                exp_max <= exp_max - 1;
-                            end
-                        end
-                    end
-                    state <= PACK;
-                end
+    // Stage 4: NORMALIZE
+    function [4:0] leading_zeros;
+        input [10+GUARD_BITS:0] value;
+        integer i;
+        begin
+            leading_zeros = 11 + GUARD_BITS;
+            for (i = 0; i <= 10 + GUARD_BITS; i = i + 1)
+                if (value[i]) leading_zeros = 10 + GUARD_BITS - i;
+        end
+    endfunction
 
-                PACK: begin
-                    valid_out <= 1;
-                    if (is_nan_a || is_nan_b || is_conflicting_inf) begin
-                        result <= {1'b0, 5'b11111, 10'b1}; // NaN
-                    end else if (is_inf_a && is_inf_b && sign_a == sign_b) begin
-                        result <= {sign_a, 5'b11111, 10'b0}; // Infinity with same sign
-                    end else if (is_inf_a) begin
-                        result <= {sign_a, 5'b11111, 10'b0}; // A is infinity
-                    end else if (is_inf_b) begin
-                        result <= {sign_b, 5'b11111, 10'b0}; // B is infinity
-                    end else begin
-                        // Pack normal/denormal result
-                        result <= {result_sign, exp_max, norm_frac[9:0]};
-                    end
-                    state <= IDLE;
-                end
-            endcase
+    wire [4:0] s3_lz = leading_zeros(s3_sum[10+GUARD_BITS:0]);
+
+    always @(posedge clk) begin
+        if (s3_valid) begin
+            s4_sign_a   <= s3_sign_a;
+            s4_sign_b   <= s3_sign_b;
+            s4_is_nan   <= s3_is_nan;
+            s4_is_inf_a <= s3_is_inf_a;
+            s4_is_inf_b <= s3_is_inf_b;
+            s4_result_sign <= s3_result_sign;
+            s4_exp_max  <= s3_exp_max;
+            if (s3_sum == 0) begin
+                s4_norm_frac   <= 0;
+                s4_exp_max     <= 0;
+                s4_result_sign <= 0;
+            end else if (s3_sum[11+GUARD_BITS]) begin
+                // Overflow case - shift right by 1
+                s4_norm_frac <= s3_sum[11+GUARD_BITS:1];
+                s4_exp_max   <= s3_exp_max + 1;
+            end else if (s3_lz < s3_exp_max) begin
+                // Shift left until the MSB is 1 (cancellation can clear many bits)
+                s4_norm_frac <= s3_sum[10+GUARD_BITS:0] << s3_lz;
+                s4_exp_max   <= s3_exp_max - s3_lz;
+            end else begin
+                // Too small for a normal number: stop at the subnormal exponent
+                s4_norm_frac <= s3_sum[10+GUARD_BITS:0] << (s3_exp_max - 1);
+                s4_exp_max   <= 0;
+            end
         end
     end
-endmodule
\ No newline at end of file
+
+    // Stage 5: PACK
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            result <= 0;
+        end else if (early_done) begin
+            result <= early_result;
+        end else if (s4_valid) begin
+            if (s4_is_nan) begin
+                result <= {1'b0, 5'b11111, 10'b1}; // NaN
+            end else if (s4_is_inf_a) begin
+                result <= {s4_sign_a, 5'b11111, 10'b0}; // A is infinity (or both, same sign)
+            end else if (s4_is_inf_b) begin
+                result <= {s4_sign_b, 5'b11111, 10'b0}; // B is infinity
+            end else begin
+                // Pack normal/denormal result
+                result <= {s4_result_sign, s4_exp_max, s4_norm_frac[9+GUARD_BITS:GUARD_BITS]};
+            end
+        end
+    end
+
+endmodule
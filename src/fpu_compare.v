@@ -0,0 +1,92 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+// Combinational half-precision min/max, comparisons, sign operations and
+// classification. func selects the operation:
+//
+//   0 FMIN: min(A, B)      3 FLT: A < B     6 FNEG:   -B
+//   1 FMAX: max(A, B)      4 FLE: A <= B    7 FCLASS: class mask of B
+//   2 FEQ:  A == B         5 FABS: |B|
+//
+// The operations follow the RISC-V F extension: FMIN/FMAX order -0 below +0
+// and return the other operand when one is NaN (0x7E00 when both are),
+// FEQ/FLT/FLE return 1 or 0 and are false for NaN operands, FABS/FNEG only
+// change the sign bit, and FCLASS sets one bit of
+//
+//   [0] -Inf  [1] -normal  [2] -subnormal  [3] -0  [4] +0
+//   [5] +subnormal  [6] +normal  [7] +Inf  [8] signaling NaN  [9] quiet NaN
+module fpu_compare (
+    input  wire [2:0]  func,
+    input  wire [15:0] a,
+    input  wire [15:0] b,
+    output reg  [15:0] result
+);
+
+    localparam FMIN   = 3'd0;
+    localparam FMAX   = 3'd1;
+    localparam FEQ    = 3'd2;
+    localparam FLT    = 3'd3;
+    localparam FLE    = 3'd4;
+    localparam FABS   = 3'd5;
+    localparam FNEG   = 3'd6;
+    localparam FCLASS = 3'd7;
+
+    wire nan_a     = (a[14:10] == 5'b11111) && (a[9:0] != 0);
+    wire nan_b     = (b[14:10] == 5'b11111) && (b[9:0] != 0);
+    wire unordered = nan_a || nan_b;
+    wire both_zero = (a[14:0] == 0) && (b[14:0] == 0);
+
+    // a < b in sign-magnitude order, with -0 below +0
+    wire mag_lt    = a[14:0] < b[14:0];
+    wire mag_eq    = a[14:0] == b[14:0];
+    wire lt        = (a[15] != b[15]) ? a[15] :
+                     a[15] ? !(mag_lt || mag_eq) : mag_lt;
+
+    wire feq       = !unordered && ((a == b) || both_zero);
+    wire flt       = !unordered && lt && !both_zero;
+
+    wire [15:0] fmin = (nan_a && nan_b) ? 16'h7E00 :
+                       nan_a ? b :
+                       nan_b ? a :
+                       lt ? a : b;
+    wire [15:0] fmax = (nan_a && nan_b) ? 16'h7E00 :
+                       nan_a ? b :
+                       nan_b ? a :
+                       lt ? b : a;
+
+    // === FCLASS ===
+    wire exp_max   = (b[14:10] == 5'b11111);
+    wire exp_zero  = (b[14:10] == 5'b0);
+    wire man_zero  = (b[9:0] == 0);
+    wire normal    = !exp_max && !exp_zero;
+    wire subnormal = exp_zero && !man_zero;
+    wire zero      = exp_zero && man_zero;
+    wire inf       = exp_max && man_zero;
+
+    wire [9:0] fclass = {
+        nan_b && b[9],
+        nan_b && !b[9],
+        !b[15] && inf,
+        !b[15] && normal,
+        !b[15] && subnormal,
+        !b[15] && zero,
+        b[15] && zero,
+        b[15] && subnormal,
+        b[15] && normal,
+        b[15] && inf
+    };
+
+    always @(*) begin
+        case (func)
+            FMIN:    result = fmin;
+            FMAX:    result = fmax;
+            FEQ:     result = {15'b0, feq};
+            FLT:     result = {15'b0, flt};
+            FLE:     result = {15'b0, flt || feq};
+            FABS:    result = {1'b0, b[14:0]};
+            FNEG:    result = {~b[15], b[14:0]};
+            default: result = {6'b0, fclass};
+        endcase
+    end
+
+endmodule
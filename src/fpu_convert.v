@@ -0,0 +1,178 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+// Format conversions between fp16 and int16, uint16, bf16 and fp32.
+//
+// Stages: input -> CONVERT. func selects the conversion:
+//
+//   0 I2F:   int16  -> fp16     3 F2BF:  fp16 -> bf16
+//   1 U2F:   uint16 -> fp16     4 BF2F:  bf16 -> fp16
+//   2 F2I:   fp16   -> int16    5 F2F32: fp16 -> fp32
+//
+// Inexact results are rounded in the mode rm, encoded like the RISC-V rm
+// field (0 RNE, 1 RTZ, 2 RDN, 3 RUP, 4 RMM, 5-7 also RMM). F2I saturates
+// like RISC-V fcvt (NaN -> 0x7FFF) and returns the int16 sign extended to 32
+// bits. fp16 -> fp32 is exact, NaN results are the canonical quiet NaNs.
+//
+// valid_out rises on the clock edge after the one that samples valid_in, and
+// a new conversion can start on every clock.
+module fpu_convert (
+    input  wire        clk,
+    input  wire        rst_n,
+    input  wire        valid_in,
+    input  wire [2:0]  func,
+    input  wire [2:0]  rm,
+    input  wire [15:0] a,
+    output reg         valid_out,
+    output reg  [31:0] result
+);
+
+    localparam I2F   = 3'd0;
+    localparam U2F   = 3'd1;
+    localparam F2I   = 3'd2;
+    localparam F2BF  = 3'd3;
+    localparam BF2F  = 3'd4;
+    localparam F2F32 = 3'd5;
+
+    localparam RNE = 3'd0;
+    localparam RTZ = 3'd1;
+    localparam RDN = 3'd2;
+    localparam RUP = 3'd3;
+
+    // === Stage 0: input registers ===
+    reg        s0_valid;
+    reg [15:0] reg_a;
+    reg [2:0]  reg_func;
+    reg [2:0]  reg_rm;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            s0_valid <= 1'b0;
+        end else begin
+            s0_valid <= valid_in;
+        end
+    end
+
+    always @(posedge clk) begin
+        if (valid_in) begin
+            reg_a    <= a;
+            reg_func <= func;
+            reg_rm   <= rm;
+        end
+    end
+
+    // === Rounding ===
+    // 1 when the truncated magnitude has to be incremented
+    function round_inc;
+        input       sign;
+        input       lsb;
+        input       guard;
+        input       sticky;
+        input [2:0] mode;
+        begin
+            case (mode)
+                RNE:     round_inc = guard & (sticky | lsb);
+                RTZ:     round_inc = 1'b0;
+                RDN:     round_inc = sign & (guard | sticky);
+                RUP:     round_inc = !sign & (guard | sticky);
+                default: round_inc = guard;
+            endcase
+        end
+    endfunction
+
+    // An overflow rounds to Inf unless the mode rounds towards zero
+    wire sign    = reg_a[15];
+    wire to_inf  = (reg_rm == RNE) || (reg_rm > RUP) ||
+                   ((reg_rm == RUP) && !sign) || ((reg_rm == RDN) && sign);
+
+    function [4:0] leading_zeros16;
+        input [15:0] value;
+        integer i;
+        begin
+            leading_zeros16 = 16;
+            for (i = 0; i <= 15; i = i + 1) begin
+                if (value[i]) leading_zeros16 = 15 - i;
+            end
+        end
+    endfunction
+
+    // === fp16 operand ===
+    wire        is_nan  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] != 0);
+    wire        is_inf  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] == 0);
+    wire        is_zero = (reg_a[14:10] == 5'b0) && (reg_a[9:0] == 0);
+    wire [4:0]  e_eff   = (reg_a[14:10] == 5'b0) ? 5'd1 : reg_a[14:10];
+    wire [10:0] frac    = (reg_a[14:10] == 5'b0) ? {1'b0, reg_a[9:0]} : {1'b1, reg_a[9:0]};
+
+    // Subnormals are normalized for the wider formats
+    wire [4:0]  lz_f    = leading_zeros16({frac, 5'b0});
+    wire [10:0] norm_f  = frac << lz_f;
+    wire [7:0]  exp_w   = {3'b0, e_eff} - {3'b0, lz_f} + 8'd112;
+
+    // === I2F / U2F ===
+    wire        sign_i  = (reg_func == I2F) && sign;
+    wire [15:0] mag_i   = sign_i ? -reg_a : reg_a;
+    wire [4:0]  lz_i    = leading_zeros16(mag_i);
+    wire [15:0] norm_i  = mag_i << lz_i;
+    wire [4:0]  exp_i   = 5'd30 - lz_i;
+    wire [14:0] pack_i  = {exp_i, norm_i[14:5]} +
+                          {14'b0, round_inc(sign_i, norm_i[5], norm_i[4], |norm_i[3:0], reg_rm)};
+    wire [15:0] res_i   = (mag_i == 0) ? 16'b0 : {sign_i, pack_i};
+
+    // === F2I ===
+    // frac * 2^(e - 25) as a fixed-point value with 24 fraction bits
+    wire [47:0] fixed   = {37'b0, frac} << (e_eff - 5'd1);
+    wire [16:0] mag_f   = {1'b0, fixed[39:24]} +
+                          {16'b0, round_inc(sign, fixed[24], fixed[23], |fixed[22:0], reg_rm)};
+    wire [15:0] res_f2i = (reg_a[14:10] == 5'b11111) ? ((sign && !is_nan) ? 16'h8000 : 16'h7FFF) :
+                          sign ? ((mag_f > 17'h08000) ? 16'h8000 : -mag_f[15:0]) :
+                          ((mag_f > 17'h07FFF) ? 16'h7FFF : mag_f[15:0]);
+
+    // === F2BF ===
+    wire [14:0] pack_bf = {exp_w, norm_f[9:3]} +
+                          {14'b0, round_inc(sign, norm_f[3], norm_f[2], |norm_f[1:0], reg_rm)};
+    wire [15:0] res_bf  = is_nan  ? 16'h7FC0 :
+                          is_inf  ? {sign, 15'h7F80} :
+                          is_zero ? {sign, 15'b0} :
+                          {sign, pack_bf};
+
+    // === BF2F ===
+    wire [7:0]  bf_exp   = reg_a[14:7];
+    wire [7:0]  bf_sig   = {bf_exp != 0, reg_a[6:0]};
+    wire signed [9:0] h_exp = $signed({2'b0, (bf_exp == 0) ? 8'd1 : bf_exp}) - 10'sd112;
+    // Subnormal results: the significand times 4, shifted right by -h_exp
+    wire [9:0]  shift_s  = (h_exp < -10'sd11) ? 10'd12 : -h_exp;
+    wire [21:0] sub_bits = {bf_sig, 14'b0} >> shift_s[3:0];
+    wire [14:0] pack_s   = {5'b0, sub_bits[21:12]} +
+                           {14'b0, round_inc(sign, sub_bits[12], sub_bits[11], |sub_bits[10:0], reg_rm)};
+    wire [15:0] res_h    = (bf_exp == 8'hFF) ? ((reg_a[6:0] != 0) ? 16'h7E00 : {sign, 15'h7C00}) :
+                           (bf_sig == 0)     ? {sign, 15'b0} :
+                           (h_exp >= 10'sd31) ? {sign, to_inf ? 15'h7C00 : 15'h7BFF} :
+                           (h_exp >= 10'sd1)  ? {sign, h_exp[4:0], reg_a[6:0], 3'b0} :
+                           {sign, pack_s};
+
+    // === F2F32 ===
+    wire [31:0] res_w   = is_nan  ? 32'h7FC00000 :
+                          is_inf  ? {sign, 31'h7F800000} :
+                          is_zero ? {sign, 31'b0} :
+                          {sign, exp_w, norm_f[9:0], 13'b0};
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            valid_out <= 1'b0;
+            result    <= 32'b0;
+        end else begin
+            valid_out <= s0_valid;
+            if (s0_valid) begin
+                case (reg_func)
+                    I2F, U2F: result <= {16'b0, res_i};
+                    F2I:      result <= {{16{res_f2i[15]}}, res_f2i};
+                    F2BF:     result <= {16'b0, res_bf};
+                    BF2F:     result <= {16'b0, res_h};
+                    F2F32:    result <= res_w;
+                    default:  result <= 32'b0;
+                endcase
+            end
+        end
+    end
+
+endmodule
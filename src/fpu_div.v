@@ -0,0 +1,176 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+// Iterative half-precision divider.
+//
+// Stages: input -> DECODE -> ITERATE (x DIV_ITERS) -> PACK. DECODE
+// normalizes subnormal operands and pre-shifts the dividend so the quotient
+// lies in [1, 2). ITERATE is a restoring divider that retires two quotient
+// bits per clock (two cascaded radix-2 restoring steps, not an SRT digit
+// selection), and PACK truncates the quotient into the result, including
+// subnormal results.
+// Quotients beyond the largest normal return Inf.
+//
+// With estimate set, b is replaced by 1/b computed with only EST_ITERS
+// iterations: a 7-bit reciprocal estimate that is ready two clocks earlier.
+// The caller passes a = 1.0 for that.
+//
+// valid_out rises 2 + DIV_ITERS (or 2 + EST_ITERS) clock edges after the
+// edge that samples valid_in. A new operation may only start once busy is low.
+module fpu_div (
+    input  wire        clk,
+    input  wire        rst_n,
+    input  wire        valid_in,
+    input  wire        estimate,
+    input  wire [15:0] a,
+    input  wire [15:0] b,
+    output reg         valid_out,
+    output reg  [15:0] result,
+    output wire        busy
+);
+
+    localparam DIV_ITERS = 6;   // 12 quotient bits
+    localparam EST_ITERS = 4;   // 8 quotient bits
+
+    // === Stage 0: input registers ===
+    reg        s0_valid;
+    reg [15:0] reg_a, reg_b;
+    reg        reg_est;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            s0_valid <= 1'b0;
+        end else begin
+            s0_valid <= valid_in;
+        end
+    end
+
+    always @(posedge clk) begin
+        if (valid_in) begin
+            reg_a   <= a;
+            reg_b   <= b;
+            reg_est <= estimate;
+        end
+    end
+
+    // === DECODE ===
+    function [3:0] leading_zeros;
+        input [10:0] value;
+        integer i;
+        begin
+            leading_zeros = 11;
+            for (i = 0; i <= 10; i = i + 1) begin
+                if (value[i]) leading_zeros = 10 - i;
+            end
+        end
+    endfunction
+
+    wire is_nan_a  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] != 0);
+    wire is_inf_a  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] == 0);
+    wire is_zero_a = (reg_a[14:10] == 5'b0) && (reg_a[9:0] == 0);
+    wire is_nan_b  = (reg_b[14:10] == 5'b11111) && (reg_b[9:0] != 0);
+    wire is_inf_b  = (reg_b[14:10] == 5'b11111) && (reg_b[9:0] == 0);
+    wire is_zero_b = (reg_b[14:10] == 5'b0) && (reg_b[9:0] == 0);
+
+    wire        sign = reg_a[15] ^ reg_b[15];
+
+    // Subnormals take the exponent of the smallest normal and are shifted
+    // until their leading one reaches bit 10
+    wire [10:0] frac_a = (reg_a[14:10] == 5'b0) ? {1'b0, reg_a[9:0]} : {1'b1, reg_a[9:0]};
+    wire [10:0] frac_b = (reg_b[14:10] == 5'b0) ? {1'b0, reg_b[9:0]} : {1'b1, reg_b[9:0]};
+    wire [3:0]  lz_a   = leading_zeros(frac_a);
+    wire [3:0]  lz_b   = leading_zeros(frac_b);
+    wire [10:0] norm_a = frac_a << lz_a;
+    wire [10:0] norm_b = frac_b << lz_b;
+
+    wire signed [7:0] exp_a = (reg_a[14:10] == 5'b0) ? 8'sd1 : {3'b0, reg_a[14:10]};
+    wire signed [7:0] exp_b = (reg_b[14:10] == 5'b0) ? 8'sd1 : {3'b0, reg_b[14:10]};
+
+    // A smaller dividend mantissa is doubled so the quotient is in [1, 2)
+    wire              a_small  = norm_a < norm_b;
+    wire signed [7:0] exp_q    = exp_a - {4'b0, lz_a} - exp_b + {4'b0, lz_b} + 8'sd15 - {7'b0, a_small};
+
+    wire        special     = is_nan_a | is_nan_b | is_inf_a | is_inf_b | is_zero_a | is_zero_b;
+    wire [15:0] special_val = (is_nan_a | is_nan_b | (is_zero_a & is_zero_b) | (is_inf_a & is_inf_b)) ? 16'h7E00 :
+                              (is_inf_a | is_zero_b) ? {sign, 15'h7C00} :
+                              {sign, 15'h0000};
+
+    // === ITERATE ===
+    reg [2:0]         it_count;
+    reg [11:0]        it_rem;
+    reg [10:0]        it_div;
+    reg [11:0]        it_quot;
+    reg signed [7:0]  it_exp;
+    reg               it_sign;
+    reg               it_special;
+    reg [15:0]        it_special_val;
+    reg               it_est;
+    reg               pk_valid;
+
+    // Two restoring steps: each compares the partial remainder with the
+    // divisor, subtracts it when it fits and shifts in a zero
+    wire        q_hi  = it_rem >= {1'b0, it_div};
+    wire [11:0] rem_1 = (q_hi ? it_rem - {1'b0, it_div} : it_rem) << 1;
+    wire        q_lo  = rem_1 >= {1'b0, it_div};
+    wire [11:0] rem_2 = (q_lo ? rem_1 - {1'b0, it_div} : rem_1) << 1;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            it_count <= 0;
+            pk_valid <= 1'b0;
+        end else begin
+            pk_valid <= (it_count == 1);
+            if (s0_valid) begin
+                it_count <= reg_est ? EST_ITERS[2:0] : DIV_ITERS[2:0];
+            end else if (it_count != 0) begin
+                it_count <= it_count - 1;
+            end
+        end
+    end
+
+    always @(posedge clk) begin
+        if (s0_valid) begin
+            it_rem         <= a_small ? {norm_a, 1'b0} : {1'b0, norm_a};
+            it_div         <= norm_b;
+            it_quot        <= 12'b0;
+            it_exp         <= exp_q;
+            it_sign        <= sign;
+            it_special     <= special;
+            it_special_val <= special_val;
+            it_est         <= reg_est;
+        end else if (it_count != 0) begin
+            it_rem         <= rem_2;
+            it_quot        <= {it_quot[9:0], q_hi, q_lo};
+        end
+    end
+
+    // === PACK ===
+    // The estimate only has the upper 8 quotient bits; q keeps 11 bits with
+    // the leading one in bit 10
+    wire [11:0]       quot  = it_est ? {it_quot[7:0], 4'b0} : it_quot;
+    wire [10:0]       q     = quot[11:1];
+    wire signed [7:0] shift = 8'sd1 - it_exp;
+    wire [10:0]       q_sub = (shift > 8'sd11) ? 11'b0 : (q >> shift[3:0]);
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            valid_out <= 1'b0;
+            result    <= 16'b0;
+        end else begin
+            valid_out <= pk_valid;
+            if (pk_valid) begin
+                if (it_special)
+                    result <= it_special_val;
+                else if (it_exp >= 8'sd31)
+                    result <= {it_sign, 5'b11111, 10'b0};
+                else if (it_exp <= 8'sd0)
+                    result <= {it_sign, 5'b0, q_sub[9:0]};
+                else
+                    result <= {it_sign, it_exp[4:0], q[9:0]};
+            end
+        end
+    end
+
+    assign busy = s0_valid || (it_count != 0) || pk_valid;
+
+endmodule
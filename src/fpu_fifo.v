@@ -0,0 +1,60 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+// Synchronous FIFO with 2**ADDR_W entries.
+//
+// dout always shows the oldest entry. A push and a pop on the same clock are
+// both honoured, even when the FIFO is full. Pushes into a full FIFO and pops
+// from an empty one are ignored. flush empties the FIFO.
+module fpu_fifo #(
+    parameter WIDTH  = 16,
+    parameter ADDR_W = 2
+) (
+    input  wire              clk,
+    input  wire              rst_n,
+    input  wire              flush,
+    input  wire              push,
+    input  wire [WIDTH-1:0]  din,
+    input  wire              pop,
+    output wire [WIDTH-1:0]  dout,
+    output wire              empty,
+    output wire              full,
+    output reg  [ADDR_W:0]   count
+);
+
+    localparam DEPTH = 1 << ADDR_W;
+
+    reg [WIDTH-1:0]  mem [0:DEPTH-1];
+    reg [ADDR_W-1:0] wr_ptr;
+    reg [ADDR_W-1:0] rd_ptr;
+
+    assign empty = (count == 0);
+    assign full  = (count == DEPTH);
+    assign dout  = mem[rd_ptr];
+
+    wire do_pop  = pop && !empty;
+    wire do_push = push && (!full || do_pop);
+
+    always @(posedge clk) begin
+        if (do_push) begin
+            mem[wr_ptr] <= din;
+        end
+    end
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            wr_ptr <= 0;
+            rd_ptr <= 0;
+            count  <= 0;
+        end else if (flush) begin
+            wr_ptr <= 0;
+            rd_ptr <= 0;
+            count  <= 0;
+        end else begin
+            if (do_push) wr_ptr <= wr_ptr + 1'b1;
+            if (do_pop)  rd_ptr <= rd_ptr + 1'b1;
+            count <= count + do_push - do_pop;
+        end
+    end
+
+endmodule
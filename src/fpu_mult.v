@@ -1,120 +1,269 @@
 `timescale 1ns / 1ps
 `default_nettype none
 
-module fpu_mult (
+// Fully pipelined half-precision multiplier.
+//
+// Stages: input -> DECODE -> MULTIPLY -> NORMALIZE -> PACK. Every stage
+// carries a valid bit, so a new operand pair can be accepted on every clock.
+// The register boundaries are configurable to trade latency for timing at
+// the 14ns (70MHz) target:
+//
+//   DECODE_STAGE    1: register the decoded operands, 0: merge DECODE into MULTIPLY
+//   SPLIT_MULTIPLY  1: split the 11x11 mantissa product over two stages
+//   NORMALIZE_STAGE 1: register the normalized mantissa, 0: merge NORMALIZE into PACK
+//
+// valid_out rises LATENCY clock edges after the edge that samples valid_in.
+// The defaults match the original IDLE..PACK state machine (LATENCY = 4).
+//
+// result_ext holds the product bits truncated below result's mantissa, so a
+// fused multiply-add can feed the exact product into fpu_adder.
+//
+// With early_en set, NaN, Inf and zero operands skip the remaining stages:
+// valid_out rises on the edge after the one that samples valid_in. A pair
+// only leaves early when no older pair is still in the pipeline, so results
+// stay in order. early_en is sampled together with the operands.
+module fpu_mult #(
+    parameter DECODE_STAGE    = 1,
+    parameter SPLIT_MULTIPLY  = 0,
+    parameter NORMALIZE_STAGE = 1
+) (
     input  wire        clk,
     input  wire        rst_n,
     input  wire        valid_in,
     input  wire [15:0] a,
     input  wire [15:0] b,
+    input  wire        early_en,
     output reg         valid_out,
-    output reg  [15:0] result
+    output reg  [15:0] result,
+    output reg  [10:0] result_ext
 );
 
-    // State definitions
-    localparam IDLE      = 3'd0;
-    localparam DECODE    = 3'd1;
-    localparam MULTIPLY  = 3'd2;
-    localparam NORMALIZE = 3'd3;
-    localparam PACK      = 3'd4;
+    localparam LATENCY = 2 + DECODE_STAGE + SPLIT_MULTIPLY + NORMALIZE_STAGE;
 
-    reg [2:0] state;
-
-    // Input registers
+    // === Stage 0: input registers ===
+    reg        s0_valid;
     reg [15:0] reg_a, reg_b;
-
-    // Decoded values
-    reg sign_a, sign_b;
-    reg [9:0] mant_a, mant_b;
-    reg [10:0] frac_a, frac_b;
-    reg is_nan_a, is_nan_b;
-    reg is_inf_a, is_inf_b;
-    reg is_zero_a, is_zero_b;
-
-    // Intermediate results
-    reg [21:0] product;
-    reg [5:0] raw_exp;
-    reg result_sign;
-    reg is_nan;
-    reg [9:0] norm_mant;
+    reg        reg_early_en;
 
     always @(posedge clk or negedge rst_n) begin
         if (!rst_n) begin
-            state <= IDLE;
-            valid_out <= 1'b0;
-            result <= 32'b0;
+            s0_valid <= 1'b0;
         end else begin
-            case (state)
-                IDLE: begin
-                    valid_out <= 1'b0;
-                    if (valid_in) begin
-                        reg_a <= a;
-                        reg_b <= b;
-                        state <= DECODE;
-                    end
-                end
+            s0_valid <= valid_in;
+        end
+    end
+
+    always @(posedge clk) begin
+        if (valid_in) begin
+            reg_a        <= a;
+            reg_b        <= b;
+            reg_early_en <= early_en;
+        end
+    end
+
+    // === DECODE ===
+    // {exp_a, exp_b, sign_a, sign_b, frac_a, frac_b, is_nan, is_inf, is_zero}
+    localparam DEC_W = 5 + 5 + 1 + 1 + 11 + 11 + 1 + 1 + 1;
+
+    wire is_nan_a  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] != 0);
+    wire is_inf_a  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] == 0);
+    wire is_zero_a = (reg_a[14:10] == 5'b0) && (reg_a[9:0] == 0);
+    wire is_nan_b  = (reg_b[14:10] == 5'b11111) && (reg_b[9:0] != 0);
+    wire is_inf_b  = (reg_b[14:10] == 5'b11111) && (reg_b[9:0] == 0);
+    wire is_zero_b = (reg_b[14:10] == 5'b0) && (reg_b[9:0] == 0);
+
+    wire [DEC_W-1:0] dec_d = {
+        reg_a[14:10],
+        reg_b[14:10],
+        reg_a[15],
+        reg_b[15],
+        (reg_a[14:10] == 5'b0) ? {1'b0, reg_a[9:0]} : {1'b1, reg_a[9:0]},
+        (reg_b[14:10] == 5'b0) ? {1'b0, reg_b[9:0]} : {1'b1, reg_b[9:0]},
+        is_nan_a | is_nan_b | ((is_inf_a | is_inf_b) & (is_zero_a | is_zero_b)),
+        is_inf_a | is_inf_b,
+        is_zero_a | is_zero_b
+    };
+
+    // === Early out ===
+    wire [15:0] early_result = (is_nan_a | is_nan_b | ((is_inf_a | is_inf_b) & (is_zero_a | is_zero_b))) ? 16'h7E00 :
+                               (is_inf_a | is_inf_b) ? {reg_a[15] ^ reg_b[15], 5'b11111, 10'b0} :
+                               {reg_a[15] ^ reg_b[15], 15'b0};
+
+    // Older pairs still in the registered stages
+    reg  mul_valid;
+    wire dec_busy, split_busy, norm_busy;
+    wire pipe_busy  = dec_busy | split_busy | mul_valid | norm_busy;
+    wire early_done = s0_valid && reg_early_en && !pipe_busy &&
+                      (is_nan_a | is_nan_b | is_inf_a | is_inf_b | is_zero_a | is_zero_b);
+    wire s0_go      = s0_valid && !early_done;
+
+    wire [DEC_W-1:0] dec_q;
+    wire             dec_valid;
+
+    generate
+        if (DECODE_STAGE) begin : g_decode_reg
+            reg [DEC_W-1:0] q;
+            reg             v;
+            always @(posedge clk or negedge rst_n) begin
+                if (!rst_n) v <= 1'b0;
+                else        v <= s0_go;
+            end
+            always @(posedge clk) begin
+                if (s0_go) q <= dec_d;
+            end
+            assign dec_q     = q;
+            assign dec_valid = v;
+            assign dec_busy  = v;
+        end else begin : g_decode_comb
+            assign dec_q     = dec_d;
+            assign dec_valid = s0_go;
+            assign dec_busy  = 1'b0;
+        end
+    endgenerate
 
-                DECODE: begin
-                    // Decode input A
-                    sign_a <= reg_a[15];
-                    mant_a <= reg_a[9:0];
-                    frac_a <= (reg_a[14:10] == 5'b0) ? {1'b0, reg_a[9:0]} : {1'b1, reg_a[9:0]};
-                    is_nan_a <= (reg_a[14:10] == 5'b11111) && (reg_a[9:0] != 0);
-                    is_inf_a <= (reg_a[14:10] == 5'b11111) && (reg_a[9:0] == 0);
-                    is_zero_a <= (reg_a[14:10] == 5'b0) && (reg_a[9:0] == 0);
-
-                    // Decode input B
-                    sign_b <= reg_b[15];
-                    mant_b <= reg_b[9:0];
-                    frac_b <= (reg_b[14:10] == 5'b0) ? {1'b0, reg_b[9:0]} : {1'b1, reg_b[9:0]};
-                    is_nan_b <= (reg_b[14:10] == 5'b11111) && (reg_b[9:0] != 0);
-                    is_inf_b <= (reg_b[14:10] == 5'b11111) && (reg_b[9:0] == 0);
-                    is_zero_b <= (reg_b[14:10] == 5'b0) && (reg_b[9:0] == 0);
-
-                    state <= MULTIPLY;
+    wire [4:0]  exp_a, exp_b;
+    wire        sign_a, sign_b;
+    wire [10:0] frac_a, frac_b;
+    wire        dec_is_nan, dec_is_inf, dec_is_zero;
+
+    assign {exp_a, exp_b, sign_a, sign_b, frac_a, frac_b,
+            dec_is_nan, dec_is_inf, dec_is_zero} = dec_q;
+
+    // === MULTIPLY ===
+    reg [21:0] product;
+    reg [5:0]  mul_exp;
+    reg        mul_sign;
+    reg        mul_is_nan, mul_is_inf, mul_is_zero;
+
+    generate
+        if (SPLIT_MULTIPLY) begin : g_multiply_split
+            // First half: two partial products over the low/high bits of B
+            reg        v;
+            reg [16:0] pp_lo;
+            reg [15:0] pp_hi;
+            reg [5:0]  exp;
+            reg        sign, is_nan, is_inf, is_zero;
+
+            always @(posedge clk or negedge rst_n) begin
+                if (!rst_n) v <= 1'b0;
+                else        v <= dec_valid;
+            end
+            always @(posedge clk) begin
+                if (dec_valid) begin
+                    pp_lo   <= frac_a * frac_b[5:0];
+                    pp_hi   <= frac_a * frac_b[10:6];
+                    exp     <= exp_a + exp_b - 5'd15; // Subtract bias
+                    sign    <= sign_a ^ sign_b;
+                    is_nan  <= dec_is_nan;
+                    is_inf  <= dec_is_inf;
+                    is_zero <= dec_is_zero;
                 end
+            end
 
-                MULTIPLY: begin
-                    // Calculate product and exponent
-                    product <= frac_a * frac_b;
-                    raw_exp <= reg_a[14:10] + reg_b[14:10] - 5'd15; // Subtract bias
-                    result_sign <= sign_a ^ sign_b;
-                    is_nan <= is_nan_a | is_nan_b | ((is_inf_a | is_inf_b) & (is_zero_a | is_zero_b));
+            assign split_busy = v;
 
-                    state <= NORMALIZE;
+            // Second half: sum the partial products
+            always @(posedge clk or negedge rst_n) begin
+                if (!rst_n) mul_valid <= 1'b0;
+                else        mul_valid <= v;
+            end
+            always @(posedge clk) begin
+                if (v) begin
+                    product     <= pp_lo + {pp_hi, 6'b0};
+                    mul_exp     <= exp;
+                    mul_sign    <= sign;
+                    mul_is_nan  <= is_nan;
+                    mul_is_inf  <= is_inf;
+                    mul_is_zero <= is_zero;
                 end
+            end
+        end else begin : g_multiply
+            assign split_busy = 1'b0;
 
-                NORMALIZE: begin
-                    // Normalize the product
-                    if (product[21]) begin
-                        // Product overflowed (bit 21 set)
-                        norm_mant <= product[20:11];
-                        raw_exp <= raw_exp + 1;
-                    end else begin
-                        // Normal product
-                        norm_mant <= product[19:10];
-                    end
-
-                    state <= PACK;
+            always @(posedge clk or negedge rst_n) begin
+                if (!rst_n) mul_valid <= 1'b0;
+                else        mul_valid <= dec_valid;
+            end
+            always @(posedge clk) begin
+                if (dec_valid) begin
+                    product     <= frac_a * frac_b;
+                    mul_exp     <= exp_a + exp_b - 5'd15; // Subtract bias
+                    mul_sign    <= sign_a ^ sign_b;
+                    mul_is_nan  <= dec_is_nan;
+                    mul_is_inf  <= dec_is_inf;
+                    mul_is_zero <= dec_is_zero;
                 end
+            end
+        end
+    endgenerate
+
+    // === NORMALIZE ===
+    // {raw_exp, norm_mant, norm_ext, sign, is_nan, is_inf, is_zero}
+    localparam NORM_W = 5 + 10 + 11 + 1 + 1 + 1 + 1;
+
+    // Product overflowed (bit 21 set): take the upper bits and bump the exponent
+    wire [5:0]  norm_exp  = product[21] ? mul_exp + 1 : mul_exp;
+    wire [9:0]  norm_mant = product[21] ? product[20:11] : product[19:10];
+    wire [10:0] norm_ext  = product[21] ? product[10:0] : {product[9:0], 1'b0};
+
+    wire [NORM_W-1:0] norm_d = {norm_exp[4:0], norm_mant, norm_ext, mul_sign,
+                                mul_is_nan, mul_is_inf, mul_is_zero};
 
-                PACK: begin
-                    valid_out <= 1'b1;
-
-                    if (is_nan) begin
-                        result <= {16'h7E00}; // Quiet NaN
-                    end else if (is_inf_a | is_inf_b) begin
-                        result <= {{result_sign, 5'b11111, 10'b0}}; // Infinity
-                    end else if (is_zero_a | is_zero_b) begin
-                        result <= {{result_sign, 15'b0}}; // Zero
-                    end else begin
-                        // Normal/denormal result
-                        result <= {{result_sign, raw_exp[4:0], norm_mant}};
-                    end
-
-                    state <= IDLE;
+    wire [NORM_W-1:0] norm_q;
+    wire              norm_valid;
+
+    generate
+        if (NORMALIZE_STAGE) begin : g_normalize_reg
+            reg [NORM_W-1:0] q;
+            reg              v;
+            always @(posedge clk or negedge rst_n) begin
+                if (!rst_n) v <= 1'b0;
+                else        v <= mul_valid;
+            end
+            always @(posedge clk) begin
+                if (mul_valid) q <= norm_d;
+            end
+            assign norm_q     = q;
+            assign norm_valid = v;
+            assign norm_busy  = v;
+        end else begin : g_normalize_comb
+            assign norm_q     = norm_d;
+            assign norm_valid = mul_valid;
+            assign norm_busy  = 1'b0;
+        end
+    endgenerate
+
+    wire [4:0]  raw_exp;
+    wire [9:0]  pack_mant;
+    wire [10:0] pack_ext;
+    wire        result_sign, is_nan, is_inf, is_zero;
+
+    assign {raw_exp, pack_mant, pack_ext, result_sign, is_nan, is_inf, is_zero} = norm_q;
+
+    // === PACK ===
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            valid_out  <= 1'b0;
+            result     <= 16'b0;
+            result_ext <= 11'b0;
+        end else begin
+            valid_out <= norm_valid | early_done;
+            if (early_done) begin
+                result     <= early_result;
+                result_ext <= 11'b0;
+            end else if (norm_valid) begin
+                result_ext <= (is_nan | is_inf | is_zero) ? 11'b0 : pack_ext;
+                if (is_nan) begin
+                    result <= 16'h7E00; // Quiet NaN
+                end else if (is_inf) begin
+                    result <= {result_sign, 5'b11111, 10'b0}; // Infinity
+                end else if (is_zero) begin
+                    result <= {result_sign, 15'b0}; // Zero
+                end else begin
+                    // Normal/denormal result
+                    result <= {result_sign, raw_exp, pack_mant};
                 end
-            endcase
+            end
         end
     end
 
@@ -0,0 +1,155 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+// Iterative half-precision square root.
+//
+// Stages: input -> DECODE -> ITERATE (x SQRT_ITERS) -> PACK. DECODE
+// normalizes subnormal operands and makes the exponent even by doubling the
+// mantissa when it is odd, so the root of the mantissa lies in [1, 2).
+// ITERATE is a digit recurrence that retires two root bits per clock with two
+// cascaded restoring steps, and PACK truncates the root into the result.
+// The root of a positive fp16 value is always a normal number, so PACK never
+// rounds into the subnormal range or overflows.
+//
+// sqrt(-0) = -0, sqrt(+Inf) = +Inf, NaN and negative operands return the
+// quiet NaN 0x7E00.
+//
+// valid_out rises 2 + SQRT_ITERS clock edges after the edge that samples
+// valid_in. A new operation may only start once busy is low.
+module fpu_sqrt (
+    input  wire        clk,
+    input  wire        rst_n,
+    input  wire        valid_in,
+    input  wire [15:0] a,
+    output reg         valid_out,
+    output reg  [15:0] result,
+    output wire        busy
+);
+
+    localparam SQRT_ITERS = 6;  // 12 root bits
+
+    // === Stage 0: input registers ===
+    reg        s0_valid;
+    reg [15:0] reg_a;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            s0_valid <= 1'b0;
+        end else begin
+            s0_valid <= valid_in;
+        end
+    end
+
+    always @(posedge clk) begin
+        if (valid_in) begin
+            reg_a <= a;
+        end
+    end
+
+    // === DECODE ===
+    function [3:0] leading_zeros;
+        input [10:0] value;
+        integer i;
+        begin
+            leading_zeros = 11;
+            for (i = 0; i <= 10; i = i + 1) begin
+                if (value[i]) leading_zeros = 10 - i;
+            end
+        end
+    endfunction
+
+    wire is_nan  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] != 0);
+    wire is_inf  = (reg_a[14:10] == 5'b11111) && (reg_a[9:0] == 0);
+    wire is_zero = (reg_a[14:10] == 5'b0) && (reg_a[9:0] == 0);
+
+    // Subnormals take the exponent of the smallest normal and are shifted
+    // until their leading one reaches bit 10
+    wire [10:0] frac = (reg_a[14:10] == 5'b0) ? {1'b0, reg_a[9:0]} : {1'b1, reg_a[9:0]};
+    wire [3:0]  lz   = leading_zeros(frac);
+    wire [10:0] norm = frac << lz;
+
+    // Unbiased exponent; an odd one moves a factor of 2 into the mantissa
+    wire signed [7:0] exp_a    = (reg_a[14:10] == 5'b0) ? 8'sd1 : {3'b0, reg_a[14:10]};
+    wire signed [7:0] exp_unb  = exp_a - $signed({4'b0, lz}) - 8'sd15;
+    wire              odd      = exp_unb[0];
+    wire signed [7:0] exp_even = exp_unb - $signed({7'b0, odd});
+    wire signed [7:0] exp_r    = (exp_even >>> 1) + 8'sd15;
+
+    wire        special     = is_nan | is_inf | is_zero | reg_a[15];
+    wire [15:0] special_val = is_zero ? reg_a :
+                              (is_nan | reg_a[15]) ? 16'h7E00 :
+                              16'h7C00;
+
+    // === ITERATE ===
+    // The radicand is the mantissa scaled by 2^12, its integer root has
+    // 12 bits with the leading one in bit 11
+    reg [2:0]   it_count;
+    reg [23:0]  it_rad;
+    reg [13:0]  it_rem;
+    reg [11:0]  it_root;
+    reg [4:0]   it_exp;
+    reg         it_special;
+    reg [15:0]  it_special_val;
+    reg         pk_valid;
+
+    // Two restoring steps: each brings down two radicand bits and subtracts
+    // 4 * root + 1 when it fits, which appends a one to the root
+    wire [15:0] rem_in_1 = {it_rem, it_rad[23:22]};
+    wire [15:0] trial_1  = {2'b0, it_root, 2'b01};
+    wire        q_hi     = rem_in_1 >= trial_1;
+    wire [15:0] rem_1    = q_hi ? rem_in_1 - trial_1 : rem_in_1;
+    wire [11:0] root_1   = {it_root[10:0], q_hi};
+
+    wire [15:0] rem_in_2 = {rem_1[13:0], it_rad[21:20]};
+    wire [15:0] trial_2  = {2'b0, root_1, 2'b01};
+    wire        q_lo     = rem_in_2 >= trial_2;
+    wire [15:0] rem_2    = q_lo ? rem_in_2 - trial_2 : rem_in_2;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            it_count <= 0;
+            pk_valid <= 1'b0;
+        end else begin
+            pk_valid <= (it_count == 1);
+            if (s0_valid) begin
+                it_count <= SQRT_ITERS[2:0];
+            end else if (it_count != 0) begin
+                it_count <= it_count - 1;
+            end
+        end
+    end
+
+    always @(posedge clk) begin
+        if (s0_valid) begin
+            it_rad         <= odd ? {norm, 13'b0} : {1'b0, norm, 12'b0};
+            it_rem         <= 14'b0;
+            it_root        <= 12'b0;
+            it_exp         <= exp_r[4:0];
+            it_special     <= special;
+            it_special_val <= special_val;
+        end else if (it_count != 0) begin
+            it_rad         <= {it_rad[19:0], 4'b0};
+            it_rem         <= rem_2[13:0];
+            it_root        <= {root_1[10:0], q_lo};
+        end
+    end
+
+    // === PACK ===
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            valid_out <= 1'b0;
+            result    <= 16'b0;
+        end else begin
+            valid_out <= pk_valid;
+            if (pk_valid) begin
+                if (it_special)
+                    result <= it_special_val;
+                else
+                    result <= {1'b0, it_exp, it_root[10:1]};
+            end
+        end
+    end
+
+    assign busy = s0_valid || (it_count != 0) || pk_valid;
+
+endmodule
@@ -81,10 +81,14 @@ module spi_reg #(
   // General counter
   logic [5:0] buffer_counter;
 
+  // Burst: data words left after the current one
+  logic [7:0] burst_left;
+
   // Sample addr and data
   logic tx_buffer_load;
   logic sample_addr;
   logic sample_data;
+  logic next_tx_word;
 
   // Next state logic
   always_comb begin
@@ -93,6 +97,7 @@ module spi_reg #(
     tx_buffer_load = 1'b0;
     sample_addr = 1'b0;
     sample_data = 1'b0;
+    next_tx_word = 1'b0;
 
     case (state)
       STATE_IDLE : begin
@@ -120,7 +125,8 @@ module spi_reg #(
       STATE_RX_DATA : begin
         if (buffer_counter == REG_W[5:0]) begin
           sample_data = 1'b1;
-          next_state = STATE_IDLE;
+          // A burst receives burst_left more words
+          next_state = (burst_left != '0) ? STATE_RX_DATA : STATE_IDLE;
         end else if (eof == 1'b1) begin
           next_state = STATE_IDLE;
         end
@@ -133,7 +139,13 @@ module spi_reg #(
       end
       STATE_TX_DATA : begin
         if (buffer_counter == REG_W[5:0]) begin
-          next_state = STATE_IDLE;
+          if (burst_left != '0) begin
+            // Fetch the next register of the burst
+            next_tx_word = 1'b1;
+            next_state = STATE_TX_LOAD;
+          end else begin
+            next_state = STATE_IDLE;
+          end
         end else if (eof == 1'b1) begin
           next_state = STATE_IDLE;
         end
@@ -193,18 +205,50 @@ module spi_reg #(
   // Addr and Read/Write Command register
   logic [ADDR_W-1:0] addr;
 
+  // Burst address step, and wrap within the aligned register pair
+  logic [3:0] addr_step;
+  logic addr_wrap;
+  logic [ADDR_W-1:0] addr_next;
+
+  // Data valid strobe
+  logic dv;
+
+  // Move to the next register of a burst: after the write strobe of each
+  // received word, or when a transmitted word is complete
+  logic next_word;
+
+  assign next_word = (dv && burst_left != '0) || next_tx_word;
+
+  always_comb begin
+    addr_next = addr + {{(ADDR_W-4){1'b0}}, addr_step};
+    if (addr_wrap == 1'b1) begin
+      addr_next = {addr[ADDR_W-1:1], addr_next[0]};
+    end
+  end
+
   // Addr and Read/Write Command Registers
   always_ff @(negedge(rstb) or posedge(clk)) begin
     if (!rstb) begin
       addr <= '0;
       reg_rw <= '0;
       txn_width <= 2'b11;
+      burst_left <= '0;
+      addr_step <= '0;
+      addr_wrap <= '0;
     end else begin
       if (ena == 1'b1) begin
         if (sample_addr == 1'b1) begin
           addr <= txn_buffer[ADDR_W-1:0];
           reg_rw <= txn_buffer[REG_W-1];
           txn_width <= txn_buffer[REG_W-2:REG_W-3];
+          addr_wrap <= txn_buffer[REG_W-4];
+          addr_step <= txn_buffer[REG_W-5:REG_W-8];
+          burst_left <= txn_buffer[REG_W-9:REG_W-16];
+        end else if (next_word == 1'b1) begin
+          addr <= addr_next;
+          burst_left <= burst_left - 1'b1;
+        end else if (eof == 1'b1) begin
+          burst_left <= '0;
         end
       end
     end
@@ -214,9 +258,6 @@ module spi_reg #(
   assign reg_addr = addr;
   assign reg_addr_v = tx_buffer_load;
 
-  // Data valid strobe
-  logic dv;
-
   // RX buffer can be directly assigned to the data output.  
   // Previously this re-sampled but that cost 32 flops.
   // DV is only indicated at the end of the SPI transaction and txn_buffer will be stable, 
@@ -1,6 +1,13 @@
 `default_nettype none
 
-module tqvp_dsatizabal_fpu (
+module tqvp_dsatizabal_fpu #(
+    parameter QUEUE_ADDR_W  = 2,  // Command and result FIFOs hold 2**QUEUE_ADDR_W entries
+    parameter SIMD          = 0,  // 1: second fpu_adder/fpu_mult lane for 2 x fp16 ADD/SUB/MUL
+    parameter DIV_UNIT      = 1,  // 1: fpu_div for DIV and RECIP (RSQRT also needs SQRT_UNIT)
+    parameter SQRT_UNIT     = 1,  // 1: fpu_sqrt for SQRT and, with DIV_UNIT, RSQRT
+    parameter CVT_UNIT      = 1,  // 1: fpu_convert for CVT
+    parameter PERF_COUNTERS = 2   // 0: no performance counters (0x3C reads 0), 1: counters 0-3 only
+) (
     input         clk,
     input         rst_n,
 
@@ -17,98 +24,555 @@ module tqvp_dsatizabal_fpu (
     output        user_interrupt
 );
 
+    // Operands carry one fp16 per lane, lane 0 in [15:0]. Results are always
+    // 32 bits wide for the lanes and for conversions to fp32
+    localparam DATA_W = SIMD ? 32 : 16;
+    localparam RES_W  = 32;
+
     // === Memory-mapped Registers ===
-    reg [15:0] operand_a;
-    reg [15:0] operand_b;
-    reg [2:0]  operation;
+    reg [DATA_W-1:0] operand_a;
+    reg [DATA_W-1:0] operand_b;
+    reg [15:0] operand_c;
+    reg [15:0] accumulator;
+    reg [3:0]  operation;
+    reg [2:0]  cmp_func;
+
+    reg [RES_W-1:0]  result;
 
-    reg        busy;
-    reg        valid_in;
+    reg        simd_mode;
 
-    reg [15:0] result;
-    reg        ready;
+    reg        cmd_overflow;
+    reg        res_overflow;
+
+    reg [2:0]  irq_enable;
+    reg [3:0]  irq_res_level;
+    reg [3:0]  irq_cmd_level;
+    reg        irq_done;
 
     // === FSM States ===
     typedef enum logic [2:0] {
         IDLE            = 3'b000,
         READING         = 3'b001,
         OPERANDS_READY  = 3'b010,
-        CALCULATING     = 3'b011,
-        WRITING         = 3'b100
+        CALCULATING     = 3'b011
     } fpu_state_t;
 
-    reg[1:0] state;
+    // The bus side collects operands (IDLE/READING), the execution side runs
+    // one command at a time (IDLE/OPERANDS_READY/CALCULATING).
+    reg [2:0] bus_state;
+    reg [2:0] state;
 
     // === FPU Operations ===
-    typedef enum logic [2:0] {
-        ADD     = 3'b000,
-        SUB     = 3'b001,
-        MULT    = 3'b010
+    typedef enum logic [3:0] {
+        ADD     = 4'b0000,
+        SUB     = 4'b0001,
+        MULT    = 4'b0010,
+        FMA     = 4'b0011,
+        ACC     = 4'b0100,
+        MAC     = 4'b0101,
+        DIV     = 4'b0110,
+        RECIP   = 4'b0111,
+        SQRT    = 4'b1000,
+        RSQRT   = 4'b1001,
+        CVT     = 4'b1010,
+        CMP     = 4'b1011
     } fpu_operations_t;
 
+    // === Bus write decode ===
+    // 0x00-0x2F: operation slots, address[5:2] selects the operation and
+    //            address[1:0] the operand (A, B, C, or A and B packed)
+    // 0x30-0x3F: control registers
+    wire bus_write  = (data_write_n != 2'b11);
+    wire op_write   = bus_write && (address[5:4] != 2'b11);
+    wire ctrl_write = bus_write && (address[5:4] == 2'b11);
+    wire [3:0] slot_op = address[5:2];
+
+    // A and B packed into one write need all 32 bits: a byte or halfword
+    // write to the packed slot only carries A
+    wire word_write  = (data_write_n == 2'b10);
+    wire packed_slot = (address[1:0] == 2'b11);
+
+    wire write_a    = op_write && ((address[1:0] == 2'b00) || (packed_slot && !word_write)) &&
+                      (bus_state == IDLE);
+    // B completes the staged operation; ACC, RECIP, SQRT and RSQRT only need
+    // their single operand, CVT takes its conversion from the A register and
+    // CMP functions 5-7 (FABS, FNEG, FCLASS) only use B
+    wire unary_op   = (slot_op == ACC) || (slot_op == RECIP) || (slot_op == SQRT) ||
+                      (slot_op == RSQRT) || (slot_op == CVT) ||
+                      ((slot_op == CMP) && (cmp_func >= 3'd5));
+    wire write_b    = op_write && (address[1:0] == 2'b01) &&
+                      ((bus_state == READING) || unary_op);
+
+    // Packed write: A in [15:0] and B in [31:16] issue the operation at once
+    wire write_ab   = op_write && packed_slot && word_write;
+    wire cmd_write  = write_b || write_ab;
+
+    // A unary write issues its own operation. When the A of another one is
+    // staged, that A keeps waiting for its B
+    wire [3:0]  cmd_op = (write_ab || unary_op) ? slot_op :
+                         (bus_state == READING) ? operation : slot_op;
+    wire        keep_staged = write_b && unary_op && (bus_state == READING) && (slot_op != operation);
+    wire [DATA_W-1:0] packed_a = data_in[15:0];
+    wire [DATA_W-1:0] packed_b = data_in[31:16];
+    wire [DATA_W-1:0] cmd_a    = write_ab ? packed_a : operand_a;
+    wire [DATA_W-1:0] cmd_b    = write_ab ? packed_b : data_in[DATA_W-1:0];
+
+    // In SIMD mode ADD, SUB and MULT run on both lanes
+    wire        cmd_simd = simd_mode && !write_ab && (cmd_op == ADD || cmd_op == SUB || cmd_op == MULT);
+
+    // The C field carries operand C, or the function of a CMP
+    wire [15:0] cmd_c    = (cmd_op == CMP) ? {13'b0, cmp_func} : operand_c;
+
+    // === Command queue ===
+    // {SIMD, operation, C, A, B}, bypassed when the execution side is idle.
+    // C is taken when the command is posted, so a queued FMA keeps its addend
+    // when C is rewritten for the next one, and a queued CMP its function
+    localparam CMD_W = 1 + 4 + 16 + DATA_W + DATA_W;
+
+    wire             cmd_empty;
+    wire             cmd_full;
+    wire [QUEUE_ADDR_W:0] cmd_count;
+    wire [CMD_W-1:0] cmd_head;
+
+    wire cmd_bypass = cmd_write && (state == IDLE) && cmd_empty;
+    wire cmd_push   = cmd_write && !cmd_bypass;
+    wire cmd_pop    = (state == IDLE) && !cmd_empty;
+    wire cmd_flush  = ctrl_write && (address[3:2] == 2'b11) && data_in[0];
+
+    fpu_fifo #(.WIDTH(CMD_W), .ADDR_W(QUEUE_ADDR_W)) cmd_fifo (
+        .clk(clk),
+        .rst_n(rst_n),
+        .flush(cmd_flush),
+        .push(cmd_push),
+        .din({cmd_simd, cmd_op, cmd_c, cmd_a, cmd_b}),
+        .pop(cmd_pop),
+        .dout(cmd_head),
+        .empty(cmd_empty),
+        .full(cmd_full),
+        .count(cmd_count)
+    );
+
+    // Next command for the execution side: the bypassed write or the queue head
+    wire             next_valid = cmd_bypass || cmd_pop;
+    wire [CMD_W-1:0] next_cmd   = cmd_bypass ? {cmd_simd, cmd_op, cmd_c, cmd_a, cmd_b} : cmd_head;
+    wire [3:0]       next_op    = next_cmd[CMD_W-2 -: 4];
+    wire [15:0]      next_c     = next_cmd[2*DATA_W +: 16];
+    wire [15:0]      next_a     = next_cmd[DATA_W +: 16];
+    wire [15:0]      next_b     = next_cmd[15:0];
+
+    // === Single-cycle operations ===
+    // CMP (FMIN, FMAX, FEQ, FLT, FLE, FABS, FNEG, FCLASS selected by the
+    // function queued with it) completes as it leaves the queue, without entering CALCULATING.
+    // So does an operation whose unit is not built, returning the canonical NaN
+    wire [15:0] cmp_result;
+    wire        next_unbuilt = (!DIV_UNIT  && (next_op == DIV || next_op == RECIP || next_op == RSQRT)) ||
+                               (!SQRT_UNIT && (next_op == SQRT || next_op == RSQRT)) ||
+                               (!CVT_UNIT  && (next_op == CVT));
+    wire        fast_done    = (state == IDLE) && next_valid && ((next_op == CMP) || next_unbuilt);
+
+    fpu_compare cmp_inst (
+        .func(next_c[2:0]),
+        .a(next_a),
+        .b(next_b),
+        .result(cmp_result)
+    );
+
+    // === Command being executed ===
+    reg              exec_simd;
+    reg [3:0]        exec_op;
+    reg [15:0]       exec_c;
+    reg [DATA_W-1:0] exec_a;
+    reg [DATA_W-1:0] exec_b;
+
     // === Muxed B for subtract
-    wire [15:0] b_muxed = (operation == SUB) ? {~operand_b[15], operand_b[14:0]} : operand_b;
+    wire [15:0] b_muxed = (exec_op == SUB) ? {~exec_b[15], exec_b[14:0]} : exec_b[15:0];
+
+    // === Adder operands ===
+    // ADD/SUB: A +/- B, ACC: ACC + B, FMA: C + A*B, MAC: ACC + A*B
+    wire        chained = (exec_op == FMA) || (exec_op == MAC);
+    wire [15:0] add_a   = (exec_op == FMA) ? exec_c :
+                          (exec_op == ACC || exec_op == MAC) ? accumulator :
+                          exec_a[15:0];
+
+    // === FMA/MAC: the unrounded product A*B is fed into the adder ===
+    wire        chain_add_start;
+    wire [15:0] mul_result;
+    wire [10:0] mul_result_ext;
+    wire        mul_valid_out;
 
     // === Pipelined Adder ===
+    // Special operands take the early exit of fpu_adder and fpu_mult, except
+    // in SIMD operations, where both lanes have to finish on the same clock
     wire [15:0] add_result;
     wire        add_valid_out;
 
     fpu_adder add_inst (
         .clk(clk),
         .rst_n(rst_n),
-        .valid_in(valid_in && (operation == ADD || operation == SUB) && (state == OPERANDS_READY)),
-        .a(operand_a),
-        .b(b_muxed),
+        .valid_in(((exec_op == ADD || exec_op == SUB || exec_op == ACC) && (state == OPERANDS_READY)) || chain_add_start),
+        .a(add_a),
+        .b(chained ? mul_result : b_muxed),
+        .b_ext(chained ? mul_result_ext : 11'b0),
+        .early_en(!exec_simd),
         .valid_out(add_valid_out),
         .result(add_result)
     );
 
     // === Pipelined Multiplier ===
-    wire [15:0] mul_result;
-    wire        mul_valid_out;
-
     fpu_mult mul_inst (
         .clk(clk),
         .rst_n(rst_n),
-        .valid_in(valid_in && (operation == MULT) && (state == OPERANDS_READY)),
-        .a(operand_a[15:0]),
-        .b(operand_b[15:0]),
+        .valid_in((exec_op == MULT || chained) && (state == OPERANDS_READY)),
+        .a(exec_a[15:0]),
+        .b(exec_b[15:0]),
+        .early_en(!exec_simd),
         .valid_out(mul_valid_out),
-        .result(mul_result)
+        .result(mul_result),
+        .result_ext(mul_result_ext)
+    );
+
+    assign chain_add_start = chained && (state == CALCULATING) && mul_valid_out;
+
+    // === Iterative Square Root ===
+    // SQRT: sqrt(B), RSQRT: 1.0 / sqrt(B), the root is passed on to the divider
+    wire [15:0] sqrt_result;
+    wire        sqrt_valid_out;
+    wire        sqrt_busy;
+
+    generate
+        if (SQRT_UNIT) begin : g_sqrt
+            fpu_sqrt sqrt_inst (
+                .clk(clk),
+                .rst_n(rst_n),
+                .valid_in((exec_op == SQRT || exec_op == RSQRT) && (state == OPERANDS_READY)),
+                .a(exec_b[15:0]),
+                .valid_out(sqrt_valid_out),
+                .result(sqrt_result),
+                .busy(sqrt_busy)
+            );
+        end else begin : g_no_sqrt
+            assign sqrt_valid_out = 1'b0;
+            assign sqrt_result    = 16'b0;
+            assign sqrt_busy      = 1'b0;
+        end
+    endgenerate
+
+    wire        chain_div_start = (exec_op == RSQRT) && (state == CALCULATING) && sqrt_valid_out;
+
+    // === Iterative Divider ===
+    // DIV: A / B, RECIP: reciprocal estimate of B (1.0 / B to 7 bits)
+    wire [15:0] div_result;
+    wire        div_valid_out;
+    wire        div_busy;
+
+    generate
+        if (DIV_UNIT) begin : g_div
+            fpu_div div_inst (
+                .clk(clk),
+                .rst_n(rst_n),
+                .valid_in(((exec_op == DIV || exec_op == RECIP) && (state == OPERANDS_READY)) || chain_div_start),
+                .estimate(exec_op == RECIP),
+                .a((exec_op == DIV) ? exec_a[15:0] : 16'h3C00),
+                .b((exec_op == RSQRT) ? sqrt_result : exec_b[15:0]),
+                .valid_out(div_valid_out),
+                .result(div_result),
+                .busy(div_busy)
+            );
+        end else begin : g_no_div
+            assign div_valid_out = 1'b0;
+            assign div_result    = 16'b0;
+            assign div_busy      = 1'b0;
+        end
+    endgenerate
+
+    // === Format Conversions ===
+    // CVT: B converted as selected by A[2:0], rounded in mode A[6:4]
+    wire [31:0] cvt_result;
+    wire        cvt_valid_out;
+
+    generate
+        if (CVT_UNIT) begin : g_cvt
+            fpu_convert cvt_inst (
+                .clk(clk),
+                .rst_n(rst_n),
+                .valid_in((exec_op == CVT) && (state == OPERANDS_READY)),
+                .func(exec_a[2:0]),
+                .rm(exec_a[6:4]),
+                .a(exec_b[15:0]),
+                .valid_out(cvt_valid_out),
+                .result(cvt_result)
+            );
+        end else begin : g_no_cvt
+            assign cvt_valid_out = 1'b0;
+            assign cvt_result    = 32'b0;
+        end
+    endgenerate
+
+    wire        exec_done   = (state == CALCULATING) &&
+                              (add_valid_out || div_valid_out || cvt_valid_out || (mul_valid_out && !chained) ||
+                               (sqrt_valid_out && (exec_op != RSQRT)));
+    wire [15:0] exec_result_lo = add_valid_out ? add_result :
+                                 div_valid_out ? div_result :
+                                 sqrt_valid_out ? sqrt_result : mul_result;
+
+    // === SIMD lane 1 ===
+    // Same pipelines as lane 0, started on the same clock, so its results
+    // arrive together with lane 0's
+    wire [15:0]      exec_result_hi;
+
+    generate
+        if (SIMD) begin : g_lane1
+            wire [15:0] b_hi = exec_b[DATA_W-1:16];
+            wire [15:0] add_result_hi;
+            wire [15:0] mul_result_hi;
+            wire        add_valid_hi;
+            wire        mul_valid_hi;
+            wire [10:0] mul_result_ext_hi;
+
+            fpu_adder add_hi (
+                .clk(clk),
+                .rst_n(rst_n),
+                .valid_in(exec_simd && (exec_op == ADD || exec_op == SUB) && (state == OPERANDS_READY)),
+                .a(exec_a[DATA_W-1:16]),
+                .b((exec_op == SUB) ? {~b_hi[15], b_hi[14:0]} : b_hi),
+                .b_ext(11'b0),
+                .early_en(1'b0),
+                .valid_out(add_valid_hi),
+                .result(add_result_hi)
+            );
+
+            fpu_mult mul_hi (
+                .clk(clk),
+                .rst_n(rst_n),
+                .valid_in(exec_simd && (exec_op == MULT) && (state == OPERANDS_READY)),
+                .a(exec_a[DATA_W-1:16]),
+                .b(b_hi),
+                .early_en(1'b0),
+                .valid_out(mul_valid_hi),
+                .result(mul_result_hi),
+                .result_ext(mul_result_ext_hi)
+            );
+
+            assign exec_result_hi = exec_simd ? (add_valid_out ? add_result_hi : mul_result_hi) : 16'b0;
+        end else begin : g_scalar
+            assign exec_result_hi = 16'b0;
+        end
+    endgenerate
+
+    wire [RES_W-1:0] exec_result = cvt_valid_out ? cvt_result : {exec_result_hi, exec_result_lo};
+
+    // Completed operation from either side
+    wire             op_done   = exec_done || fast_done;
+    wire [RES_W-1:0] op_result = !fast_done  ? exec_result :
+                                 next_unbuilt ? 32'h7E00 : {16'b0, cmp_result};
+
+    // === Result queue ===
+    // When full, the oldest result is dropped so a host that never drains it
+    // can keep using the result register.
+    wire        res_empty;
+    wire        res_full;
+    wire [QUEUE_ADDR_W:0] res_count;
+    wire [RES_W-1:0]  res_head;
+
+    wire res_read  = (data_read_n != 2'b11) && (address == 6'h1C);
+    wire res_flush = ctrl_write && (address[3:2] == 2'b11) && data_in[1];
+
+    fpu_fifo #(.WIDTH(RES_W), .ADDR_W(QUEUE_ADDR_W)) res_fifo (
+        .clk(clk),
+        .rst_n(rst_n),
+        .flush(res_flush),
+        .push(op_done),
+        .din(op_result),
+        .pop(res_read || (op_done && res_full)),
+        .dout(res_head),
+        .empty(res_empty),
+        .full(res_full),
+        .count(res_count)
     );
 
-    // === Write Logic & FSM ===
+    wire busy  = (bus_state == READING) || !cmd_empty || (state != IDLE);
+    wire ready = !busy;
+
+    // Every posted operation has completed, an A waiting for its B aside
+    wire exec_idle = cmd_empty && (state == IDLE);
+
+    // === Interrupts ===
+    // bit 0: an operation completed (sticky, write 1 to 0x35 to clear)
+    // bit 1: the result queue holds at least irq_res_level results
+    // bit 2: the command queue holds at most irq_cmd_level commands
+    wire [2:0] irq_pending = {
+        {4'b0, cmd_count} <= {4'b0, irq_cmd_level},
+        {4'b0, res_count} >= {4'b0, irq_res_level},
+        irq_done
+    };
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            irq_enable    <= 0;
+            irq_res_level <= 1;
+            irq_cmd_level <= 0;
+            irq_done      <= 0;
+        end else begin
+            if (ctrl_write && (address[3:0] == 4'h4)) begin
+                irq_enable    <= data_in[2:0];
+                irq_res_level <= data_in[11:8];
+                irq_cmd_level <= data_in[15:12];
+            end
+            if (ctrl_write && (address[3:0] == 4'h5) && data_in[0]) begin
+                irq_done      <= 0;
+            end
+            if (op_done) begin
+                irq_done      <= 1;
+            end
+        end
+    end
+
+    // === Performance counters ===
+    // 0: clock cycles, 1: cycles the execution side is busy, 2: cycles with
+    // an operand A waiting for its B, 3: completed operations, all 32 bits;
+    // 4-15: completed operations per opcode (ADD..CMP), 16 bits. They run
+    // freely and wrap around, so the host takes differences of two reads.
+    // Writing 0x3A selects a counter and 0x3C reads it; 0x3C bit 3 clears them.
+    localparam OP_N = 12;
+
+    wire [3:0]  done_op    = fast_done ? next_op : exec_op;
+    wire        perf_clear = ctrl_write && (address[3:2] == 2'b11) && data_in[3];
+    reg  [3:0]  perf_sel;
+    wire [31:0] perf_word;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            perf_sel <= 0;
+        end else if (ctrl_write && (address[3:0] == 4'hA)) begin
+            perf_sel <= data_in[3:0];
+        end
+    end
+
+    generate
+        if (PERF_COUNTERS) begin : g_perf
+            reg  [31:0] count [0:3];
+            wire [3:0]  perf_event;
+            wire [15:0] op_word;
+
+            assign perf_event[0] = 1'b1;
+            assign perf_event[1] = (state != IDLE);
+            assign perf_event[2] = (bus_state == READING);
+            assign perf_event[3] = op_done;
+
+            integer i;
+            always @(posedge clk or negedge rst_n) begin
+                if (!rst_n) begin
+                    for (i = 0; i < 4; i = i + 1) count[i] <= 0;
+                end else if (perf_clear) begin
+                    for (i = 0; i < 4; i = i + 1) count[i] <= 0;
+                end else begin
+                    for (i = 0; i < 4; i = i + 1) begin
+                        if (perf_event[i]) count[i] <= count[i] + 1;
+                    end
+                end
+            end
+
+            // At most one operation completes per clock, so the per-opcode
+            // counters share a single incrementer
+            if (PERF_COUNTERS > 1) begin : g_op_count
+                reg  [15:0] op_count [0:OP_N-1];
+                wire [15:0] op_next = op_count[done_op] + 1'b1;
+
+                integer k;
+                always @(posedge clk or negedge rst_n) begin
+                    if (!rst_n) begin
+                        for (k = 0; k < OP_N; k = k + 1) op_count[k] <= 0;
+                    end else if (perf_clear) begin
+                        for (k = 0; k < OP_N; k = k + 1) op_count[k] <= 0;
+                    end else if (op_done && (done_op < OP_N)) begin
+                        op_count[done_op] <= op_next;
+                    end
+                end
+
+                assign op_word = (perf_sel >= 4) ? op_count[perf_sel - 4] : 16'b0;
+            end else begin : g_no_op_count
+                assign op_word = 16'b0;
+            end
+
+            assign perf_word = (perf_sel < 4) ? count[perf_sel[1:0]] : {16'b0, op_word};
+        end else begin : g_no_perf
+            assign perf_word = 32'b0;
+        end
+    endgenerate
+
+    // === Bus side: operand collection ===
     always @(posedge clk or negedge rst_n) begin
         if (!rst_n) begin
             operand_a     <= 0;
             operand_b     <= 0;
+            operand_c     <= 0;
             operation     <= 0;
-            valid_in      <= 0;
-            busy          <= 0;
+            cmp_func      <= 0;
+            bus_state     <= IDLE;
+            cmd_overflow  <= 0;
+            simd_mode     <= 0;
+        end else begin
+            if (write_a) begin
+                operation    <= slot_op;
+                operand_a    <= data_in[DATA_W-1:0];
+                bus_state    <= READING;
+            end
+
+            // A packed write replaces an A still waiting for its B
+            if (cmd_write) begin
+                operand_b    <= cmd_b;
+                if (!keep_staged) begin
+                    operation    <= cmd_op;
+                    operand_a    <= cmd_a;
+                    bus_state    <= IDLE;
+                end
+                if (cmd_push && cmd_full && !cmd_pop) begin
+                    cmd_overflow <= 1;
+                end
+            end
+
+            // The C slot of CMP selects its function instead
+            if (op_write && (address[1:0] == 2'b10)) begin
+                if (slot_op == CMP)
+                    cmp_func     <= data_in[2:0];
+                else
+                    operand_c    <= data_in;
+            end
+
+            if (ctrl_write && (address[3:2] == 2'b11) && data_in[2]) begin
+                cmd_overflow <= 0;
+            end
+
+            // Configuration: bit 0 enables SIMD (when built with SIMD lanes)
+            if (ctrl_write && (address[3:0] == 4'h8)) begin
+                simd_mode    <= (SIMD != 0) && data_in[0];
+            end
+        end
+    end
+
+    // === Execution FSM ===
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            exec_simd     <= 0;
+            exec_op       <= 0;
+            exec_c        <= 0;
+            exec_a        <= 0;
+            exec_b        <= 0;
+            accumulator   <= 0;
             state         <= IDLE;
             result        <= 0;
-            ready         <= 0;
+            res_overflow  <= 0;
         end else begin
             case (state)
                 IDLE: begin
-                    if (data_write_n != 2'b11) begin
-                        if (address[1:0] == 2'b00) begin
-                            operation    <= address[4:2];
-                            operand_a    <= data_in;
-                            ready        <= 0;
-                            busy         <= 1;
-                            state        <= READING;
-                        end
-                    end
-                end
-
-                READING: begin
-                    if (data_write_n != 2'b11) begin
-                        if (address[1:0] == 2'b01) begin
-                            operand_b    <= data_in;
-                            state        <= OPERANDS_READY;
-                            valid_in     <= 1;
+                    if (fast_done) begin
+                        result       <= op_result;
+                        if (res_full && !res_read) begin
+                            res_overflow <= 1;
                         end
+                    end else if (next_valid) begin
+                        {exec_simd, exec_op, exec_c, exec_a, exec_b} <= next_cmd;
+                        state        <= OPERANDS_READY;
                     end
                 end
 
@@ -117,34 +581,72 @@ module tqvp_dsatizabal_fpu (
                 end
 
                 CALCULATING: begin
-                    if (add_valid_out) begin
-                        result <= add_result;
-                        state  <= IDLE;
-                        ready  <= 1;
-                        busy   <= 0;
-                    end else if (mul_valid_out) begin
-                        result <= mul_result;
+                    if (exec_done) begin
+                        result <= exec_result;
+                        if (exec_op == ACC || exec_op == MAC) begin
+                            accumulator <= exec_result_lo;
+                        end
+                        if (res_full && !res_read) begin
+                            res_overflow <= 1;
+                        end
                         state  <= IDLE;
-                        ready  <= 1;
-                        busy   <= 0;
                     end
                 end
+
+                default: begin
+                    state        <= IDLE;
+                end
             endcase
+
+            // Control registers
+            if (ctrl_write && (address[3:2] == 2'b00)) begin
+                accumulator  <= data_in[15:0];
+            end
+            if (ctrl_write && (address[3:2] == 2'b11) && data_in[2]) begin
+                res_overflow <= 0;
+            end
         end
     end
 
     // === Read Logic ===
-    // === Read Logic ===
-    assign data_out = (address == 6'h00) ? { 16'b0, operand_a } :
-                      (address == 6'h04) ? { 16'b0, operand_b } :
-                      (address == 6'h08) ? {29'b0, operation} : // TODO: do I need to add control signals?
-                      (address == 6'h0C) ? result :
+    wire [7:0] cmd_count_byte = cmd_count;
+    wire [7:0] res_count_byte = res_count;
+
+    // Operand and result registers, zero extended to the bus width
+    wire [31:0] operand_a_word = operand_a;
+    wire [31:0] operand_b_word = operand_b;
+    wire [31:0] result_word    = result;
+    wire [31:0] res_head_word  = res_head;
+    wire [3:0]  units_built    = { (CVT_UNIT != 0), (SQRT_UNIT != 0), (DIV_UNIT != 0), (SIMD != 0) };
+
+    assign data_out = (address == 6'h00) ? operand_a_word :
+                      (address == 6'h04) ? operand_b_word :
+                      (address == 6'h08) ? {28'b0, operation} : // TODO: do I need to add control signals?
+                      (address == 6'h0C) ? result_word :
                       (address == 6'h10) ? {31'b0, busy} :
+                      (address == 6'h14) ? { 16'b0, operand_c } :
+                      (address == 6'h18) ? { 14'b0, res_overflow, cmd_overflow, res_count_byte, cmd_count_byte } :
+                      (address == 6'h1C) ? (res_empty ? 32'b0 : res_head_word) :
+                      (address == 6'h20) ? result_word :
+                      (address == 6'h30) ? { 16'b0, accumulator } :
+                      (address == 6'h34) ? { 16'b0, irq_cmd_level, irq_res_level, 5'b0, irq_enable } :
+                      (address == 6'h35) ? { 29'b0, irq_pending } :
+                      (address == 6'h38) ? { 12'b0, units_built, 15'b0, simd_mode } :
+                      (address == 6'h3A) ? { 28'b0, perf_sel } :
+                      (address == 6'h3C) ? perf_word :
                       32'h0;
 
-    assign data_ready       = ready;
+    // Queue, interrupt and counter registers never stall, everything else waits for the FPU to drain
+    wire no_wait = (address == 6'h18) || (address == 6'h1C) ||
+                   (address == 6'h34) || (address == 6'h35) || (address == 6'h38) ||
+                   (address == 6'h3A) || (address == 6'h3C);
+
+    // 0x20 returns the result as soon as the posted operations complete, so a
+    // single read replaces polling busy and then reading 0x0C
+    assign data_ready       = (address == 6'h20) ? exec_idle :
+                              no_wait ? 1'b1 : ready;
 
     assign uo_out           = 0;
-    assign user_interrupt   = 0;
+    assign user_interrupt   = |(irq_pending & irq_enable);
 
 endmodule
@@ -6,7 +6,13 @@
 `default_nettype none
 
 /** TinyQV peripheral test using SPI */
-module tt_um_tqv_peripheral_harness (
+module tt_um_tqv_peripheral_harness #(
+    // Passed to the peripheral, for tests of its optional units
+    parameter SIMD      = 0,
+    parameter DIV_UNIT  = 1,
+    parameter SQRT_UNIT = 1,
+    parameter CVT_UNIT  = 1
+) (
     input  wire [7:0] ui_in,    // Dedicated inputs
     output wire [7:0] uo_out,   // Dedicated outputs
     input  wire [7:0] uio_in,   // IOs: Input path
@@ -37,7 +43,12 @@ module tt_um_tqv_peripheral_harness (
   always @(negedge clk) rst_reg_n <= rst_n;
 
   // The peripheral under test.
-  tqvp_dsatizabal_fpu user_peripheral(
+  tqvp_dsatizabal_fpu #(
+    .SIMD(SIMD),
+    .DIV_UNIT(DIV_UNIT),
+    .SQRT_UNIT(SQRT_UNIT),
+    .CVT_UNIT(CVT_UNIT)
+  ) user_peripheral(
     .clk(clk),
     .rst_n(rst_reg_n),
     .ui_in(ui_in_sync),
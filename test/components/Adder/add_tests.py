@@ -1,9 +1,19 @@
 import cocotb
-from cocotb.triggers import RisingEdge
+from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly
 from cocotb.clock import Clock
 import struct
 import math
 import numpy as np
+import os
+
+from fp16_model import fp16_add, fp16_sub, assert_bits_equal, IEEE
+from fp16_stimulus import StimulusGenerator, Coverage
+
+# Random batch shard, set by test/regress.py to spread vectors over workers
+BATCH_SEED = int(os.environ.get("BATCH_SEED", "2025"))
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "2000"))
+# Vectors per coverage-driven batch
+COVERAGE_BATCH = 256
 
 def float_to_half_bin(f):
     return struct.unpack('>H', struct.pack('>e', f))[0]
@@ -54,8 +64,9 @@ async def test_fpu_add_normal(dut):
     ]
     for a, b in tests:
         actual = await apply_and_wait(dut, a, b)
-        expected = float(np.float16(a) + np.float16(b))
-        assert abs(actual - expected) < 1e-2, f"FAIL: {a} + {b} = {actual}, expected {expected}"
+        expected = int(fp16_add(float_to_half_bin(a), float_to_half_bin(b)))
+        assert float_to_half_bin(actual) == expected, \
+            f"FAIL: {a} + {b} = {actual}, expected {half_bin_to_float(expected)}"
         dut._log.info(f"PASS: {a} + {b} = {actual}")
 
 @cocotb.test()
@@ -79,8 +90,9 @@ async def test_fpu_add_with_signs(dut):
     ]
     for a, b in tests:
         actual = await apply_and_wait(dut, a, b)
-        expected = float(np.float16(a) + np.float16(b))
-        assert abs(actual - expected) < 1e-2, f"FAIL: {a} + {b} = {actual}, expected {expected}"
+        expected = int(fp16_add(float_to_half_bin(a), float_to_half_bin(b)))
+        assert float_to_half_bin(actual) == expected, \
+            f"FAIL: {a} + {b} = {actual}, expected {half_bin_to_float(expected)}"
         dut._log.info(f"PASS: {a} + {b} = {actual}")
 
 @cocotb.test()
@@ -102,8 +114,9 @@ async def test_fpu_subtraction(dut):
     ]
     for a, b in tests:
         actual = await apply_and_wait(dut, a, -b)
-        expected = float(np.float16(a) - np.float16(b))
-        assert abs(actual - expected) < 1e-2, f"FAIL: {a} - {b} = {actual}, expected {expected}"
+        expected = int(fp16_sub(float_to_half_bin(a), float_to_half_bin(b)))
+        assert float_to_half_bin(actual) == expected, \
+            f"FAIL: {a} - {b} = {actual}, expected {half_bin_to_float(expected)}"
         dut._log.info(f"PASS: {a} - {b} = {actual}")
 
 @cocotb.test()
@@ -132,6 +145,9 @@ async def test_fpu_edge_cases(dut):
     ]
     for a, b, expected in tests:
         actual = await apply_and_wait(dut, a, b)
+        raw = int(dut.result.value) & 0xFFFF
+        model = int(fp16_add(float_to_half_bin(a), float_to_half_bin(b)))
+        assert raw == model, f"FAIL: {a} + {b} = {raw:#06x}, model expected {model:#06x}"
 
         if math.isnan(expected):
             assert math.isnan(actual), f"FAIL: {a} + {b} = {actual}, expected NaN"
@@ -142,3 +158,217 @@ async def test_fpu_edge_cases(dut):
             assert abs(actual - expected) < 1e-2, f"FAIL: {a} + {b} = {actual}, expected {expected}"
 
         dut._log.info(f"PASS: {a} + {b} = {actual}")
+
+@cocotb.test()
+async def test_fpu_add_streaming(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+    tests = [
+        (1.0, 2.0),
+        (3.5, 1.25),
+        (-1.0, -2.0),
+        (5.0, -2.0),
+        (100.0, 0.01),
+        (1.5, -1.5),
+        (0.5, 0.25),
+        (100.0, 200.0),
+        (-3.5, 1.25),
+        (0.01, 0.01)
+    ]
+
+    # Reference results, one operation at a time
+    sequential = [await apply_and_wait(dut, a, b) for a, b in tests]
+
+    # Issue one operand pair per clock and record when each result appears
+    issued = []
+    results = []
+    cycle = 0
+    while len(results) < len(tests):
+        await FallingEdge(dut.clk)
+        if cycle < len(tests):
+            a, b = tests[cycle]
+            dut.a.value = float_to_half_bin(a)
+            dut.b.value = float_to_half_bin(b)
+            dut.valid_in.value = 1
+            issued.append(cycle)
+        else:
+            dut.valid_in.value = 0
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value == 1:
+            results.append((cycle, half_bin_to_float(int(dut.result.value) & 0xFFFF)))
+        cycle += 1
+        if cycle > len(tests) + 50:
+            raise TimeoutError("FPU did not drain the pipeline in time")
+
+    latency = results[0][0] - issued[0]
+    span = results[-1][0] - results[0][0] + 1
+    issue_rate = len(tests) / span
+    dut._log.info(f"STREAM: {len(tests)} ops, latency {latency} cycles, {issue_rate:.2f} ops/cycle")
+
+    assert latency == 5, f"FAIL: streaming latency is {latency} cycles, expected 5"
+    assert issue_rate == 1.0, f"FAIL: streaming issue rate is {issue_rate:.2f} ops/cycle, expected 1"
+
+    for (a, b), expected, (_, actual) in zip(tests, sequential, results):
+        assert struct.pack('>e', actual) == struct.pack('>e', expected), \
+            f"FAIL: streamed {a} + {b} = {actual}, expected {expected}"
+        dut._log.info(f"PASS: streamed {a} + {b} = {actual}")
+
+async def stream_batch(dut, a_bits, b_bits):
+    """Issue one operand pair per clock and collect the raw result bits."""
+    results = []
+    cycle = 0
+    while len(results) < len(a_bits):
+        await FallingEdge(dut.clk)
+        if cycle < len(a_bits):
+            dut.a.value = int(a_bits[cycle])
+            dut.b.value = int(b_bits[cycle])
+            dut.valid_in.value = 1
+        else:
+            dut.valid_in.value = 0
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value == 1:
+            results.append(int(dut.result.value) & 0xFFFF)
+        cycle += 1
+        if cycle > len(a_bits) + 50:
+            raise TimeoutError("FPU did not drain the pipeline in time")
+    await FallingEdge(dut.clk)
+    dut.valid_in.value = 0
+    return np.array(results, dtype=np.uint16)
+
+@cocotb.test()
+async def test_fpu_add_model_batch(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+    # Random bit patterns cover every class: subnormals, Inf, NaN and both signs
+    rng = np.random.default_rng(BATCH_SEED)
+    a_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+    b_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+
+    actual = await stream_batch(dut, a_bits, b_bits)
+    assert_bits_equal(actual, fp16_add(a_bits, b_bits), a_bits, b_bits, "+")
+
+    inexact = np.count_nonzero(actual != fp16_add(a_bits, b_bits, IEEE))
+    dut._log.info(f"PASS: {len(a_bits)} random additions bit-exact, {inexact} differ from round-to-nearest-even")
+
+# Special operands mixed into the random pairs: zeros, the smallest
+# subnormal, the largest normal, Inf and NaN of both signs
+EARLY_SPECIALS = [s | v for s in (0x0000, 0x8000) for v in (0x0000, 0x0001, 0x7BFF, 0x7C00, 0x7E00)]
+
+async def issue_bits(dut, a_bits, b_bits):
+    """Issue one operand pair and return (latency, result bits)."""
+    await FallingEdge(dut.clk)
+    dut.a.value = a_bits
+    dut.b.value = b_bits
+    dut.valid_in.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.valid_in.value = 0
+    for cycle in range(1, 20):
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value == 1:
+            return cycle, int(dut.result.value) & 0xFFFF
+    raise TimeoutError("FPU did not produce output in time")
+
+async def stream_with_gaps(dut, a_bits, b_bits, gaps):
+    """Issue the pairs with gaps[i] idle clocks after each and collect the results in order."""
+    results = []
+    schedule = []
+    for i, gap in enumerate(gaps):
+        schedule += [i] + [None] * int(gap)
+    cycle = 0
+    while len(results) < len(a_bits):
+        await FallingEdge(dut.clk)
+        i = schedule[cycle] if cycle < len(schedule) else None
+        if i is not None:
+            dut.a.value = int(a_bits[i])
+            dut.b.value = int(b_bits[i])
+        dut.valid_in.value = int(i is not None)
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value == 1:
+            results.append(int(dut.result.value) & 0xFFFF)
+        cycle += 1
+        if cycle > len(schedule) + 50:
+            raise TimeoutError("FPU did not drain the pipeline in time")
+    await FallingEdge(dut.clk)
+    dut.valid_in.value = 0
+    return np.array(results, dtype=np.uint16)
+
+@cocotb.test()
+async def test_fpu_add_early_out(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    dut.early_en.value = 1
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+    # (a, b, latency): special and far-apart operands leave after one clock
+    tests = [
+        (1.5, 0.0, 1),
+        (-0.0, -2.5, 1),
+        (-0.0, -0.0, 1),
+        (float('inf'), 1.0, 1),
+        (float('inf'), float('-inf'), 1),
+        (float('nan'), 1.0, 1),
+        (1024.0, 2.0 ** -13, 1),
+        (-(2.0 ** -13), 1024.0, 1),
+        (1024.0, 2.0 ** -10, 5),
+        (1.0, 2.0, 5),
+    ]
+    for a, b, expected_latency in tests:
+        a_bits, b_bits = float_to_half_bin(a), float_to_half_bin(b)
+        latency, raw = await issue_bits(dut, a_bits, b_bits)
+        expected = int(fp16_add(a_bits, b_bits))
+        assert raw == expected, f"FAIL: {a} + {b} = {raw:#06x}, expected {expected:#06x}"
+        assert latency == expected_latency, f"FAIL: {a} + {b} took {latency} cycles, expected {expected_latency}"
+        dut._log.info(f"PASS: {a} + {b} = {half_bin_to_float(raw)} in {latency} cycles")
+
+    # Early and full-latency pairs mixed with random gaps still come out in order
+    rng = np.random.default_rng(BATCH_SEED)
+    a_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+    b_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+    a_bits[::3] = rng.choice(EARLY_SPECIALS, len(a_bits[::3]))
+    b_bits[1::4] = rng.choice(EARLY_SPECIALS, len(b_bits[1::4]))
+    gaps = rng.integers(0, 6, BATCH_SIZE)
+
+    actual = await stream_with_gaps(dut, a_bits, b_bits, gaps)
+    assert_bits_equal(actual, fp16_add(a_bits, b_bits), a_bits, b_bits, "+")
+    dut._log.info(f"PASS: {len(a_bits)} additions with early exits bit-exact and in order")
+
+@cocotb.test()
+async def test_fpu_add_coverage(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+    # Constrained-random batches, aimed at the empty bins, until every
+    # coverage bin is hit
+    gen = StimulusGenerator("add", BATCH_SEED)
+    cov = Coverage("add")
+    while not cov.closed:
+        assert cov.vectors < 50 * COVERAGE_BATCH, \
+            f"FAIL: coverage still open after {cov.vectors} vectors\n{cov.report()}"
+        a_bits, b_bits = gen.batch(COVERAGE_BATCH, cov)
+        actual = await stream_batch(dut, a_bits, b_bits)
+        assert_bits_equal(actual, fp16_add(a_bits, b_bits), a_bits, b_bits, "+")
+        cov.sample(a_bits, b_bits, actual)
+
+    dut._log.info(f"PASS: coverage closed after {cov.vectors} additions, all bit-exact\n{cov.report()}")
@@ -1,6 +1,7 @@
 module dump();
 	initial begin
-		$dumpfile ("fpu_adder.vcd");
+		if ($test$plusargs("fst")) $dumpfile ("fpu_adder.fst");
+		else $dumpfile ("fpu_adder.vcd");
 		$dumpvars (0, fpu_add_tb);
 		#1;
 	end
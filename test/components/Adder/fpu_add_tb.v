@@ -6,6 +6,8 @@ module fpu_add_tb;
     reg rst_n = 0;
     reg [15:0] a;
     reg [15:0] b;
+    reg [10:0] b_ext = 0;
+    reg early_en = 0;
     reg valid_in;
     wire [15:0] result;
     wire valid_out;
@@ -16,8 +18,23 @@ module fpu_add_tb;
         .rst_n(rst_n),
         .a(a),
         .b(b),
+        .b_ext(b_ext),
         .valid_in(valid_in),
+        .early_en(early_en),
         .result(result),
         .valid_out(valid_out)
     );
+
+`ifdef WAVE_RING
+    // WAVES=ring: the last clocks of these signals, see test/wave_ring.v
+    wave_ring #(.WIDTH($bits(rst_n)))     ring_rst_n     (.clk(clk), .probe(rst_n));
+    wave_ring #(.WIDTH($bits(valid_in)))  ring_valid_in  (.clk(clk), .probe(valid_in));
+    wave_ring #(.WIDTH($bits(a)))         ring_a         (.clk(clk), .probe(a));
+    wave_ring #(.WIDTH($bits(b)))         ring_b         (.clk(clk), .probe(b));
+    wave_ring #(.WIDTH($bits(b_ext)))     ring_b_ext     (.clk(clk), .probe(b_ext));
+    wave_ring #(.WIDTH($bits(early_en)))  ring_early_en  (.clk(clk), .probe(early_en));
+    wave_ring #(.WIDTH($bits(valid_out))) ring_valid_out (.clk(clk), .probe(valid_out));
+    wave_ring #(.WIDTH($bits(result)))    ring_result    (.clk(clk), .probe(result));
+`endif
+
 endmodule
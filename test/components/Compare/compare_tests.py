@@ -0,0 +1,108 @@
+import cocotb
+from cocotb.triggers import Timer
+import numpy as np
+import os
+
+from fp16_model import (fp16_min, fp16_max, fp16_eq, fp16_lt, fp16_le, fp16_abs, fp16_neg, fp16_class,
+                        assert_bits_equal, FMIN, FMAX, FEQ, FLT, FLE, FABS, FNEG, FCLASS)
+
+# Random batch shard, set by test/regress.py to spread vectors over workers
+BATCH_SEED = int(os.environ.get("BATCH_SEED", "2025"))
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "2000"))
+
+BINARY = {
+    FMIN: ("min", fp16_min),
+    FMAX: ("max", fp16_max),
+    FEQ: ("==", fp16_eq),
+    FLT: ("<", fp16_lt),
+    FLE: ("<=", fp16_le),
+}
+UNARY = {
+    FABS: ("abs", fp16_abs),
+    FNEG: ("neg", fp16_neg),
+    FCLASS: ("class", fp16_class),
+}
+
+# Both signs of zero, the smallest and largest subnormal and normal, one,
+# Inf and a signaling and a quiet NaN
+SPECIALS = [s | v for s in (0x0000, 0x8000)
+            for v in (0x0000, 0x0001, 0x03FF, 0x0400, 0x3C00, 0x3C01, 0x7BFF, 0x7C00, 0x7C01, 0x7E00)]
+
+def float_to_half_bits(f):
+    """Converts Python float to IEEE-754 half-precision bits (stored in lower 16 bits of 32-bit word)."""
+    return int(np.float16(f).view(np.uint16)) & 0xFFFF
+
+async def evaluate(dut, func, a, b):
+    """Apply one operand pair to the combinational unit and return the result."""
+    dut.func.value = func
+    dut.a.value = int(a)
+    dut.b.value = int(b)
+    await Timer(1, units="ns")
+    return int(dut.result.value)
+
+async def sweep(dut, func, a_bits, b_bits):
+    results = [await evaluate(dut, func, a, b) for a, b in zip(a_bits, b_bits)]
+    return np.array(results, dtype=np.uint16)
+
+@cocotb.test()
+async def test_fpu_compare_examples(dut):
+    nan = float_to_half_bits(float('nan'))
+    tests = [
+        (FMIN, 1.0, 2.0, float_to_half_bits(1.0)),
+        (FMAX, 1.0, 2.0, float_to_half_bits(2.0)),
+        (FMIN, -0.0, 0.0, 0x8000),
+        (FMAX, -0.0, 0.0, 0x0000),
+        (FMIN, -3.0, -2.0, float_to_half_bits(-3.0)),
+        (FMAX, -3.0, 0.0, 0x0000),
+        (FMIN, float('nan'), 5.0, float_to_half_bits(5.0)),
+        (FMAX, -5.0, float('nan'), float_to_half_bits(-5.0)),
+        (FMAX, float('nan'), float('nan'), nan),
+        (FEQ, -0.0, 0.0, 1),
+        (FEQ, float('nan'), float('nan'), 0),
+        (FLT, -0.0, 0.0, 0),
+        (FLT, -1.0, 0.5, 1),
+        (FLE, 0.5, 0.5, 1),
+        (FLE, float('nan'), 1.0, 0),
+        (FABS, 0.0, -2.5, float_to_half_bits(2.5)),
+        (FNEG, 0.0, 2.5, float_to_half_bits(-2.5)),
+        (FNEG, 0.0, float('nan'), nan | 0x8000),
+        (FCLASS, 0.0, float('-inf'), 1 << 0),
+        (FCLASS, 0.0, -0.0, 1 << 3),
+        (FCLASS, 0.0, 1.0, 1 << 6),
+        (FCLASS, 0.0, float('nan'), 1 << 9),
+    ]
+    for func, a, b, expected in tests:
+        actual = await evaluate(dut, func, float_to_half_bits(a), float_to_half_bits(b))
+        assert actual == expected, f"FAIL: func {func} of {a}, {b} = {actual:#06x}, expected {expected:#06x}"
+        dut._log.info(f"PASS: func {func} of {a}, {b} = {actual:#06x}")
+
+@cocotb.test()
+async def test_fpu_compare_specials(dut):
+    # Every pair of special values, in both orders
+    a_bits = np.repeat(np.array(SPECIALS, dtype=np.uint16), len(SPECIALS))
+    b_bits = np.tile(np.array(SPECIALS, dtype=np.uint16), len(SPECIALS))
+    for func, (name, model) in BINARY.items():
+        actual = await sweep(dut, func, a_bits, b_bits)
+        assert_bits_equal(actual, model(a_bits, b_bits), a_bits, b_bits, name)
+        dut._log.info(f"PASS: {len(a_bits)} special pairs for {name}")
+
+@cocotb.test()
+async def test_fpu_compare_model_batch(dut):
+    rng = np.random.default_rng(BATCH_SEED)
+    a_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+    b_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+    # Equal magnitudes and equal values are rare in random pairs
+    b_bits[::4] = a_bits[::4] ^ rng.choice([0x0000, 0x8000], len(a_bits[::4])).astype(np.uint16)
+    for func, (name, model) in BINARY.items():
+        actual = await sweep(dut, func, a_bits, b_bits)
+        assert_bits_equal(actual, model(a_bits, b_bits), a_bits, b_bits, name)
+        dut._log.info(f"PASS: {len(a_bits)} random pairs for {name}")
+
+@cocotb.test()
+async def test_fpu_compare_unary_exhaustive(dut):
+    values = np.arange(1 << 16, dtype=np.uint16)
+    zeros = np.zeros_like(values)
+    for func, (name, model) in UNARY.items():
+        actual = await sweep(dut, func, zeros, values)
+        assert_bits_equal(actual, model(values), values, op=name)
+        dut._log.info(f"PASS: all {len(values)} inputs for {name}")
@@ -0,0 +1,8 @@
+module dump();
+	initial begin
+		if ($test$plusargs("fst")) $dumpfile ("fpu_compare.fst");
+		else $dumpfile ("fpu_compare.vcd");
+		$dumpvars (0, fpu_compare_tb);
+		#1;
+	end
+endmodule
@@ -0,0 +1,19 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+module fpu_compare_tb;
+
+    reg  [2:0]  func;
+    reg  [15:0] a;
+    reg  [15:0] b;
+    wire [15:0] result;
+
+    // Instantiate the combinational compare unit
+    fpu_compare uut (
+        .func(func),
+        .a(a),
+        .b(b),
+        .result(result)
+    );
+
+endmodule
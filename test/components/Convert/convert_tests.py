@@ -0,0 +1,160 @@
+import cocotb
+from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly
+from cocotb.clock import Clock
+import numpy as np
+
+from fp16_model import (int16_to_fp16, uint16_to_fp16, fp16_to_int16, fp16_to_bf16, bf16_to_fp16,
+                        fp16_to_fp32, assert_bits_equal, RNE, RTZ, RDN, RUP, RMM)
+
+I2F, U2F, F2I, F2BF, BF2F, F2F32 = range(6)
+
+# Expected low 16 bits of every conversion (F2F32 returns all 32 bits)
+MODELS = {
+    I2F: ("int16->fp16", int16_to_fp16),
+    U2F: ("uint16->fp16", uint16_to_fp16),
+    F2I: ("fp16->int16", fp16_to_int16),
+    F2BF: ("fp16->bf16", fp16_to_bf16),
+    BF2F: ("bf16->fp16", bf16_to_fp16),
+}
+
+def float_to_half_bits(f):
+    """Converts Python float to IEEE-754 half-precision bits (stored in lower 16 bits of 32-bit word)."""
+    return int(np.float16(f).view(np.uint16)) & 0xFFFF
+
+def half_bits_to_float(bits):
+    """Converts lower 16 bits of 32-bit word to Python float (half-precision)."""
+    return float(np.uint16(bits).view(np.float16))
+
+async def reset_dut(dut):
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    dut.func.value = 0
+    dut.rm.value = 0
+    await RisingEdge(dut.clk)
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+async def stream(dut, func, rm, values):
+    """Issue one value per clock and return (latency, results in order)."""
+    results = []
+    cycle = 0
+    first = None
+    while len(results) < len(values):
+        await FallingEdge(dut.clk)
+        if cycle < len(values):
+            dut.a.value = int(values[cycle])
+            dut.func.value = func
+            dut.rm.value = rm
+            dut.valid_in.value = 1
+        else:
+            dut.valid_in.value = 0
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value == 1:
+            if first is None:
+                first = cycle
+            results.append(int(dut.result.value))
+        cycle += 1
+        if cycle > len(values) + 20:
+            raise TimeoutError("Converter did not drain the pipeline in time")
+    return first, np.array(results, dtype=np.uint32)
+
+@cocotb.test()
+async def test_fpu_convert_examples(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    tests = [
+        (I2F, RNE, 0x0005, float_to_half_bits(5.0)),
+        (I2F, RNE, 0xFFFD, float_to_half_bits(-3.0)),
+        (I2F, RNE, 0x8000, float_to_half_bits(-32768.0)),
+        (I2F, RTZ, 2049, float_to_half_bits(2048.0)),
+        (I2F, RUP, 2049, float_to_half_bits(2050.0)),
+        (U2F, RNE, 65535, 0x7C00),
+        (U2F, RTZ, 65535, 0x7BFF),
+        (F2I, RNE, float_to_half_bits(2.5), 2),
+        (F2I, RMM, float_to_half_bits(2.5), 3),
+        (F2I, RDN, float_to_half_bits(-0.5), 0xFFFFFFFF),
+        (F2I, RTZ, float_to_half_bits(-1000.5), (-1000) & 0xFFFFFFFF),
+        (F2I, RNE, float_to_half_bits(60000.0), 0x7FFF),
+        (F2I, RNE, 0x7E00, 0x7FFF),
+        (F2BF, RNE, float_to_half_bits(1.0), 0x3F80),
+        (F2BF, RNE, float_to_half_bits(-2.0 ** -24), 0xB380),
+        (BF2F, RNE, 0x4049, float_to_half_bits(3.140625)),
+        (BF2F, RNE, 0x7F80, 0x7C00),
+        (BF2F, RTZ, 0x4780, 0x7BFF),
+        (F2F32, RNE, float_to_half_bits(1.5), 0x3FC00000),
+        (F2F32, RNE, 0x0001, 0x33800000),
+    ]
+    for func, rm, value, expected in tests:
+        _, results = await stream(dut, func, rm, [value])
+        actual = int(results[0])
+        assert actual == expected, f"FAIL: func {func} rm {rm} of {value:#06x} = {actual:#010x}, expected {expected:#010x}"
+        dut._log.info(f"PASS: func {func} rm {rm} of {value:#06x} = {actual:#010x}")
+
+@cocotb.test()
+async def test_fpu_convert_latency(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    latency, _ = await stream(dut, I2F, RNE, range(10))
+    expected_latency = int(dut.latency.value)
+    dut._log.info(f"LATENCY: {latency} cycles")
+    assert latency == expected_latency, f"FAIL: latency is {latency} cycles, expected {expected_latency}"
+
+async def sweep(dut, func):
+    """Every 16-bit input of one conversion in every rounding mode."""
+    name, model = MODELS[func]
+    values = np.arange(1 << 16, dtype=np.uint16)
+    for rm in (RNE, RTZ, RDN, RUP, RMM):
+        _, actual = await stream(dut, func, rm, values)
+        expected = model(values, rm)
+        if func == F2I:
+            expected = expected.view(np.int16).astype(np.int32).view(np.uint32)
+        assert_bits_equal(actual.astype(np.uint16), expected.astype(np.uint16), values, op=name)
+        assert (actual >> 16 == expected.astype(np.uint32) >> 16).all(), f"FAIL: {name} upper half"
+        dut._log.info(f"PASS: all {len(values)} {name} conversions, rm {rm}")
+
+@cocotb.test()
+async def test_fpu_i2f_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+    await sweep(dut, I2F)
+
+@cocotb.test()
+async def test_fpu_u2f_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+    await sweep(dut, U2F)
+
+@cocotb.test()
+async def test_fpu_f2i_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+    await sweep(dut, F2I)
+
+@cocotb.test()
+async def test_fpu_f2bf_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+    await sweep(dut, F2BF)
+
+@cocotb.test()
+async def test_fpu_bf2f_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+    await sweep(dut, BF2F)
+
+@cocotb.test()
+async def test_fpu_f2f32_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    values = np.arange(1 << 16, dtype=np.uint16)
+    _, actual = await stream(dut, F2F32, RNE, values)
+    expected = fp16_to_fp32(values)
+    bad = np.flatnonzero(actual != expected)
+    assert bad.size == 0, \
+        f"FAIL: {bad.size} fp16->fp32 conversions differ, e.g. {int(values[bad[0]]):#06x} = {int(actual[bad[0]]):#010x}"
+    dut._log.info(f"PASS: all {len(values)} fp16->fp32 conversions")
@@ -0,0 +1,8 @@
+module dump();
+	initial begin
+		if ($test$plusargs("fst")) $dumpfile ("fpu_convert.fst");
+		else $dumpfile ("fpu_convert.vcd");
+		$dumpvars (0, fpu_convert_tb);
+		#1;
+	end
+endmodule
\ No newline at end of file
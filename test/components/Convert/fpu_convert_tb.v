@@ -0,0 +1,41 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+module fpu_convert_tb;
+
+    reg         clk;
+    reg         rst_n;
+    reg         valid_in;
+    reg  [2:0]  func;
+    reg  [2:0]  rm;
+    reg  [15:0] a;
+    wire        valid_out;
+    wire [31:0] result;
+
+    // Expected pipeline latency
+    wire [3:0]  latency = 1;
+
+    // Instantiate the format converter
+    fpu_convert uut (
+        .clk(clk),
+        .rst_n(rst_n),
+        .valid_in(valid_in),
+        .func(func),
+        .rm(rm),
+        .a(a),
+        .valid_out(valid_out),
+        .result(result)
+    );
+
+`ifdef WAVE_RING
+    // WAVES=ring: the last clocks of these signals, see test/wave_ring.v
+    wave_ring #(.WIDTH($bits(rst_n)))     ring_rst_n     (.clk(clk), .probe(rst_n));
+    wave_ring #(.WIDTH($bits(valid_in)))  ring_valid_in  (.clk(clk), .probe(valid_in));
+    wave_ring #(.WIDTH($bits(func)))      ring_func      (.clk(clk), .probe(func));
+    wave_ring #(.WIDTH($bits(rm)))        ring_rm        (.clk(clk), .probe(rm));
+    wave_ring #(.WIDTH($bits(a)))         ring_a         (.clk(clk), .probe(a));
+    wave_ring #(.WIDTH($bits(valid_out))) ring_valid_out (.clk(clk), .probe(valid_out));
+    wave_ring #(.WIDTH($bits(result)))    ring_result    (.clk(clk), .probe(result));
+`endif
+
+endmodule
@@ -0,0 +1,182 @@
+import cocotb
+from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly
+from cocotb.clock import Clock
+import numpy as np
+import math
+import os
+
+from fp16_model import fp16_div, fp16_recip, assert_bits_equal, IEEE
+
+# Random batch shard, set by test/regress.py to spread vectors over workers
+BATCH_SEED = int(os.environ.get("BATCH_SEED", "2025"))
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "2000"))
+
+def float_to_half_bits(f):
+    """Converts Python float to IEEE-754 half-precision bits (stored in lower 16 bits of 32-bit word)."""
+    return int(np.float16(f).view(np.uint16)) & 0xFFFF
+
+def half_bits_to_float(bits):
+    """Converts lower 16 bits of 32-bit word to Python float (half-precision)."""
+    return float(np.uint16(bits).view(np.float16))
+
+async def reset_dut(dut):
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    dut.estimate.value = 0
+    await RisingEdge(dut.clk)
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+async def issue_bits(dut, a_bits, b_bits, estimate=0):
+    """Start one operation and return (latency, result bits)."""
+    await FallingEdge(dut.clk)
+    dut.a.value = a_bits
+    dut.b.value = b_bits
+    dut.estimate.value = estimate
+    dut.valid_in.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.valid_in.value = 0
+
+    for cycle in range(1, 20):
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value:
+            return cycle, int(dut.result.value) & 0xFFFF
+    raise TimeoutError("Divider did not return a result in time")
+
+async def apply_and_wait(dut, a_float, b_float):
+    _, bits = await issue_bits(dut, float_to_half_bits(a_float), float_to_half_bits(b_float))
+    return half_bits_to_float(bits)
+
+def check_model(dut, a, b):
+    """Compare the raw result bits with the golden model."""
+    raw = int(dut.result.value) & 0xFFFF
+    model = int(fp16_div(float_to_half_bits(a), float_to_half_bits(b)))
+    assert raw == model, f"FAIL: {a} / {b} = {raw:#06x}, model expected {model:#06x}"
+
+@cocotb.test()
+async def test_fpu_div_normal(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    tests = [
+        (3.0, 1.5, 2.0),
+        (1.0, 4.0, 0.25),
+        (10.0, 4.0, 2.5),
+        (1.0, 3.0, 0.3333),
+        (100.0, 0.5, 200.0),
+        (0.001, 0.1, 0.01)
+    ]
+    for a, b, expected in tests:
+        actual = await apply_and_wait(dut, a, b)
+        assert abs(actual - expected) < 1e-2, f"FAIL: {a} / {b} = {actual}, expected {expected}"
+        check_model(dut, a, b)
+        dut._log.info(f"PASS: {a} / {b} = {actual}")
+
+@cocotb.test()
+async def test_fpu_div_with_signs(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    tests = [
+        (-4.0, 2.0, -2.0),
+        (-1.0, -1.0, 1.0),
+        (3.0, -2.0, -1.5),
+        (-9.0, -3.0, 3.0),
+        (0.0, -10.0, 0.0),
+        (-0.0, 5.0, 0.0),
+    ]
+    for a, b, expected in tests:
+        actual = await apply_and_wait(dut, a, b)
+        assert abs(actual - expected) < 1e-2, f"FAIL: {a} / {b} = {actual}, expected {expected}"
+        check_model(dut, a, b)
+        dut._log.info(f"PASS: {a} / {b} = {actual}")
+
+@cocotb.test()
+async def test_fpu_div_edge_cases(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    nan = float('nan')
+    inf = float('inf')
+    tests = [
+        (1.0, 0.0, inf),
+        (-1.0, 0.0, -inf),
+        (1.0, -0.0, -inf),
+        (inf, 2.0, inf),
+        (-inf, 2.0, -inf),
+        (2.0, inf, 0.0),
+        (0.0, 0.0, nan),
+        (inf, inf, nan),
+        (nan, 1.0, nan),
+        (1.0, nan, nan),
+        (60000.0, 0.5, inf),
+        (1e-4, 1e4, 0.0)
+    ]
+    for a, b, expected in tests:
+        actual = await apply_and_wait(dut, a, b)
+        check_model(dut, a, b)
+        if math.isnan(expected):
+            assert math.isnan(actual), f"FAIL: {a} / {b} = {actual}, expected NaN"
+        elif math.isinf(expected):
+            assert math.isinf(actual) and (math.copysign(1, actual) == math.copysign(1, expected)), \
+                f"FAIL: {a} / {b} = {actual}, expected {expected}"
+        else:
+            assert abs(actual - expected) < 1e-2, f"FAIL: {a} / {b} = {actual}, expected {expected}"
+        dut._log.info(f"PASS: {a} / {b} = {actual}")
+
+@cocotb.test()
+async def test_fpu_div_latency(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    div_latency, _ = await issue_bits(dut, float_to_half_bits(1.0), float_to_half_bits(3.0))
+    est_latency, _ = await issue_bits(dut, float_to_half_bits(1.0), float_to_half_bits(3.0), estimate=1)
+    dut._log.info(f"LATENCY: divide {div_latency} cycles, reciprocal estimate {est_latency} cycles")
+
+    assert div_latency == int(dut.div_latency.value), \
+        f"FAIL: division latency is {div_latency} cycles, expected {int(dut.div_latency.value)}"
+    assert est_latency == int(dut.est_latency.value), \
+        f"FAIL: estimate latency is {est_latency} cycles, expected {int(dut.est_latency.value)}"
+    await FallingEdge(dut.clk)
+    assert dut.busy.value == 0, "FAIL: divider still busy after returning its result"
+
+@cocotb.test()
+async def test_fpu_recip_estimate(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    # The estimate keeps 7 fraction bits, so its relative error is below 2^-7
+    for b in [1.0, 3.0, -0.75, 10.0, 0.1, 1000.0, -7.5, 2e-5]:
+        b_bits = float_to_half_bits(b)
+        _, raw = await issue_bits(dut, float_to_half_bits(1.0), b_bits, estimate=1)
+        model = int(fp16_recip(np.uint16(b_bits)))
+        assert raw == model, f"FAIL: recip({b}) = {raw:#06x}, model expected {model:#06x}"
+        actual = half_bits_to_float(raw)
+        exact = 1.0 / half_bits_to_float(b_bits)
+        assert abs(actual - exact) <= abs(exact) * 2 ** -7, f"FAIL: recip({b}) = {actual}, expected {exact}"
+        dut._log.info(f"PASS: recip({b}) = {actual}")
+
+@cocotb.test()
+async def test_fpu_div_model_batch(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await reset_dut(dut)
+
+    # Random bit patterns cover every class: subnormals, Inf, NaN and both signs
+    rng = np.random.default_rng(BATCH_SEED)
+    a_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+    b_bits = rng.integers(0, 1 << 16, BATCH_SIZE, dtype=np.uint16)
+
+    # The divider is iterative: issue the next pair once the result is out
+    results = []
+    for a, b in zip(a_bits, b_bits):
+        _, raw = await issue_bits(dut, int(a), int(b))
+        results.append(raw)
+
+    actual = np.array(results, dtype=np.uint16)
+    assert_bits_equal(actual, fp16_div(a_bits, b_bits), a_bits, b_bits, "/")
+
+    inexact = np.count_nonzero(actual != fp16_div(a_bits, b_bits, IEEE))
+    dut._log.info(f"PASS: {len(a_bits)} random quotients bit-exact, {inexact} differ from round-to-nearest-even")
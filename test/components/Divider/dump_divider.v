@@ -0,0 +1,8 @@
+module dump();
+	initial begin
+		if ($test$plusargs("fst")) $dumpfile ("fpu_divider.fst");
+		else $dumpfile ("fpu_divider.vcd");
+		$dumpvars (0, fpu_div_tb);
+		#1;
+	end
+endmodule
\ No newline at end of file
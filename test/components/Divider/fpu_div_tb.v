@@ -0,0 +1,45 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+module fpu_div_tb;
+
+    reg         clk;
+    reg         rst_n;
+    reg         valid_in;
+    reg         estimate;
+    reg  [15:0] a;
+    reg  [15:0] b;
+    wire        valid_out;
+    wire [15:0] result;
+    wire        busy;
+
+    // Expected latency of a division and of a reciprocal estimate
+    wire [3:0]  div_latency = 8;
+    wire [3:0]  est_latency = 6;
+
+    // Instantiate the iterative divider
+    fpu_div uut (
+        .clk(clk),
+        .rst_n(rst_n),
+        .valid_in(valid_in),
+        .estimate(estimate),
+        .a(a),
+        .b(b),
+        .valid_out(valid_out),
+        .result(result),
+        .busy(busy)
+    );
+
+`ifdef WAVE_RING
+    // WAVES=ring: the last clocks of these signals, see test/wave_ring.v
+    wave_ring #(.WIDTH($bits(rst_n)))     ring_rst_n     (.clk(clk), .probe(rst_n));
+    wave_ring #(.WIDTH($bits(valid_in)))  ring_valid_in  (.clk(clk), .probe(valid_in));
+    wave_ring #(.WIDTH($bits(estimate)))  ring_estimate  (.clk(clk), .probe(estimate));
+    wave_ring #(.WIDTH($bits(a)))         ring_a         (.clk(clk), .probe(a));
+    wave_ring #(.WIDTH($bits(b)))         ring_b         (.clk(clk), .probe(b));
+    wave_ring #(.WIDTH($bits(valid_out))) ring_valid_out (.clk(clk), .probe(valid_out));
+    wave_ring #(.WIDTH($bits(result)))    ring_result    (.clk(clk), .probe(result));
+    wave_ring #(.WIDTH($bits(busy)))      ring_busy      (.clk(clk), .probe(busy));
+`endif
+
+endmodule
@@ -0,0 +1,235 @@
+"""Exhaustive check of fpu_adder / fpu_mult over all 2**32 operand pairs.
+
+The operand space is split into 65536 rows (one per operand A, each holding
+every operand B) and the rows into shards. Every shard runs the Verilator
+harness on its rows in a separate process and compares each row with the
+vectorized golden model (test/fp16_model.py).
+
+Progress is kept per shard in the progress directory and updated after every
+row, so an interrupted run resumes where it stopped. Shards can also be
+spread over several machines with --only and merged afterwards with
+--report-only.
+
+usage:
+    python3 exhaustive.py --unit add --harness obj_add/Vdut --jobs 16
+    python3 exhaustive.py --unit add --report-only
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from fp16_model import IEEE, RTL, fp16_add, fp16_mul
+
+ROW = 1 << 16
+ROWS = 1 << 16
+
+MODELS = {"add": fp16_add, "mul": fp16_mul}
+CLASSES = ("zero", "subnormal", "normal", "inf", "nan")
+MAX_EXAMPLES = 20
+
+
+def classify(bits):
+    """Class index (see CLASSES) of every fp16 bit pattern."""
+    bits = np.asarray(bits, dtype=np.uint16)
+    exp = (bits >> 10) & 0x1F
+    mant = bits & 0x3FF
+    return np.select(
+        [(exp == 0) & (mant == 0), exp == 0, exp != 0x1F, mant == 0],
+        [0, 1, 2, 3],
+        4,
+    )
+
+
+def shard_rows(shard, shards):
+    return shard * ROWS // shards, (shard + 1) * ROWS // shards
+
+
+def progress_path(directory, unit, mode, shard, shards):
+    return os.path.join(directory, f"{unit}_{mode}_{shard:05d}_of_{shards:05d}.json")
+
+
+def load_progress(path, unit, mode, shard, shards):
+    first, end = shard_rows(shard, shards)
+    state = {
+        "unit": unit,
+        "mode": mode,
+        "shard": shard,
+        "shards": shards,
+        "first_row": first,
+        "end_row": end,
+        "next_row": first,
+        "mismatches": 0,
+        "by_class": {},
+        "examples": [],
+        "seconds": 0.0,
+    }
+    if os.path.exists(path):
+        with open(path) as f:
+            saved = json.load(f)
+        if all(saved.get(k) == state[k] for k in ("unit", "mode", "shard", "shards")):
+            state.update(saved)
+    return state
+
+
+def save_progress(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def run_shard(harness, unit, mode, shard, shards, directory):
+    """Sweep the remaining rows of one shard. Returns the final progress."""
+    path = progress_path(directory, unit, mode, shard, shards)
+    state = load_progress(path, unit, mode, shard, shards)
+    if state["next_row"] >= state["end_row"]:
+        return state
+
+    model = MODELS[unit]
+    b = np.arange(ROW, dtype=np.uint16)
+    b_class = classify(b)
+    start = time.monotonic()
+    seconds = state["seconds"]
+
+    proc = subprocess.Popen(
+        [harness, str(state["next_row"]), str(state["end_row"])],
+        stdout=subprocess.PIPE,
+        bufsize=ROW * 2,
+    )
+    try:
+        for row in range(state["next_row"], state["end_row"]):
+            raw = proc.stdout.read(ROW * 2)
+            if len(raw) != ROW * 2:
+                raise RuntimeError(f"{harness} stopped at row {row:#06x}")
+            actual = np.frombuffer(raw, dtype="<u2")
+            expected = model(np.full(ROW, row, dtype=np.uint16), b, mode)
+
+            bad = np.flatnonzero(actual != expected)
+            if bad.size:
+                a_class = CLASSES[int(classify(row))]
+                counts = Counter(CLASSES[c] for c in b_class[bad])
+                for b_name, n in counts.items():
+                    key = f"{a_class}/{b_name}"
+                    state["by_class"][key] = state["by_class"].get(key, 0) + n
+                state["mismatches"] += int(bad.size)
+                for i in bad[:MAX_EXAMPLES - len(state["examples"])]:
+                    state["examples"].append(
+                        [f"{row:#06x}", f"{int(i):#06x}", f"{int(actual[i]):#06x}", f"{int(expected[i]):#06x}"]
+                    )
+
+            state["next_row"] = row + 1
+            state["seconds"] = seconds + time.monotonic() - start
+            save_progress(path, state)
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0 and state["next_row"] < state["end_row"]:
+            raise RuntimeError(f"{harness} exited with {proc.returncode}")
+
+    return state
+
+
+def merge(directory, unit, mode, shards):
+    """Combine the shard progress files into one compact report."""
+    report = {
+        "unit": unit,
+        "mode": mode,
+        "pairs_checked": 0,
+        "pairs_total": ROWS * ROW,
+        "mismatches": 0,
+        "by_class": Counter(),
+        "examples": [],
+        "cpu_seconds": 0.0,
+        "incomplete_shards": [],
+    }
+    for shard in range(shards):
+        path = progress_path(directory, unit, mode, shard, shards)
+        state = load_progress(path, unit, mode, shard, shards)
+        report["pairs_checked"] += (state["next_row"] - state["first_row"]) * ROW
+        report["mismatches"] += state["mismatches"]
+        report["by_class"].update(state["by_class"])
+        report["examples"].extend(state["examples"][:MAX_EXAMPLES - len(report["examples"])])
+        report["cpu_seconds"] += state["seconds"]
+        if state["next_row"] < state["end_row"]:
+            report["incomplete_shards"].append(shard)
+    report["by_class"] = dict(report["by_class"].most_common())
+    return report
+
+
+def parse_shards(spec, shards):
+    if spec is None:
+        return list(range(shards))
+    selected = set()
+    for part in spec.split(","):
+        lo, _, hi = part.partition("-")
+        selected.update(range(int(lo), int(hi or lo) + 1))
+    return sorted(s for s in selected if 0 <= s < shards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--unit", choices=sorted(MODELS), required=True)
+    parser.add_argument("--mode", choices=(RTL, IEEE), default=RTL,
+                        help="golden model mode (default: %(default)s)")
+    parser.add_argument("--harness", help="Verilator harness binary for the unit")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes (default: %(default)s)")
+    parser.add_argument("--shards", type=int, default=256,
+                        help="number of shards the rows are split into (default: %(default)s)")
+    parser.add_argument("--only", help="run a subset of shards, e.g. 0-63,128")
+    parser.add_argument("--progress-dir", default="progress",
+                        help="directory for progress files and reports (default: %(default)s)")
+    parser.add_argument("--report-only", action="store_true",
+                        help="merge the existing progress files without running anything")
+    args = parser.parse_args()
+
+    if not 1 <= args.shards <= ROWS:
+        parser.error(f"--shards must be between 1 and {ROWS}")
+    os.makedirs(args.progress_dir, exist_ok=True)
+
+    if not args.report_only:
+        if not args.harness:
+            parser.error("--harness is required unless --report-only is given")
+        todo = parse_shards(args.only, args.shards)
+        start = time.monotonic()
+        done = 0
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [
+                pool.submit(run_shard, os.path.abspath(args.harness), args.unit, args.mode,
+                            shard, args.shards, args.progress_dir)
+                for shard in todo
+            ]
+            for future in as_completed(futures):
+                state = future.result()
+                done += 1
+                rows = state["end_row"] - state["first_row"]
+                rate = rows * ROW / state["seconds"] if state["seconds"] else 0
+                print(f"[{done}/{len(todo)}] shard {state['shard']}: {state['mismatches']} mismatches, "
+                      f"{rate / 1e6:.1f}M pairs/s, {time.monotonic() - start:.0f}s elapsed", flush=True)
+
+    report = merge(args.progress_dir, args.unit, args.mode, args.shards)
+    path = os.path.join(args.progress_dir, f"{args.unit}_{args.mode}_report.json")
+    save_progress(path, report)
+
+    print(f"{args.unit} ({args.mode}): {report['pairs_checked']} of {report['pairs_total']} pairs checked, "
+          f"{report['mismatches']} mismatches")
+    for key, count in report["by_class"].items():
+        print(f"  {key:>20}: {count}")
+    for a, b, actual, expected in report["examples"]:
+        print(f"  {a} ? {b} = {actual}, expected {expected}")
+    if report["incomplete_shards"]:
+        print(f"  {len(report['incomplete_shards'])} shards incomplete, rerun to resume")
+    print(f"  report written to {path}")
+
+    return 1 if report["mismatches"] or report["incomplete_shards"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+// Verilator harness for the exhaustive sweep of fpu_adder / fpu_mult.
+//
+// Streams every operand pair of a range of rows through the unit, one pair
+// per clock, and writes the raw results to stdout as 65536 little-endian
+// uint16 values per row. Row r holds a = r and b = 0..65535. The results are
+// checked against the golden model by exhaustive.py.
+//
+// usage: Vdut <first_row> <end_row>   (end_row is exclusive)
+
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <memory>
+#include <vector>
+
+#include "Vdut.h"
+#include "verilated.h"
+
+static const uint32_t ROW = 1 << 16;
+
+static void tick(Vdut* top) {
+    top->clk = 0;
+    top->eval();
+    top->clk = 1;
+    top->eval();
+}
+
+int main(int argc, char** argv) {
+    if (argc < 3) {
+        fprintf(stderr, "usage: %s <first_row> <end_row>\n", argv[0]);
+        return 2;
+    }
+    const uint32_t first = strtoul(argv[1], nullptr, 0);
+    const uint32_t end = strtoul(argv[2], nullptr, 0);
+    if (first > end || end > ROW) {
+        fprintf(stderr, "invalid row range %u..%u\n", first, end);
+        return 2;
+    }
+
+    const std::unique_ptr<VerilatedContext> ctx{new VerilatedContext};
+    const std::unique_ptr<Vdut> top{new Vdut{ctx.get()}};
+
+    // === Reset ===
+    top->a = 0;
+    top->b = 0;
+#ifdef HAS_B_EXT
+    top->b_ext = 0;
+#endif
+    // Streaming keeps the pipeline full, so the early exits would rarely
+    // fire; the sweep checks the full datapath
+    top->early_en = 0;
+    top->valid_in = 0;
+    top->rst_n = 0;
+    tick(top.get());
+    tick(top.get());
+    top->rst_n = 1;
+    tick(top.get());
+
+    // === Stream ===
+    // Operands are issued on every clock; results come back in order, so the
+    // n-th valid_out belongs to the n-th issued pair.
+    std::vector<uint16_t> row(ROW);
+    const uint64_t total = uint64_t(end - first) * ROW;
+    uint64_t issued = 0;
+    uint64_t received = 0;
+    uint32_t col = 0;
+    uint32_t idle = 0;
+
+    while (received < total) {
+        if (issued < total) {
+            top->a = first + uint32_t(issued >> 16);
+            top->b = uint32_t(issued & 0xFFFF);
+            top->valid_in = 1;
+            issued++;
+        } else {
+            top->valid_in = 0;
+        }
+
+        tick(top.get());
+
+        if (top->valid_out) {
+            row[col++] = top->result;
+            received++;
+            idle = 0;
+            if (col == ROW) {
+                if (fwrite(row.data(), sizeof(uint16_t), ROW, stdout) != ROW) {
+                    return 1;
+                }
+                fflush(stdout);
+                col = 0;
+            }
+        } else if (issued == total && ++idle > 100) {
+            fprintf(stderr, "pipeline stopped after %llu of %llu results\n",
+                    (unsigned long long)received, (unsigned long long)total);
+            return 1;
+        }
+    }
+
+    top->final();
+    return 0;
+}
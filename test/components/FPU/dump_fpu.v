@@ -1,6 +1,7 @@
 module dump();
 	initial begin
-		$dumpfile ("fpu.vcd");
+		if ($test$plusargs("fst")) $dumpfile ("fpu.fst");
+		else $dumpfile ("fpu.vcd");
 		$dumpvars (0, fpu_tb);
 		#1;
 	end
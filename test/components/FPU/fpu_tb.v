@@ -1,7 +1,12 @@
 `timescale 1ns / 1ps
 `default_nettype none
 
-module fpu_tb;
+module fpu_tb #(
+    parameter SIMD      = 1,
+    parameter DIV_UNIT  = 1,
+    parameter SQRT_UNIT = 1,
+    parameter CVT_UNIT  = 1
+);
 
     reg         clk = 0;
     reg         rst_n;
@@ -15,7 +20,12 @@ module fpu_tb;
     wire        data_ready;
     wire        user_interrupt;
 
-    tqvp_dsatizabal_fpu dut (
+    tqvp_dsatizabal_fpu #(
+        .SIMD(SIMD),
+        .DIV_UNIT(DIV_UNIT),
+        .SQRT_UNIT(SQRT_UNIT),
+        .CVT_UNIT(CVT_UNIT)
+    ) dut (
         .clk(clk),
         .rst_n(rst_n),
         .ui_in(ui_in),
@@ -29,4 +39,20 @@ module fpu_tb;
         .user_interrupt(user_interrupt)
     );
 
+`ifdef WAVE_RING
+    // WAVES=ring: the last clocks of these signals, see test/wave_ring.v
+    wave_ring #(.WIDTH($bits(rst_n)))          ring_rst_n          (.clk(clk), .probe(rst_n));
+    wave_ring #(.WIDTH($bits(address)))        ring_address        (.clk(clk), .probe(address));
+    wave_ring #(.WIDTH($bits(data_in)))        ring_data_in        (.clk(clk), .probe(data_in));
+    wave_ring #(.WIDTH($bits(data_write_n)))   ring_data_write_n   (.clk(clk), .probe(data_write_n));
+    wave_ring #(.WIDTH($bits(data_read_n)))    ring_data_read_n    (.clk(clk), .probe(data_read_n));
+    wave_ring #(.WIDTH($bits(data_out)))       ring_data_out       (.clk(clk), .probe(data_out));
+    wave_ring #(.WIDTH($bits(data_ready)))     ring_data_ready     (.clk(clk), .probe(data_ready));
+    wave_ring #(.WIDTH($bits(user_interrupt))) ring_user_interrupt (.clk(clk), .probe(user_interrupt));
+    wave_ring #(.WIDTH(3))                     ring_bus_state      (.clk(clk), .probe(dut.bus_state));
+    wave_ring #(.WIDTH(3))                     ring_state          (.clk(clk), .probe(dut.state));
+    wave_ring #(.WIDTH(3))                     ring_cmd_count      (.clk(clk), .probe(dut.cmd_count));
+    wave_ring #(.WIDTH(3))                     ring_res_count      (.clk(clk), .probe(dut.res_count));
+`endif
+
 endmodule
@@ -1,10 +1,14 @@
 import cocotb
-from cocotb.triggers import RisingEdge, Timer
+from cocotb.triggers import ClockCycles, RisingEdge, Timer
 from cocotb.clock import Clock
 import numpy as np
-import math
 import struct
 
+from fp16_model import fp16_add, fp16_sub, fp16_mul, fp16_fma, fp16_div, fp16_recip, fp16_sqrt, fp16_rsqrt
+from fp16_model import int16_to_fp16, uint16_to_fp16, fp16_to_int16, fp16_to_bf16, bf16_to_fp16, fp16_to_fp32
+from fp16_model import RNE, RTZ, RUP
+from fp16_model import fp16_min, fp16_max, fp16_eq, fp16_lt, fp16_le, fp16_abs, fp16_neg, fp16_class
+
 def float_to_f16_hex(f):
     """Convert Python float to 32-bit word with f16 in lower 16 bits."""
     f16 = np.float16(f)
@@ -14,34 +18,50 @@ def f16_hex_to_float(h16):
     """Correctly convert 16-bit int to Python float using little-endian byte order."""
     return float(np.frombuffer(struct.pack('<H', h16 & 0xFFFF), dtype=np.float16)[0])
 
-async def write(dut, addr, data):
+async def reset(dut):
+    """Start the clock and hold the FPU in reset for two clocks."""
+    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
+    dut.rst_n.value = 0
+    dut.ui_in.value = 0
+    dut.data_write_n.value = 0b11
+    dut.data_read_n.value = 0b11
+    await Timer(20, units='ns')
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+async def write(dut, addr, data, write_n=0b10):
+    # write_n: 0b00 byte, 0b01 halfword, 0b10 word
     dut.address.value = addr
     dut.data_in.value = data
-    dut.data_write_n.value = 0b10
+    dut.data_write_n.value = write_n
     await RisingEdge(dut.clk)
     dut.data_write_n.value = 0b11
     await RisingEdge(dut.clk)
 
 async def read(dut, addr):
+    # Sample data_out before the read strobe, like the SPI harness does:
+    # reading 0x1C pops the result queue on the strobe
     dut.address.value = addr
+    await RisingEdge(dut.clk)
+    value = int(dut.data_out.value)
     dut.data_read_n.value = 0b10
     await RisingEdge(dut.clk)
     dut.data_read_n.value = 0b11
     await RisingEdge(dut.clk)
-    return int(dut.data_out.value)
+    return value
+
+async def read_result(dut, timeout=100):
+    # 0x20 holds off data_ready until every posted operation has completed
+    dut.address.value = 0x20
+    for _ in range(timeout):
+        await RisingEdge(dut.clk)
+        if dut.data_ready.value == 1:
+            return await read(dut, 0x20)
+    raise TimeoutError("Result not ready after timeout")
 
 @cocotb.test()
 async def test_add_mul_sub_half_precision(dut):
-    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
-
-    # Reset
-    dut.rst_n.value = 0
-    dut.ui_in.value = 0
-    dut.data_write_n.value = 0b11
-    dut.data_read_n.value = 0b11
-    await Timer(20, units='ns')
-    dut.rst_n.value = 1
-    await RisingEdge(dut.clk)
+    await reset(dut)
 
     tests = [
         (3.5, 1.25),
@@ -65,32 +85,599 @@ async def test_add_mul_sub_half_precision(dut):
             await write(dut, ctrl, (a_hex & 0xFFFF))  # Make sure MSB is zero
             await write(dut, ctrl + 1, (b_hex & 0xFFFF))
 
-            for _ in range(20):
-                await RisingEdge(dut.clk)
-                if (dut.data_ready.value == 1):
-                    break
-
-            result = await read(dut, 0x0C)
+            result = await read_result(dut)
             actual = f16_hex_to_float(result)
 
-            a16 = np.float16(a)
-            b16 = np.float16(b)
-
-            expected = {
-                0x00: a16 + b16,
-                0x04: a16 - b16,
-                0x08: a16 * b16
+            model = {
+                0x00: fp16_add,
+                0x04: fp16_sub,
+                0x08: fp16_mul
             }[ctrl]
+            expected = int(model(a_hex, b_hex))
 
-            if math.isnan(expected):
-                assert math.isnan(actual), f"{op_str} FAIL: {a} ? {b} = {actual}, expected NaN"
-            elif math.isinf(expected):
-                assert math.isinf(actual) and (actual == float(expected)), f"{op_str} FAIL: {a} ? {b} = {actual}, expected {expected}"
-            else:
-                assert abs(actual - float(expected)) < 1e-2, f"{op_str} FAIL: {a} ? {b} = {actual}, expected {expected}"
+            assert result & 0xFFFF == expected, \
+                f"{op_str} FAIL: {a} ? {b} = {result & 0xFFFF:#06x} ({actual}), expected {expected:#06x} ({f16_hex_to_float(expected)})"
 
             dut._log.info(f"PASS {op_str}: {a} ? {b} = {actual}")
 
         await perform_op(0x00, "ADD")
         await perform_op(0x04, "SUB")
         await perform_op(0x08, "MUL")
+
+@cocotb.test()
+async def test_fma_half_precision(dut):
+    await reset(dut)
+
+    tests = [
+        (2.0, 3.0, 1.0),
+        (3.5, 1.25, -4.375),
+        (-2.0, 5.0, 0.5),
+        (1.0 + 2.0 ** -10, 1.0 + 2.0 ** -10, -(1.0 + 2.0 ** -9)),
+        (float('inf'), 1.0, 1.0),
+        (float('inf'), 1.0, float('-inf')),
+        (0.0, float('inf'), 1.0),
+        (1.0, 1.0, float('nan'))
+    ]
+
+    for a, b, c in tests:
+        await write(dut, 0x0E, float_to_f16_hex(c))
+        await write(dut, 0x0C, float_to_f16_hex(a))
+        await write(dut, 0x0D, float_to_f16_hex(b))
+
+        result = await read_result(dut)
+        expected = int(fp16_fma(float_to_f16_hex(a), float_to_f16_hex(b), float_to_f16_hex(c)))
+        assert result == expected, f"FMA FAIL: {a} * {b} + {c} = {result:#06x}, expected {expected:#06x}"
+
+        dut._log.info(f"PASS FMA: {a} * {b} + {c} = {f16_hex_to_float(result)}")
+
+    # Each command takes C when it is posted: rewriting C between posts must
+    # not change the FMAs still waiting in the command queue
+    queued = [(1.5, 2.0, 1.0), (1.5, 2.0, 2.0), (-3.0, 0.5, 0.25)]
+    await write(dut, 0x3C, 0b010)
+    for a, b, c in queued:
+        await write(dut, 0x0E, float_to_f16_hex(c))
+        await write(dut, 0x0F, (float_to_f16_hex(b) << 16) | float_to_f16_hex(a))
+    status = await read(dut, 0x18)
+    assert status & 0xFF > 0, f"FMA FAIL: expected queued commands, status {status:#x}"
+
+    await read_result(dut)
+    for a, b, c in queued:
+        actual = await read(dut, 0x1C)
+        expected = int(fp16_fma(float_to_f16_hex(a), float_to_f16_hex(b), float_to_f16_hex(c)))
+        assert actual == expected, f"FMA FAIL: queued {a} * {b} + {c} = {actual:#06x}, expected {expected:#06x}"
+        dut._log.info(f"PASS FMA: queued {a} * {b} + {c} = {f16_hex_to_float(actual)}")
+
+@cocotb.test()
+async def test_div_half_precision(dut):
+    await reset(dut)
+
+    if not await read(dut, 0x38) & (1 << 17):
+        dut._log.info("DIV unit not built")
+        return
+
+    tests = [
+        (3.5, 1.25),
+        (-2.0, 5.0),
+        (0.0, 0.0),
+        (float('inf'), 1.0),
+        (float('inf'), float('-inf')),
+        (float('nan'), 1.0),
+        (1.0, 0.0),
+        (0.0, 1.0),
+        (33.33, 0.001)
+    ]
+
+    for a, b in tests:
+        a_hex = float_to_f16_hex(a)
+        b_hex = float_to_f16_hex(b)
+
+        await write(dut, 0x18, a_hex)
+        await write(dut, 0x19, b_hex)
+        result = await read_result(dut)
+        expected = int(fp16_div(a_hex, b_hex))
+        assert result == expected, \
+            f"DIV FAIL: {a} / {b} = {result:#06x} ({f16_hex_to_float(result)}), expected {expected:#06x}"
+        dut._log.info(f"PASS DIV: {a} / {b} = {f16_hex_to_float(result)}")
+
+        # RECIP issues on its B write alone
+        await write(dut, 0x1D, b_hex)
+        result = await read_result(dut)
+        expected = int(fp16_recip(b_hex))
+        assert result == expected, \
+            f"RECIP FAIL: 1 / {b} = {result:#06x} ({f16_hex_to_float(result)}), expected {expected:#06x}"
+        dut._log.info(f"PASS RECIP: 1 / {b} ~ {f16_hex_to_float(result)}")
+
+@cocotb.test()
+async def test_sqrt_half_precision(dut):
+    await reset(dut)
+
+    config = await read(dut, 0x38)
+    if not config & (1 << 18):
+        dut._log.info("SQRT unit not built")
+        return
+
+    tests = [4.0, 2.0, 0.5, 33.33, 65504.0, 2.0 ** -24, 0.0, -0.0, -2.0,
+             float('inf'), float('-inf'), float('nan')]
+
+    for b in tests:
+        b_hex = float_to_f16_hex(b)
+
+        for ctrl, op_str, model in [(0x21, "SQRT", fp16_sqrt), (0x25, "RSQRT", fp16_rsqrt)]:
+            await write(dut, ctrl, b_hex)
+            result = await read_result(dut)
+            # RSQRT also needs the divider, without it NaN comes back
+            expected = int(model(b_hex)) if op_str == "SQRT" or config & (1 << 17) else 0x7E00
+            assert result == expected, \
+                f"{op_str} FAIL: {b} = {result:#06x} ({f16_hex_to_float(result)}), expected {expected:#06x}"
+            dut._log.info(f"PASS {op_str}: {b} = {f16_hex_to_float(result)}")
+
+@cocotb.test()
+async def test_convert_half_precision(dut):
+    await reset(dut)
+
+    if not await read(dut, 0x38) & (1 << 19):
+        dut._log.info("CVT unit not built")
+        return
+
+    # (conversion, model, inputs): the conversion goes to A (0x28), each input to B (0x29)
+    tests = [
+        (0, int16_to_fp16, [0x0000, 0x0001, 0xFFFF, 0x8000, 0x7FFF, 0x1003]),
+        (1, uint16_to_fp16, [0x0000, 0xFFFF, 0x8001, 0x0801]),
+        (2, fp16_to_int16, [float_to_f16_hex(v) for v in [2.5, -2.5, 0.49, -1e4, 1e5, float('nan')]]),
+        (3, fp16_to_bf16, [float_to_f16_hex(v) for v in [1.0, -3.3, 2.0 ** -24, float('inf')]]),
+        (4, bf16_to_fp16, [0x3F80, 0x4049, 0x4780, 0x3380, 0x7FC0]),
+    ]
+
+    for func, model, values in tests:
+        for rm in (RNE, RTZ, RUP):
+            await write(dut, 0x28, func | (rm << 4))
+            for value in values:
+                await write(dut, 0x29, value)
+                result = await read_result(dut)
+                expected = int(model(value, rm))
+                assert result & 0xFFFF == expected, \
+                    f"CVT FAIL: func {func} rm {rm} of {value:#06x} = {result:#010x}, expected {expected:#06x}"
+                dut._log.info(f"PASS CVT {func} rm {rm}: {value:#06x} -> {result:#010x}")
+
+    await write(dut, 0x28, 5)
+    for value in [float_to_f16_hex(v) for v in [1.0, -65504.0, 2.0 ** -24, float('-inf')]]:
+        await write(dut, 0x29, value)
+        result = await read_result(dut)
+        expected = int(fp16_to_fp32(value))
+        assert result == expected, f"CVT FAIL: fp32 of {value:#06x} = {result:#010x}, expected {expected:#010x}"
+
+@cocotb.test()
+async def test_compare_half_precision(dut):
+    await reset(dut)
+
+    values = [float_to_f16_hex(v) for v in [1.5, -2.0, 0.0, -0.0, 1e-7, float('inf'), float('nan')]]
+
+    # The function goes to 0x2E, then A and B to 0x2C/0x2D like any operation
+    binary = [(0, fp16_min), (1, fp16_max), (2, fp16_eq), (3, fp16_lt), (4, fp16_le)]
+    for func, model in binary:
+        await write(dut, 0x2E, func)
+        for a in values:
+            for b in values:
+                await write(dut, 0x2C, a)
+                await write(dut, 0x2D, b)
+                result = await read_result(dut)
+                expected = int(model(a, b))
+                assert result == expected, \
+                    f"CMP FAIL: func {func} of {a:#06x}, {b:#06x} = {result:#06x}, expected {expected:#06x}"
+        dut._log.info(f"PASS CMP {func}: {len(values) ** 2} pairs")
+
+    # FABS, FNEG and FCLASS issue on their B write
+    for func, model in [(5, fp16_abs), (6, fp16_neg), (7, fp16_class)]:
+        await write(dut, 0x2E, func)
+        for b in values:
+            await write(dut, 0x2D, b)
+            result = await read_result(dut)
+            assert result == int(model(b)), f"CMP FAIL: func {func} of {b:#06x} = {result:#06x}"
+        dut._log.info(f"PASS CMP {func}: {len(values)} values")
+
+    # Each CMP takes its function when it is posted: behind an FMA, commands
+    # with different functions wait in the queue and keep their own
+    one, two = float_to_f16_hex(1.0), float_to_f16_hex(2.0)
+    queued = [(0, fp16_min, 0xC000, one), (2, fp16_eq, one, one), (7, fp16_class, 0, 0xFC00)]
+    await write(dut, 0x3C, 0b010)
+    await write(dut, 0x0E, one)
+    await write(dut, 0x0F, (two << 16) | two)
+    for func, model, a, b in queued:
+        await write(dut, 0x2E, func)
+        await write(dut, 0x2F, (b << 16) | a)
+    status = await read(dut, 0x18)
+    assert status & 0xFF > 0, f"CMP FAIL: expected queued commands, status {status:#x}"
+
+    await read_result(dut)
+    assert await read(dut, 0x1C) == float_to_f16_hex(5.0), "CMP FAIL: FMA ahead of the queued CMPs"
+    for func, model, a, b in queued:
+        result = await read(dut, 0x1C)
+        expected = int(model(a, b)) if func < 5 else int(model(b))
+        assert result == expected, f"CMP FAIL: queued func {func} of {a:#06x}, {b:#06x} = {result:#06x}, expected {expected:#06x}"
+    dut._log.info(f"PASS CMP: {len(queued)} queued functions")
+
+    # FNEG written while the A of an ADD is staged carries its function, not
+    # operand C, and the ADD completes afterwards
+    await write(dut, 0x0E, float_to_f16_hex(0.5))
+    await write(dut, 0x00, one)
+    await write(dut, 0x2E, 6)
+    await write(dut, 0x2D, two)
+    result = await read_result(dut)
+    assert result == int(fp16_neg(two)), f"CMP FAIL: FNEG with an A staged = {result:#06x}"
+    await write(dut, 0x01, two)
+    result = await read_result(dut)
+    assert result == int(fp16_add(one, two)), f"CMP FAIL: staged ADD 1.0 + 2.0 = {result:#06x}"
+
+    # Single cycle: the result is stored on the clock that accepts the packed
+    # write, busy never rises and the result queue holds it at once
+    await write(dut, 0x2E, 1)
+    dut.address.value = 0x2F
+    dut.data_in.value = (float_to_f16_hex(-3.0) << 16) | float_to_f16_hex(2.0)
+    dut.data_write_n.value = 0b10
+    await RisingEdge(dut.clk)
+    dut.data_write_n.value = 0b11
+    dut.address.value = 0x10
+    await Timer(1, units='ns')
+    assert int(dut.data_out.value) == 0, "CMP FAIL: busy set by a single-cycle operation"
+    dut.address.value = 0x0C
+    await Timer(1, units='ns')
+    assert int(dut.data_out.value) == float_to_f16_hex(2.0), \
+        f"CMP FAIL: max(2.0, -3.0) = {int(dut.data_out.value):#06x} one clock after the write"
+
+@cocotb.test()
+async def test_early_out_half_precision(dut):
+    await reset(dut)
+
+    async def clocks_to_result(addr, a, b):
+        # Packed write, then count the clocks until 0x20 is ready
+        dut.address.value = addr
+        dut.data_in.value = (b << 16) | a
+        dut.data_write_n.value = 0b10
+        await RisingEdge(dut.clk)
+        dut.data_write_n.value = 0b11
+        dut.address.value = 0x20
+        for clocks in range(1, 50):
+            await RisingEdge(dut.clk)
+            if dut.data_ready.value == 1:
+                return clocks, await read(dut, 0x20)
+        raise TimeoutError("Result not ready after timeout")
+
+    one, two = float_to_f16_hex(1.0), float_to_f16_hex(2.0)
+    # (packed address, model, full-latency pair, special pairs, clocks saved)
+    tests = [
+        (0x03, fp16_add, (one, two), [(one, 0x0000), (0x7C00, two), (0x7E00, one), (0x6400, 0x0001)], 4),
+        (0x0B, fp16_mul, (one, two), [(one, 0x0000), (0x8000, two), (0x7C00, 0x0000), (0xFC00, two)], 3),
+    ]
+    for addr, model, (a, b), specials, saved in tests:
+        full, result = await clocks_to_result(addr, a, b)
+        assert result == int(model(a, b)), f"EARLY FAIL: {a:#06x}, {b:#06x} = {result:#06x}"
+        for a, b in specials:
+            clocks, result = await clocks_to_result(addr, a, b)
+            expected = int(model(a, b))
+            assert result == expected, f"EARLY FAIL: {a:#06x}, {b:#06x} = {result:#06x}, expected {expected:#06x}"
+            assert clocks == full - saved, \
+                f"EARLY FAIL: {a:#06x}, {b:#06x} took {clocks} clocks, expected {full - saved}"
+        dut._log.info(f"PASS EARLY {addr:#04x}: special operands in {full - saved} clocks instead of {full}")
+
+    # FMA: a zero product skips the multiplier and the adder
+    await write(dut, 0x0E, one)
+    full, result = await clocks_to_result(0x0F, one, two)
+    assert f16_hex_to_float(result) == 3.0, f"EARLY FAIL: 1.0 * 2.0 + 1.0 = {f16_hex_to_float(result)}"
+    clocks, result = await clocks_to_result(0x0F, 0x0000, two)
+    assert result == one, f"EARLY FAIL: 0.0 * 2.0 + 1.0 = {result:#06x}"
+    assert clocks == full - 7, f"EARLY FAIL: FMA with a zero product took {clocks} clocks, expected {full - 7}"
+
+@cocotb.test()
+async def test_perf_counters_half_precision(dut):
+    await reset(dut)
+
+    names = ["cycles", "busy", "reading", "ops", "add", "sub", "mul", "fma",
+             "acc", "mac", "div", "recip", "sqrt", "rsqrt", "cvt", "cmp"]
+
+    async def read_counters():
+        # 0x3A selects a counter, 0x3C reads it
+        counters = {}
+        for index, name in enumerate(names):
+            await write(dut, 0x3A, index)
+            counters[name] = await read(dut, 0x3C)
+        return counters
+
+    await write(dut, 0x3C, 0x8)
+    one, two = float_to_f16_hex(1.0), float_to_f16_hex(2.0)
+    for _ in range(3):
+        await write(dut, 0x00, one)
+        await write(dut, 0x01, two)
+        await read_result(dut)
+    await write(dut, 0x1B, (two << 16) | one)
+    await write(dut, 0x21, two)
+    await write(dut, 0x2E, 5)
+    await write(dut, 0x2D, two)
+    await read_result(dut)
+
+    counters = await read_counters()
+    dut._log.info(f"PERF: {counters}")
+    expected = {"ops": 6, "add": 3, "div": 1, "sqrt": 1, "cmp": 1, "sub": 0, "mul": 0}
+    for name, value in expected.items():
+        assert counters[name] == value, f"PERF FAIL: {name} = {counters[name]}, expected {value}"
+    # A waits 2 clocks for its B with back-to-back writes
+    assert counters["reading"] == 3 * 2, f"PERF FAIL: reading = {counters['reading']}, expected 6"
+    assert 0 < counters["busy"] < counters["cycles"], f"PERF FAIL: {counters}"
+
+    # Reading 0x3C leaves the selection alone
+    await write(dut, 0x3A, 3)
+    assert await read(dut, 0x3C) == 6 and await read(dut, 0x3C) == 6, "PERF FAIL: ops changed between reads"
+    assert await read(dut, 0x3A) == 3, "PERF FAIL: reading 0x3C moved the selection"
+    await write(dut, 0x3A, 15)
+    assert await read(dut, 0x3C) == 1, "PERF FAIL: cmp counter not selected by 0x3A"
+
+    # The cycle counter keeps running past 16 bits, clearing restarts everything
+    await write(dut, 0x3A, 0)
+    first = await read(dut, 0x3C)
+    assert await read(dut, 0x3C) > first, "PERF FAIL: cycle counter not running"
+    await ClockCycles(dut.clk, 1 << 16)
+    assert await read(dut, 0x3C) > 0xFFFF, "PERF FAIL: cycle counter stopped at 16 bits"
+    await write(dut, 0x3C, 0x8)
+    counters = await read_counters()
+    assert counters["ops"] == 0 and counters["add"] == 0 and counters["reading"] == 0, f"PERF FAIL: {counters}"
+    assert counters["cycles"] < 10, f"PERF FAIL: cycles = {counters['cycles']} right after clearing"
+
+@cocotb.test()
+async def test_accumulate_half_precision(dut):
+    await reset(dut)
+
+    async def wait_ready():
+        for _ in range(30):
+            await RisingEdge(dut.clk)
+            if (dut.data_ready.value == 1):
+                break
+
+    # ACC += B
+    values = [3.5, -1.25, 0.0, 33.33, -2.0]
+    await write(dut, 0x30, 0)
+    expected = 0
+    for v in values:
+        await write(dut, 0x11, float_to_f16_hex(v))
+        await wait_ready()
+        expected = int(fp16_add(expected, float_to_f16_hex(v)))
+
+    actual = await read(dut, 0x30)
+    assert actual == expected, f"ACC FAIL: sum({values}) = {actual:#06x}, expected {expected:#06x}"
+    dut._log.info(f"PASS ACC: sum({values}) = {f16_hex_to_float(actual)}")
+
+    # ACC += A * B
+    pairs = [(2.0, 3.0), (-1.5, 0.5), (0.25, 8.0)]
+    await write(dut, 0x30, float_to_f16_hex(-1.0))
+    expected = float_to_f16_hex(-1.0)
+    for a, b in pairs:
+        await write(dut, 0x14, float_to_f16_hex(a))
+        await write(dut, 0x15, float_to_f16_hex(b))
+        await wait_ready()
+        expected = int(fp16_fma(float_to_f16_hex(a), float_to_f16_hex(b), expected))
+
+    actual = await read(dut, 0x30)
+    assert actual == expected, f"MAC FAIL: -1.0 + dot({pairs}) = {actual:#06x}, expected {expected:#06x}"
+    dut._log.info(f"PASS MAC: -1.0 + dot({pairs}) = {f16_hex_to_float(actual)}")
+
+    # Overwriting ACC from the bus
+    await write(dut, 0x30, float_to_f16_hex(42.0))
+    actual = f16_hex_to_float(await read(dut, 0x30))
+    assert actual == 42.0, f"ACC FAIL: wrote 42.0, read back {actual}"
+
+@cocotb.test()
+async def test_queue_half_precision(dut):
+    await reset(dut)
+
+    # Writes come every other clock, faster than the operations complete, so
+    # these commands pile up in the command queue
+    ops = [
+        (0x08, 3.5, 1.25),
+        (0x00, -2.0, 5.0),
+        (0x04, 33.33, 1.0),
+        (0x08, 0.5, -0.5),
+    ]
+
+    for ctrl, a, b in ops:
+        await write(dut, ctrl, float_to_f16_hex(a))
+        await write(dut, ctrl + 1, float_to_f16_hex(b))
+
+    status = await read(dut, 0x18)
+    assert status & 0xFF > 0, "QUEUE FAIL: expected commands waiting in the queue"
+
+    for _ in range(100):
+        await RisingEdge(dut.clk)
+        if (await read(dut, 0x10)) == 0:
+            break
+
+    status = await read(dut, 0x18)
+    assert status == len(ops) << 8, f"QUEUE FAIL: status {status:#x}, expected {len(ops) << 8:#x}"
+
+    for ctrl, a, b in ops:
+        actual = await read(dut, 0x1C)
+        model = {0x00: fp16_add, 0x04: fp16_sub, 0x08: fp16_mul}[ctrl]
+        expected = int(model(float_to_f16_hex(a), float_to_f16_hex(b)))
+        assert actual == expected, f"QUEUE FAIL: {a} ? {b} = {actual:#06x}, expected {expected:#06x}"
+        dut._log.info(f"PASS QUEUE: {a} ? {b} = {f16_hex_to_float(actual)}")
+
+    # Overflowing the command queue sets a sticky flag, cleared through 0x3C
+    for _ in range(8):
+        await write(dut, 0x11, float_to_f16_hex(1.0))
+    status = await read(dut, 0x18)
+    assert status & (1 << 16), f"QUEUE FAIL: command overflow not flagged, status {status:#x}"
+
+    await write(dut, 0x3C, 0b111)
+    status = await read(dut, 0x18)
+    assert status == 0, f"QUEUE FAIL: status {status:#x} after flush"
+
+    # A unary operation written while the A of an ADD waits for its B runs on
+    # its own operand, and the ADD still completes with its own A and B
+    one, four = float_to_f16_hex(1.0), float_to_f16_hex(4.0)
+    await write(dut, 0x30, float_to_f16_hex(0.5))
+    await write(dut, 0x00, one)
+    unary = [(0x11, lambda b: fp16_add(float_to_f16_hex(0.5), b), "ACC")]
+    if await read(dut, 0x38) & (1 << 18):
+        unary.append((0x21, fp16_sqrt, "SQRT"))
+    for ctrl, model, name in unary:
+        await write(dut, ctrl, four)
+        result = await read_result(dut)
+        assert result == int(model(four)), f"QUEUE FAIL: {name} with an A staged = {result:#06x}"
+    await write(dut, 0x01, four)
+    result = await read_result(dut)
+    assert result == int(fp16_add(one, four)), f"QUEUE FAIL: staged ADD 1.0 + 4.0 = {result:#06x}"
+
+@cocotb.test()
+async def test_interrupt_half_precision(dut):
+    await reset(dut)
+
+    assert dut.user_interrupt.value == 0, "IRQ FAIL: interrupt asserted after reset"
+
+    # Enable the completion interrupt and count the clocks until it fires
+    await write(dut, 0x34, 0x1)
+    await write(dut, 0x08, float_to_f16_hex(3.5))
+    await write(dut, 0x09, float_to_f16_hex(1.25))
+
+    for cycles in range(100):
+        if dut.user_interrupt.value == 1:
+            break
+        await RisingEdge(dut.clk)
+    assert dut.user_interrupt.value == 1, "IRQ FAIL: completion interrupt not asserted"
+    dut._log.info(f"IRQ asserted {cycles} cycles after the B write")
+
+    pending = await read(dut, 0x35)
+    assert pending & 0x1, f"IRQ FAIL: pending {pending:#x} does not flag DONE"
+    actual = await read(dut, 0x0C)
+    expected = int(fp16_mul(float_to_f16_hex(3.5), float_to_f16_hex(1.25)))
+    assert actual == expected, f"IRQ FAIL: 3.5 * 1.25 = {actual:#06x}, expected {expected:#06x}"
+
+    # DONE is sticky until written with 1
+    await write(dut, 0x35, 0x1)
+    assert dut.user_interrupt.value == 0, "IRQ FAIL: interrupt still asserted after clearing"
+
+    # Result queue threshold of two
+    await write(dut, 0x3C, 0b010)
+    await write(dut, 0x34, (2 << 8) | 0x2)
+    for _ in range(2):
+        assert dut.user_interrupt.value == 0, "IRQ FAIL: threshold interrupt asserted early"
+        await write(dut, 0x00, float_to_f16_hex(1.0))
+        await write(dut, 0x01, float_to_f16_hex(1.0))
+
+    for _ in range(100):
+        if dut.user_interrupt.value == 1:
+            break
+        await RisingEdge(dut.clk)
+    assert dut.user_interrupt.value == 1, "IRQ FAIL: threshold interrupt not asserted"
+
+    await read(dut, 0x1C)
+    assert dut.user_interrupt.value == 0, "IRQ FAIL: interrupt asserted below the threshold"
+
+    config = await read(dut, 0x34)
+    assert config == (2 << 8) | 0x2, f"IRQ FAIL: config read back {config:#x}"
+
+@cocotb.test()
+async def test_packed_half_precision(dut):
+    await reset(dut)
+
+    tests = [
+        (0x03, 3.5, 1.25, fp16_add),
+        (0x07, -2.0, 5.0, fp16_sub),
+        (0x0B, 33.33, 1.0, fp16_mul),
+        (0x0B, float('inf'), 0.0, fp16_mul),
+    ]
+
+    # A and B in one write, back to back: the command queue takes the rest
+    for ctrl, a, b, _ in tests:
+        await write(dut, ctrl, (float_to_f16_hex(b) << 16) | float_to_f16_hex(a))
+
+    for _ in range(100):
+        await RisingEdge(dut.clk)
+        if (await read(dut, 0x10)) == 0:
+            break
+
+    for ctrl, a, b, model in tests:
+        result = await read(dut, 0x1C)
+        expected = int(model(float_to_f16_hex(a), float_to_f16_hex(b)))
+        assert result == expected, f"PACKED FAIL: {ctrl:#04x} {a} ? {b} = {result:#06x}, expected {expected:#06x}"
+        dut._log.info(f"PASS PACKED: {ctrl:#04x} {a} ? {b} = {f16_hex_to_float(result)}")
+
+    # A packed write replaces an A still waiting for its B
+    await write(dut, 0x00, float_to_f16_hex(100.0))
+    await write(dut, 0x0B, (float_to_f16_hex(3.0) << 16) | float_to_f16_hex(2.0))
+    await write(dut, 0x01, float_to_f16_hex(1.0))
+    for _ in range(100):
+        await RisingEdge(dut.clk)
+        if (await read(dut, 0x10)) == 0:
+            break
+    status = await read(dut, 0x18)
+    assert status == 1 << 8, f"PACKED FAIL: status {status:#x}, the stray B write must not issue a command"
+    actual = f16_hex_to_float(await read(dut, 0x1C))
+    assert actual == 6.0, f"PACKED FAIL: 2.0 * 3.0 = {actual}"
+
+    # Byte and halfword writes to a packed address only write A, whatever
+    # is left on data_in[31:16]
+    for write_n in (0b01, 0b00):
+        await write(dut, 0x0B, (float_to_f16_hex(-7.0) << 16) | float_to_f16_hex(1.5), write_n)
+        status = await read(dut, 0x18)
+        busy = await read(dut, 0x10)
+        assert status == 0 and busy == 1, \
+            f"PACKED FAIL: narrow write {write_n:#04b} issued a command, status {status:#x}"
+        await write(dut, 0x09, float_to_f16_hex(2.0))
+        result = await read_result(dut)
+        expected = int(fp16_mul(float_to_f16_hex(1.5), float_to_f16_hex(2.0)))
+        assert result == expected, f"PACKED FAIL: narrow write {write_n:#04b} then B = {result:#06x}, expected {expected:#06x}"
+        await read(dut, 0x1C)
+
+@cocotb.test()
+async def test_simd_half_precision(dut):
+    await reset(dut)
+
+    await write(dut, 0x38, 0x1)
+    config = await read(dut, 0x38)
+    if not config & (1 << 16):
+        dut._log.info("SIMD lanes not built")
+        return
+
+    rng = np.random.default_rng(14)
+    a = rng.integers(0, 1 << 16, size=(16, 2), dtype=np.uint16)
+    b = rng.integers(0, 1 << 16, size=(16, 2), dtype=np.uint16)
+    ops = [(0x00, fp16_add), (0x04, fp16_sub), (0x08, fp16_mul)]
+
+    # Random lane pairs, queued back to back and drained from 0x1C
+    for i in range(0, 16, 4):
+        for j in range(i, i + 4):
+            ctrl = ops[j % 3][0]
+            await write(dut, ctrl, (int(a[j, 1]) << 16) | int(a[j, 0]))
+            await write(dut, ctrl + 1, (int(b[j, 1]) << 16) | int(b[j, 0]))
+
+        for _ in range(100):
+            await RisingEdge(dut.clk)
+            if (await read(dut, 0x10)) == 0:
+                break
+
+        for j in range(i, i + 4):
+            result = await read(dut, 0x1C)
+            model = ops[j % 3][1]
+            for lane in range(2):
+                expected = int(model(int(a[j, lane]), int(b[j, lane])))
+                actual = (result >> (16 * lane)) & 0xFFFF
+                assert actual == expected, \
+                    f"SIMD FAIL: lane {lane} {int(a[j, lane]):#06x} ? {int(b[j, lane]):#06x} = {actual:#06x}, expected {expected:#06x}"
+
+    dut._log.info("PASS SIMD: 16 random two-lane operations")
+
+@cocotb.test()
+async def test_blocking_read_half_precision(dut):
+    await reset(dut)
+
+    # data_ready at 0x20 stays low until the operation completes
+    await write(dut, 0x0B, (float_to_f16_hex(1.25) << 16) | float_to_f16_hex(3.5))
+    dut.address.value = 0x20
+    await RisingEdge(dut.clk)
+    assert dut.data_ready.value == 0, "BLOCKING FAIL: data_ready high while the FPU is busy"
+    result = await read_result(dut)
+    assert f16_hex_to_float(result) == 3.5 * 1.25, f"BLOCKING FAIL: 3.5 * 1.25 = {f16_hex_to_float(result)}"
+
+    # A staged A keeps busy set but does not stall 0x20
+    await write(dut, 0x00, float_to_f16_hex(2.0))
+    dut.address.value = 0x20
+    await RisingEdge(dut.clk)
+    assert dut.data_ready.value == 1, "BLOCKING FAIL: data_ready low with only operand A written"
+    assert await read(dut, 0x10) == 1, "BLOCKING FAIL: busy not set with operand A written"
@@ -1,6 +1,7 @@
 module dump();
 	initial begin
-		$dumpfile ("fpu_multiplier.vcd");
+		if ($test$plusargs("fst")) $dumpfile ("fpu_multiplier.fst");
+		else $dumpfile ("fpu_multiplier.vcd");
 		$dumpvars (0, fpu_mult_tb);
 		#1;
 	end
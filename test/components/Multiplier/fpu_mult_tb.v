@@ -1,25 +1,52 @@
 `timescale 1ns / 1ps
 `default_nettype none
 
-module fpu_mult_tb;
+module fpu_mult_tb #(
+    parameter DECODE_STAGE    = 1,
+    parameter SPLIT_MULTIPLY  = 0,
+    parameter NORMALIZE_STAGE = 1
+);
 
     reg         clk;
     reg         rst_n;
     reg         valid_in;
     reg  [15:0] a;
     reg  [15:0] b;
+    reg         early_en;
     wire        valid_out;
     wire [15:0] result;
+    wire [10:0] result_ext;
+
+    // Expected pipeline latency for the selected stage configuration
+    wire [3:0]  latency = 2 + DECODE_STAGE + SPLIT_MULTIPLY + NORMALIZE_STAGE;
 
     // Instantiate the pipelined multiplier
-    fpu_mult uut (
+    fpu_mult #(
+        .DECODE_STAGE(DECODE_STAGE),
+        .SPLIT_MULTIPLY(SPLIT_MULTIPLY),
+        .NORMALIZE_STAGE(NORMALIZE_STAGE)
+    ) uut (
         .clk(clk),
         .rst_n(rst_n),
         .valid_in(valid_in),
         .a(a),
         .b(b),
+        .early_en(early_en),
         .valid_out(valid_out),
-        .result(result)
+        .result(result),
+        .result_ext(result_ext)
     );
 
+`ifdef WAVE_RING
+    // WAVES=ring: the last clocks of these signals, see test/wave_ring.v
+    wave_ring #(.WIDTH($bits(rst_n)))      ring_rst_n      (.clk(clk), .probe(rst_n));
+    wave_ring #(.WIDTH($bits(valid_in)))   ring_valid_in   (.clk(clk), .probe(valid_in));
+    wave_ring #(.WIDTH($bits(a)))          ring_a          (.clk(clk), .probe(a));
+    wave_ring #(.WIDTH($bits(b)))          ring_b          (.clk(clk), .probe(b));
+    wave_ring #(.WIDTH($bits(early_en)))   ring_early_en   (.clk(clk), .probe(early_en));
+    wave_ring #(.WIDTH($bits(valid_out)))  ring_valid_out  (.clk(clk), .probe(valid_out));
+    wave_ring #(.WIDTH($bits(result)))     ring_result     (.clk(clk), .probe(result));
+    wave_ring #(.WIDTH($bits(result_ext))) ring_result_ext (.clk(clk), .probe(result_ext));
+`endif
+
 endmodule
@@ -0,0 +1,8 @@
+module dump();
+	initial begin
+		if ($test$plusargs("fst")) $dumpfile ("fpu_sqrt.fst");
+		else $dumpfile ("fpu_sqrt.vcd");
+		$dumpvars (0, fpu_sqrt_tb);
+		#1;
+	end
+endmodule
\ No newline at end of file
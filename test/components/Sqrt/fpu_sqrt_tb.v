@@ -0,0 +1,70 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+module fpu_sqrt_tb;
+
+    reg         clk;
+    reg         rst_n;
+    reg         valid_in;
+    reg         rsqrt;
+    reg  [15:0] a;
+    wire        valid_out;
+    wire [15:0] result;
+
+    // Expected latency of SQRT and of RSQRT (the root divided into 1.0)
+    wire [4:0]  sqrt_latency  = 8;
+    wire [4:0]  rsqrt_latency = 17;
+
+    wire        sqrt_valid_out;
+    wire [15:0] sqrt_result;
+    wire        sqrt_busy;
+    wire        div_valid_out;
+    wire [15:0] div_result;
+    wire        div_busy;
+
+    reg         rsqrt_op;
+
+    always @(posedge clk) begin
+        if (valid_in) rsqrt_op <= rsqrt;
+    end
+
+    // Instantiate the iterative square root
+    fpu_sqrt uut (
+        .clk(clk),
+        .rst_n(rst_n),
+        .valid_in(valid_in),
+        .a(a),
+        .valid_out(sqrt_valid_out),
+        .result(sqrt_result),
+        .busy(sqrt_busy)
+    );
+
+    // RSQRT divides 1.0 by the root, chained as in tqvp_dsatizabal_fpu
+    fpu_div div_inst (
+        .clk(clk),
+        .rst_n(rst_n),
+        .valid_in(rsqrt_op && sqrt_valid_out),
+        .estimate(1'b0),
+        .a(16'h3C00),
+        .b(sqrt_result),
+        .valid_out(div_valid_out),
+        .result(div_result),
+        .busy(div_busy)
+    );
+
+    assign valid_out = rsqrt_op ? div_valid_out : sqrt_valid_out;
+    assign result    = rsqrt_op ? div_result : sqrt_result;
+
+`ifdef WAVE_RING
+    // WAVES=ring: the last clocks of these signals, see test/wave_ring.v
+    wave_ring #(.WIDTH($bits(rst_n)))     ring_rst_n     (.clk(clk), .probe(rst_n));
+    wave_ring #(.WIDTH($bits(valid_in)))  ring_valid_in  (.clk(clk), .probe(valid_in));
+    wave_ring #(.WIDTH($bits(rsqrt)))     ring_rsqrt     (.clk(clk), .probe(rsqrt));
+    wave_ring #(.WIDTH($bits(a)))         ring_a         (.clk(clk), .probe(a));
+    wave_ring #(.WIDTH($bits(valid_out))) ring_valid_out (.clk(clk), .probe(valid_out));
+    wave_ring #(.WIDTH($bits(result)))    ring_result    (.clk(clk), .probe(result));
+    wave_ring #(.WIDTH($bits(sqrt_busy))) ring_sqrt_busy (.clk(clk), .probe(sqrt_busy));
+    wave_ring #(.WIDTH($bits(div_busy)))  ring_div_busy  (.clk(clk), .probe(div_busy));
+`endif
+
+endmodule
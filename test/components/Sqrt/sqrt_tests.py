@@ -0,0 +1,152 @@
+import cocotb
+from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly, Timer
+from cocotb.clock import Clock
+import numpy as np
+import math
+
+from fp16_model import fp16_sqrt, fp16_rsqrt, assert_bits_equal, IEEE
+
+CLOCK_NS = 10
+
+def float_to_half_bits(f):
+    """Converts Python float to IEEE-754 half-precision bits (stored in lower 16 bits of 32-bit word)."""
+    return int(np.float16(f).view(np.uint16)) & 0xFFFF
+
+def half_bits_to_float(bits):
+    """Converts lower 16 bits of 32-bit word to Python float (half-precision)."""
+    return float(np.uint16(bits).view(np.float16))
+
+async def reset_dut(dut):
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    dut.rsqrt.value = 0
+    await RisingEdge(dut.clk)
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+async def issue_bits(dut, a_bits, rsqrt=0):
+    """Start one operation and return (latency, result bits)."""
+    await FallingEdge(dut.clk)
+    dut.a.value = a_bits
+    dut.rsqrt.value = rsqrt
+    dut.valid_in.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.valid_in.value = 0
+
+    for cycle in range(1, 40):
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value:
+            return cycle, int(dut.result.value) & 0xFFFF
+    raise TimeoutError("Square root did not return a result in time")
+
+async def sweep(dut, rsqrt):
+    """Run every fp16 bit pattern through the unit and return the results."""
+    latency = int(dut.rsqrt_latency.value if rsqrt else dut.sqrt_latency.value)
+    dut.rsqrt.value = rsqrt
+    results = np.zeros(1 << 16, dtype=np.uint16)
+
+    # The latency is fixed, so every operation takes the same number of clocks
+    # and the result is still held when the next one is issued
+    await FallingEdge(dut.clk)
+    for bits in range(1 << 16):
+        dut.a.value = bits
+        dut.valid_in.value = 1
+        await Timer(CLOCK_NS, units="ns")
+        dut.valid_in.value = 0
+        await Timer(latency * CLOCK_NS, units="ns")
+        results[bits] = int(dut.result.value) & 0xFFFF
+    return results
+
+@cocotb.test()
+async def test_fpu_sqrt_normal(dut):
+    cocotb.start_soon(Clock(dut.clk, CLOCK_NS, units="ns").start())
+    await reset_dut(dut)
+
+    tests = [
+        (4.0, 2.0),
+        (2.0, 1.4142),
+        (0.25, 0.5),
+        (100.0, 10.0),
+        (3.0, 1.7321),
+        (65504.0, 255.94),
+        (2.0 ** -20, 2.0 ** -10)
+    ]
+    for a, expected in tests:
+        _, raw = await issue_bits(dut, float_to_half_bits(a))
+        actual = half_bits_to_float(raw)
+        model = int(fp16_sqrt(float_to_half_bits(a)))
+        assert abs(actual - expected) <= expected * 2 ** -9, f"FAIL: sqrt({a}) = {actual}, expected {expected}"
+        assert raw == model, f"FAIL: sqrt({a}) = {raw:#06x}, model expected {model:#06x}"
+        dut._log.info(f"PASS: sqrt({a}) = {actual}")
+
+@cocotb.test()
+async def test_fpu_sqrt_edge_cases(dut):
+    cocotb.start_soon(Clock(dut.clk, CLOCK_NS, units="ns").start())
+    await reset_dut(dut)
+
+    nan = float('nan')
+    inf = float('inf')
+    tests = [
+        (0.0, 0, 0.0),
+        (-0.0, 0, -0.0),
+        (inf, 0, inf),
+        (-inf, 0, nan),
+        (-1.0, 0, nan),
+        (nan, 0, nan),
+        (0.0, 1, inf),
+        (-0.0, 1, -inf),
+        (inf, 1, 0.0),
+        (-4.0, 1, nan),
+        (4.0, 1, 0.5),
+    ]
+    for a, rsqrt, expected in tests:
+        _, raw = await issue_bits(dut, float_to_half_bits(a), rsqrt)
+        actual = half_bits_to_float(raw)
+        name = "rsqrt" if rsqrt else "sqrt"
+        if math.isnan(expected):
+            assert math.isnan(actual), f"FAIL: {name}({a}) = {actual}, expected NaN"
+        else:
+            assert actual == expected and math.copysign(1, actual) == math.copysign(1, expected), \
+                f"FAIL: {name}({a}) = {actual}, expected {expected}"
+        dut._log.info(f"PASS: {name}({a}) = {actual}")
+
+@cocotb.test()
+async def test_fpu_sqrt_latency(dut):
+    cocotb.start_soon(Clock(dut.clk, CLOCK_NS, units="ns").start())
+    await reset_dut(dut)
+
+    sqrt_latency, _ = await issue_bits(dut, float_to_half_bits(2.0))
+    rsqrt_latency, _ = await issue_bits(dut, float_to_half_bits(2.0), rsqrt=1)
+    dut._log.info(f"LATENCY: sqrt {sqrt_latency} cycles, rsqrt {rsqrt_latency} cycles")
+
+    assert sqrt_latency == int(dut.sqrt_latency.value), \
+        f"FAIL: sqrt latency is {sqrt_latency} cycles, expected {int(dut.sqrt_latency.value)}"
+    assert rsqrt_latency == int(dut.rsqrt_latency.value), \
+        f"FAIL: rsqrt latency is {rsqrt_latency} cycles, expected {int(dut.rsqrt_latency.value)}"
+
+@cocotb.test()
+async def test_fpu_sqrt_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, CLOCK_NS, units="ns").start())
+    await reset_dut(dut)
+
+    a_bits = np.arange(1 << 16, dtype=np.uint16)
+    actual = await sweep(dut, rsqrt=0)
+    assert_bits_equal(actual, fp16_sqrt(a_bits), a_bits, op="sqrt")
+
+    inexact = np.count_nonzero(actual != fp16_sqrt(a_bits, IEEE))
+    dut._log.info(f"PASS: all {len(a_bits)} square roots bit-exact, {inexact} differ from round-to-nearest-even")
+
+@cocotb.test()
+async def test_fpu_rsqrt_exhaustive(dut):
+    cocotb.start_soon(Clock(dut.clk, CLOCK_NS, units="ns").start())
+    await reset_dut(dut)
+
+    a_bits = np.arange(1 << 16, dtype=np.uint16)
+    actual = await sweep(dut, rsqrt=1)
+    assert_bits_equal(actual, fp16_rsqrt(a_bits), a_bits, op="rsqrt")
+
+    inexact = np.count_nonzero(actual != fp16_rsqrt(a_bits, IEEE))
+    dut._log.info(f"PASS: all {len(a_bits)} reciprocal square roots bit-exact, {inexact} differ from round-to-nearest-even")
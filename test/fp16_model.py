@@ -0,0 +1,519 @@
+"""Vectorized golden model for the FPU's half-precision operations.
+
+Every function takes operands as arrays (or scalars) of raw fp16 bit patterns
+and returns a uint16 array of result bit patterns, so whole batches can be
+checked at once with exact bit comparisons.
+
+Two modes are supported:
+
+- ``RTL``: mirrors fpu_adder, fpu_mult, fpu_div and fpu_sqrt as they are
+  implemented, including truncation and the NaN patterns they produce.
+- ``IEEE``: strict IEEE-754 round-to-nearest-even, with every NaN result
+  returned as the quiet NaN 0x7E00.
+
+The format conversions (``int16_to_fp16`` and friends) round correctly in
+the requested rounding mode ``rm`` (``RNE``, ``RTZ``, ``RDN``, ``RUP`` or
+``RMM``, numbered as in RISC-V), so they have no separate modes, and
+neither have the exact min/max, comparison, sign and class functions.
+"""
+
+import numpy as np
+
+RTL = "rtl"
+IEEE = "ieee"
+
+QNAN = 0x7E00
+ADD_NAN = 0x7C01  # NaN pattern packed by fpu_adder
+
+_MODES = (RTL, IEEE)
+
+# Rounding modes of the conversions, encoded as the RISC-V rm field. The
+# unused encodings 5-7 round like RMM
+RNE, RTZ, RDN, RUP, RMM = range(5)
+
+BF16_QNAN = 0x7FC0
+FP32_QNAN = 0x7FC00000
+
+
+def float_to_bits(values):
+    """Convert floats to fp16 bit patterns (round-to-nearest-even)."""
+    return np.asarray(values, dtype=np.float16).view(np.uint16)
+
+
+def bits_to_float(bits):
+    """Convert fp16 bit patterns to float64 values."""
+    return np.asarray(bits, dtype=np.uint16).view(np.float16).astype(np.float64)
+
+
+def _fields(bits):
+    bits = np.asarray(bits, dtype=np.uint16).astype(np.int64)
+    return bits >> 15, (bits >> 10) & 0x1F, bits & 0x3FF
+
+
+def _check_mode(mode):
+    if mode not in _MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {_MODES}")
+
+
+def _ieee(op, a, b):
+    # Sums and products of two fp16 values are exact in float64, so the only
+    # rounding is the final conversion back to fp16. Quotients are rounded
+    # twice, but a float64 quotient or square root of fp16 values never lands
+    # close enough to an fp16 rounding midpoint for that to matter
+    fa = bits_to_float(a)
+    fb = bits_to_float(b)
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        exact = op(fa, fb)
+        res = exact.astype(np.float16).view(np.uint16)
+    return np.where(np.isnan(exact), np.uint16(QNAN), res).astype(np.uint16)
+
+
+def _bit_length(x):
+    # Exact for the non-negative integers below 2**53 used here
+    return np.frexp(x.astype(np.float64))[1].astype(np.int64)
+
+
+def _rtl_add(a, b, b_ext=0):
+    # b_ext: product bits below b's mantissa, for the FMA chain
+    guard = 11
+    mask = (1 << (11 + guard)) - 1
+
+    sign_a, e_a, m_a = _fields(a)
+    sign_b, e_b, m_b = _fields(b)
+
+    # DECODE: subnormals share the exponent of the smallest normal
+    exp_a = np.where(e_a != 0, e_a, 1)
+    exp_b = np.where(e_b != 0, e_b, 1)
+    frac_a = (np.where(e_a != 0, 1 << 10, 0) | m_a) << guard
+    frac_b = ((np.where(e_b != 0, 1 << 10, 0) | m_b) << guard) | np.asarray(b_ext, dtype=np.int64)
+    nan_a = (e_a == 0x1F) & (m_a != 0)
+    nan_b = (e_b == 0x1F) & (m_b != 0)
+    inf_a = (e_a == 0x1F) & (m_a == 0)
+    inf_b = (e_b == 0x1F) & (m_b == 0)
+
+    # ALIGN: the smaller operand is shifted right, dropping bits below the guard
+    a_larger = exp_a > exp_b
+    exp_max = np.where(a_larger, exp_a, exp_b)
+    aligned_a = np.where(a_larger, frac_a, frac_a >> (exp_b - exp_a).clip(0))
+    aligned_b = np.where(a_larger, frac_b >> (exp_a - exp_b).clip(0), frac_b)
+
+    # CALCULATE
+    same = sign_a == sign_b
+    total = np.where(same, aligned_a + aligned_b, np.abs(aligned_a - aligned_b))
+    sign = np.where(same | (aligned_a > aligned_b), sign_a,
+                    np.where(aligned_b > aligned_a, sign_b, 0))
+
+    # NORMALIZE
+    lz = 11 + guard - _bit_length(total)
+    carry = (total >> (11 + guard)) != 0
+    zero = total == 0
+    normal = lz < exp_max
+    frac = np.where(carry, total >> 1,
+                    np.where(normal, (total << lz.clip(0)) & mask,
+                             (total << (exp_max - 1)) & mask))
+    exp = np.where(carry, (exp_max + 1) & 0x1F, np.where(normal, exp_max - lz, 0))
+    frac = np.where(zero, 0, frac)
+    exp = np.where(zero, 0, exp)
+    sign = np.where(zero, 0, sign)
+
+    # PACK
+    res = (sign << 15) | (exp << 10) | ((frac >> guard) & 0x3FF)
+    res = np.where(inf_b, (sign_b << 15) | 0x7C00, res)
+    res = np.where(inf_a, (sign_a << 15) | 0x7C00, res)
+    res = np.where(nan_a | nan_b | (inf_a & inf_b & ~same), ADD_NAN, res)
+    return res.astype(np.uint16)
+
+
+def _rtl_mul(a, b):
+    return _rtl_mul_ext(a, b)[0]
+
+
+def _rtl_mul_ext(a, b):
+    # Also returns result_ext, the product bits below the mantissa
+    sign_a, e_a, m_a = _fields(a)
+    sign_b, e_b, m_b = _fields(b)
+
+    frac_a = np.where(e_a != 0, 1 << 10, 0) | m_a
+    frac_b = np.where(e_b != 0, 1 << 10, 0) | m_b
+    nan_a = (e_a == 0x1F) & (m_a != 0)
+    nan_b = (e_b == 0x1F) & (m_b != 0)
+    inf_a = (e_a == 0x1F) & (m_a == 0)
+    inf_b = (e_b == 0x1F) & (m_b == 0)
+    zero_a = (e_a == 0) & (m_a == 0)
+    zero_b = (e_b == 0) & (m_b == 0)
+
+    # MULTIPLY: raw exponents, no subnormal adjustment or range checks, and
+    # the exponent field wraps modulo 32
+    product = frac_a * frac_b
+    carry = product >> 21
+    exp = (e_a + e_b - 15 + carry) & 0x1F
+    mant = np.where(carry != 0, product >> 11, product >> 10) & 0x3FF
+    ext = np.where(carry != 0, product & 0x7FF, (product & 0x3FF) << 1)
+    sign = sign_a ^ sign_b
+
+    # PACK
+    is_inf = inf_a | inf_b
+    is_zero = zero_a | zero_b
+    is_nan = nan_a | nan_b | (is_inf & is_zero)
+    res = (sign << 15) | (exp << 10) | mant
+    res = np.where(is_zero, sign << 15, res)
+    res = np.where(is_inf, (sign << 15) | 0x7C00, res)
+    res = np.where(is_nan, QNAN, res)
+    ext = np.where(is_inf | is_zero | is_nan, 0, ext)
+    return res.astype(np.uint16), ext
+
+
+def _ieee_fma(a, b, c):
+    # The product is exact in float64, the sum may not be. TwoSum recovers
+    # its rounding error, which only changes the fp16 result when the sum
+    # lands exactly on a midpoint between two fp16 values: move it one
+    # float64 ulp towards the exact value
+    with np.errstate(invalid="ignore", over="ignore"):
+        p = bits_to_float(a) * bits_to_float(b)
+        c = bits_to_float(c)
+        s = p + c
+        bp = s - c
+        err = (p - bp) + (c - (s - bp))
+        near = s.astype(np.float16)
+        other = np.nextafter(near, np.where(s > near, np.float16(np.inf), np.float16(-np.inf)))
+        midpoint = (near.astype(np.float64) != s) & ((near.astype(np.float64) + other) / 2 == s)
+        s = np.where(midpoint & (err != 0), np.nextafter(s, s + err), s)
+        res = s.astype(np.float16).view(np.uint16)
+    return np.where(np.isnan(s), QNAN, res).astype(np.uint16)
+
+
+def _rtl_div(a, b, quotient_bits=12):
+    sign_a, e_a, m_a = _fields(a)
+    sign_b, e_b, m_b = _fields(b)
+
+    nan_a = (e_a == 0x1F) & (m_a != 0)
+    nan_b = (e_b == 0x1F) & (m_b != 0)
+    inf_a = (e_a == 0x1F) & (m_a == 0)
+    inf_b = (e_b == 0x1F) & (m_b == 0)
+    zero_a = (e_a == 0) & (m_a == 0)
+    zero_b = (e_b == 0) & (m_b == 0)
+    sign = sign_a ^ sign_b
+
+    # DECODE: subnormals are normalized, a smaller dividend is doubled
+    frac_a = np.where(e_a != 0, 1 << 10, 0) | m_a
+    frac_b = np.where(e_b != 0, 1 << 10, 0) | m_b
+    lz_a = 11 - _bit_length(frac_a)
+    lz_b = 11 - _bit_length(frac_b)
+    frac_a = frac_a << lz_a
+    frac_b = np.where(zero_b, 1 << 10, frac_b << lz_b)
+    small = frac_a < frac_b
+    rem = np.where(small, frac_a << 1, frac_a)
+    exp = np.where(e_a != 0, e_a, 1) - lz_a - np.where(e_b != 0, e_b, 1) + lz_b + 15 - small
+
+    # ITERATE: the digit recurrence yields the truncated quotient, 12 bits for
+    # DIV and the upper 8 of them for the reciprocal estimate
+    quot = (rem << 11) // frac_b
+    quot = (quot >> (12 - quotient_bits)) << (12 - quotient_bits)
+    q = quot >> 1
+
+    # PACK
+    shift = 1 - exp
+    sub = np.where(shift > 11, 0, q >> shift.clip(0, 11))
+    res = np.where(exp >= 31, (sign << 15) | 0x7C00,
+                   np.where(exp <= 0, (sign << 15) | (sub & 0x3FF),
+                            (sign << 15) | (exp.clip(0, 31) << 10) | (q & 0x3FF)))
+    res = np.where(zero_a | inf_b, sign << 15, res)
+    res = np.where(inf_a | zero_b, (sign << 15) | 0x7C00, res)
+    res = np.where(nan_a | nan_b | (zero_a & zero_b) | (inf_a & inf_b), QNAN, res)
+    return res.astype(np.uint16)
+
+
+def _rtl_sqrt(a):
+    sign, e, m = _fields(a)
+
+    nan = (e == 0x1F) & (m != 0)
+    inf = (e == 0x1F) & (m == 0)
+    zero = (e == 0) & (m == 0)
+
+    # DECODE: subnormals are normalized, an odd exponent doubles the mantissa
+    frac = np.where(e != 0, 1 << 10, 0) | m
+    lz = 11 - _bit_length(frac)
+    frac = frac << lz
+    exp = np.where(e != 0, e, 1) - lz - 15
+    odd = exp & 1
+    rad = (frac << odd) << 12
+
+    # ITERATE: the digit recurrence yields the integer root of the radicand
+    root = np.floor(np.sqrt(rad.astype(np.float64))).astype(np.int64)
+    root -= root * root > rad
+    root += (root + 1) * (root + 1) <= rad
+
+    # PACK
+    res = (((exp - odd) // 2 + 15) << 10) | ((root >> 1) & 0x3FF)
+    res = np.where(inf, 0x7C00, res)
+    res = np.where(nan | ((sign == 1) & ~zero), QNAN, res)
+    res = np.where(zero, a, res)
+    return res.astype(np.uint16)
+
+
+def fp16_add(a, b, mode=RTL):
+    """Expected bit patterns of a + b."""
+    _check_mode(mode)
+    if mode == IEEE:
+        return _ieee(np.add, a, b)
+    return _rtl_add(a, b)
+
+
+def fp16_sub(a, b, mode=RTL):
+    """Expected bit patterns of a - b (the FPU flips the sign of B and adds)."""
+    _check_mode(mode)
+    neg_b = np.asarray(b, dtype=np.uint16) ^ np.uint16(0x8000)
+    return fp16_add(a, neg_b, mode)
+
+
+def fp16_mul(a, b, mode=RTL):
+    """Expected bit patterns of a * b."""
+    _check_mode(mode)
+    if mode == IEEE:
+        return _ieee(np.multiply, a, b)
+    return _rtl_mul(a, b)
+
+
+def fp16_fma(a, b, c, mode=RTL):
+    """Expected bit patterns of a * b + c.
+
+    ``RTL`` mode passes the product and the product bits below its mantissa
+    into the adder, as the FPU chains fpu_mult into fpu_adder for FMA and
+    MAC, ``IEEE`` mode rounds a * b + c once.
+    """
+    _check_mode(mode)
+    if mode == IEEE:
+        return _ieee_fma(a, b, c)
+    product, ext = _rtl_mul_ext(a, b)
+    return _rtl_add(c, product, ext)
+
+
+def fp16_div(a, b, mode=RTL):
+    """Expected bit patterns of a / b."""
+    _check_mode(mode)
+    if mode == IEEE:
+        return _ieee(np.divide, a, b)
+    return _rtl_div(a, b)
+
+
+def fp16_recip(b, mode=RTL):
+    """Expected bit patterns of the reciprocal estimate of b.
+
+    ``RTL`` mode returns the 7-bit estimate of fpu_div (the quotient truncated
+    after 8 bits), ``IEEE`` mode the correctly rounded 1 / b.
+    """
+    _check_mode(mode)
+    one = np.full(np.shape(b), 0x3C00, dtype=np.uint16)
+    if mode == IEEE:
+        return _ieee(np.divide, one, b)
+    return _rtl_div(one, b, quotient_bits=8)
+
+
+def fp16_sqrt(a, mode=RTL):
+    """Expected bit patterns of sqrt(a)."""
+    _check_mode(mode)
+    a = np.asarray(a, dtype=np.uint16)
+    if mode == IEEE:
+        return _ieee(lambda x, _: np.sqrt(x), a, a)
+    return _rtl_sqrt(a)
+
+
+def fp16_rsqrt(a, mode=RTL):
+    """Expected bit patterns of 1 / sqrt(a).
+
+    ``RTL`` mode divides 1.0 by the truncated square root, as the FPU chains
+    fpu_sqrt into fpu_div, ``IEEE`` mode rounds 1 / sqrt(a) once.
+    """
+    _check_mode(mode)
+    a = np.asarray(a, dtype=np.uint16)
+    if mode == IEEE:
+        return _ieee(lambda x, _: 1.0 / np.sqrt(x), a, a)
+    return _rtl_div(np.full(a.shape, 0x3C00, dtype=np.uint16), _rtl_sqrt(a))
+
+
+def _round_increment(sign, lsb, guard, sticky, rm):
+    inexact = guard | sticky
+    return np.select(
+        [rm == RNE, rm == RTZ, rm == RDN, rm == RUP],
+        [guard & (sticky | lsb), 0, sign & inexact, (1 - sign) & inexact],
+        guard,
+    )
+
+
+def _shift_round(sig, shift, sign, rm):
+    """sig >> shift rounded in mode rm (shift may be negative)."""
+    right = np.clip(shift, 0, 62)
+    q = np.where(shift > 0, sig >> right, sig << np.clip(-shift, 0, 62))
+    guard = np.where(shift > 0, (sig >> np.clip(right - 1, 0, 62)) & 1, 0)
+    sticky = np.where(shift > 1, (sig & ((1 << np.clip(right - 1, 0, 62)) - 1)) != 0, 0).astype(np.int64)
+    return q + _round_increment(sign, q & 1, guard, sticky, rm)
+
+
+def _round_pack(sign, sig, exp2, rm, exp_bits, man_bits):
+    """Pack sign * sig * 2**exp2 into a binary format, rounding in mode rm."""
+    bias = (1 << (exp_bits - 1)) - 1
+    top = _bit_length(sig) - 1 + exp2
+    top = np.maximum(top, 1 - bias)
+    q = _shift_round(sig, top - man_bits - exp2, sign, rm)
+    # A subnormal q packs with exponent field 0, a carry out of the mantissa
+    # moves into the exponent field on its own
+    packed = ((top + bias - 1) << man_bits) + q
+    inf = ((1 << exp_bits) - 1) << man_bits
+    to_inf = (rm == RNE) | (rm >= RMM) | ((rm == RUP) & (sign == 0)) | ((rm == RDN) & (sign == 1))
+    packed = np.where(packed >= inf, np.where(to_inf, inf, inf - 1), packed)
+    packed = np.where(sig == 0, 0, packed)
+    return (sign << (exp_bits + man_bits)) | packed
+
+
+def _fp16_sig(e, m):
+    """Integer significand and its exponent: value = sig * 2**exp2."""
+    return np.where(e != 0, 1 << 10, 0) | m, np.where(e != 0, e, 1) - 25
+
+
+def int16_to_fp16(x, rm=RNE):
+    """fp16 bit patterns of the int16 values x (given as 16-bit patterns)."""
+    x = np.asarray(x, dtype=np.uint16).astype(np.int64)
+    sign = x >> 15
+    sig = np.where(sign == 1, (1 << 16) - x, x)
+    return _round_pack(sign, sig, 0, rm, 5, 10).astype(np.uint16)
+
+
+def uint16_to_fp16(x, rm=RNE):
+    """fp16 bit patterns of the uint16 values x."""
+    x = np.asarray(x, dtype=np.uint16).astype(np.int64)
+    return _round_pack(np.zeros_like(x), x, 0, rm, 5, 10).astype(np.uint16)
+
+
+def fp16_to_int16(a, rm=RNE):
+    """int16 bit patterns of the fp16 values a, saturating like RISC-V fcvt.
+
+    NaN and values above 32767 return 0x7FFF, values below -32768 0x8000.
+    """
+    sign, e, m = _fields(a)
+    sig, exp2 = _fp16_sig(e, m)
+    mag = _shift_round(sig, -exp2, sign, rm)
+    res = np.where(sign == 1, np.where(mag > 0x8000, 0x8000, -mag & 0xFFFF), np.minimum(mag, 0x7FFF))
+    res = np.where(e == 0x1F, np.where((sign == 1) & (m == 0), 0x8000, 0x7FFF), res)
+    return res.astype(np.uint16)
+
+
+def fp16_to_bf16(a, rm=RNE):
+    """bf16 bit patterns of the fp16 values a."""
+    sign, e, m = _fields(a)
+    sig, exp2 = _fp16_sig(e, m)
+    res = _round_pack(sign, sig, exp2, rm, 8, 7)
+    res = np.where(e == 0x1F, np.where(m == 0, (sign << 15) | 0x7F80, BF16_QNAN), res)
+    return res.astype(np.uint16)
+
+
+def bf16_to_fp16(a, rm=RNE):
+    """fp16 bit patterns of the bf16 values a."""
+    a = np.asarray(a, dtype=np.uint16).astype(np.int64)
+    sign, e, m = a >> 15, (a >> 7) & 0xFF, a & 0x7F
+    sig = np.where(e != 0, 1 << 7, 0) | m
+    res = _round_pack(sign, sig, np.where(e != 0, e, 1) - 134, rm, 5, 10)
+    res = np.where(e == 0xFF, np.where(m == 0, (sign << 15) | 0x7C00, QNAN), res)
+    return res.astype(np.uint16)
+
+
+def fp16_to_fp32(a):
+    """fp32 bit patterns of the fp16 values a (always exact)."""
+    a = np.asarray(a, dtype=np.uint16)
+    res = a.view(np.float16).astype(np.float32).view(np.uint32)
+    return np.where(np.isnan(a.view(np.float16)), np.uint32(FP32_QNAN), res).astype(np.uint32)
+
+
+# Functions of the CMP operation, selected through 0x2E
+FMIN, FMAX, FEQ, FLT, FLE, FABS, FNEG, FCLASS = range(8)
+
+
+def _is_nan(bits):
+    return (bits & 0x7FFF) > 0x7C00
+
+
+def _less(a, b):
+    # a < b on non-NaN values, with -0 below +0
+    key_a = np.where(a >> 15, 0x7FFF - (a & 0x7FFF), a | 0x8000)
+    key_b = np.where(b >> 15, 0x7FFF - (b & 0x7FFF), b | 0x8000)
+    return key_a < key_b
+
+
+def _min_max(a, b, pick_a):
+    nan_a, nan_b = _is_nan(a), _is_nan(b)
+    res = np.where(pick_a, a, b)
+    res = np.where(nan_a, b, np.where(nan_b, a, res))
+    return np.where(nan_a & nan_b, QNAN, res).astype(np.uint16)
+
+
+def fp16_min(a, b):
+    """RISC-V fmin: -0 < +0, a NaN operand returns the other one."""
+    a = np.asarray(a, dtype=np.uint16).astype(np.int64)
+    b = np.asarray(b, dtype=np.uint16).astype(np.int64)
+    return _min_max(a, b, _less(a, b))
+
+
+def fp16_max(a, b):
+    """RISC-V fmax: -0 < +0, a NaN operand returns the other one."""
+    a = np.asarray(a, dtype=np.uint16).astype(np.int64)
+    b = np.asarray(b, dtype=np.uint16).astype(np.int64)
+    return _min_max(a, b, _less(b, a))
+
+
+def fp16_eq(a, b):
+    """1 where a == b, 0 otherwise or when either is NaN."""
+    fa, fb = bits_to_float(a), bits_to_float(b)
+    return (fa == fb).astype(np.uint16)
+
+
+def fp16_lt(a, b):
+    """1 where a < b, 0 otherwise or when either is NaN."""
+    fa, fb = bits_to_float(a), bits_to_float(b)
+    return (fa < fb).astype(np.uint16)
+
+
+def fp16_le(a, b):
+    """1 where a <= b, 0 otherwise or when either is NaN."""
+    fa, fb = bits_to_float(a), bits_to_float(b)
+    return (fa <= fb).astype(np.uint16)
+
+
+def fp16_abs(a):
+    return (np.asarray(a, dtype=np.uint16) & 0x7FFF).astype(np.uint16)
+
+
+def fp16_neg(a):
+    return (np.asarray(a, dtype=np.uint16) ^ 0x8000).astype(np.uint16)
+
+
+def fp16_class(a):
+    """RISC-V fclass masks: one bit set per value, see fpu_compare.v."""
+    sign, e, m = _fields(a)
+    bit = np.select(
+        [(e == 0x1F) & (m == 0), (e != 0) & (e != 0x1F), (e == 0) & (m != 0), (e == 0) & (m == 0)],
+        [np.where(sign == 1, 0, 7), np.where(sign == 1, 1, 6), np.where(sign == 1, 2, 5), np.where(sign == 1, 3, 4)],
+        np.where(m >> 9, 9, 8),
+    )
+    return (1 << bit).astype(np.uint16)
+
+
+def assert_bits_equal(actual, expected, a=None, b=None, op="?"):
+    """Assert that two batches of fp16 bit patterns are identical.
+
+    On failure the message lists the first mismatches with their operands.
+    """
+    actual = np.atleast_1d(np.asarray(actual, dtype=np.uint16))
+    expected = np.atleast_1d(np.asarray(expected, dtype=np.uint16))
+    bad = np.flatnonzero(actual != expected)
+    if bad.size == 0:
+        return
+    lines = []
+    for i in bad[:10]:
+        operands = ""
+        if a is not None and b is not None:
+            ai = int(np.atleast_1d(a)[i])
+            bi = int(np.atleast_1d(b)[i])
+            operands = f"{ai:#06x} {op} {bi:#06x} "
+        elif a is not None:
+            operands = f"{op}({int(np.atleast_1d(a)[i]):#06x}) "
+        lines.append(f"{operands}= {int(actual[i]):#06x}, expected {int(expected[i]):#06x}")
+    raise AssertionError(f"{bad.size} of {actual.size} results differ:\n" + "\n".join(lines))
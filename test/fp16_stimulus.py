@@ -0,0 +1,303 @@
+"""Coverage-driven constrained-random operands for the fp16 benches.
+
+Uniform random bit patterns are mostly ordinary normals: Inf, NaN, zeros and
+subnormals are a few percent of them, and cancellations, overflows or
+exponent differences near the significand width turn up by chance.
+``StimulusGenerator`` draws batches of operand pairs from constrained
+scenarios instead, and ``Coverage`` bins every batch that went through the
+DUT:
+
+- ``class pair``: the classes of A and B (zero, subnormal, normal, Inf, NaN)
+- ``signs``: the signs of A and B
+- ``result``: the class of the correctly rounded result
+- ``exp diff`` (add/sub): exponent difference of two finite non-zero operands
+- ``events``: overflow, underflow, cancellation and exact zero results
+
+Each batch is half background mix and half aimed at the bins that are still
+empty, so a test can loop until ``Coverage.closed``::
+
+    gen = StimulusGenerator("add", seed)
+    cov = Coverage("add")
+    while not cov.closed:
+        a, b = gen.batch(256, cov)
+        actual = ...  # stream a, b through the DUT, check against fp16_model
+        cov.sample(a, b, actual)
+
+Given the DUT results, ``Coverage`` also counts per bin how many differ from
+round-to-nearest-even, which shows where the RTL departs from IEEE (like the
+NaN pattern fpu_adder and fpu_mult return on overflow).
+"""
+
+import numpy as np
+
+from fp16_model import fp16_add, fp16_sub, fp16_mul, IEEE
+
+ZERO, SUBNORMAL, NORMAL, INF, NAN = range(5)
+CLASS_NAMES = ("zero", "subnormal", "normal", "inf", "nan")
+
+# Share of each operand class in the background mix
+CLASS_WEIGHTS = (0.1, 0.2, 0.4, 0.15, 0.15)
+
+# Lower edges of the exponent difference bins: 0, 1, 2, the significand
+# width (11) and the point where fpu_adder drops the smaller operand (22)
+EXP_DIFF_EDGES = (0, 1, 2, 3, 11, 12, 22)
+EXP_DIFF_NAMES = ("0", "1", "2", "3-10", "11", "12-21", "22+")
+
+# A result this many binades below the larger operand is a cancellation
+CANCEL_BINADES = 4
+
+_IEEE_MODELS = {
+    "add": lambda a, b: fp16_add(a, b, IEEE),
+    "sub": lambda a, b: fp16_sub(a, b, IEEE),
+    "mul": lambda a, b: fp16_mul(a, b, IEEE),
+}
+
+_EVENTS = {
+    "add": ("overflow", "underflow", "cancellation", "exact zero"),
+    "sub": ("overflow", "underflow", "cancellation", "exact zero"),
+    "mul": ("overflow", "underflow"),
+}
+
+
+def classify(bits):
+    """Class (ZERO ... NAN) of every fp16 bit pattern."""
+    bits = np.asarray(bits, dtype=np.uint16).astype(np.int64)
+    e, m = (bits >> 10) & 0x1F, bits & 0x3FF
+    return np.select([(e == 0) & (m == 0), e == 0, e != 0x1F, m == 0],
+                     [ZERO, SUBNORMAL, NORMAL, INF], NAN)
+
+
+def _exponent(bits):
+    # Subnormals share the exponent of the smallest normal
+    e = (np.asarray(bits, dtype=np.uint16).astype(np.int64) >> 10) & 0x1F
+    return np.maximum(e, 1)
+
+
+def _check_op(op):
+    if op not in _IEEE_MODELS:
+        raise ValueError(f"Unknown op {op!r}, expected one of {tuple(_IEEE_MODELS)}")
+
+
+class Coverage:
+    """Functional coverage bins of one operation, closed at ``goal`` hits per bin."""
+
+    def __init__(self, op, goal=4):
+        _check_op(op)
+        self.op = op
+        self.goal = goal
+        self.vectors = 0
+        n = len(CLASS_NAMES)
+        self.bins = {
+            "class pair": np.zeros((n, n), dtype=np.int64),
+            "signs": np.zeros((2, 2), dtype=np.int64),
+            "result": np.zeros(n, dtype=np.int64),
+            "events": np.zeros(len(_EVENTS[op]), dtype=np.int64),
+        }
+        if op != "mul":
+            self.bins["exp diff"] = np.zeros(len(EXP_DIFF_EDGES), dtype=np.int64)
+        # Hits whose DUT result differs from round-to-nearest-even
+        self.differ = {group: np.zeros_like(counts) for group, counts in self.bins.items()}
+
+    def _count(self, group, index, differ):
+        size = self.bins[group].size
+        shape = self.bins[group].shape
+        self.bins[group] += np.bincount(index, minlength=size).reshape(shape)
+        if differ is not None:
+            self.differ[group] += np.bincount(index[differ[:len(index)]], minlength=size).reshape(shape)
+
+    def sample(self, a, b, actual=None):
+        """Count the bins hit by a batch of operand pairs and its DUT results."""
+        a = np.asarray(a, dtype=np.uint16)
+        b = np.asarray(b, dtype=np.uint16)
+        result = _IEEE_MODELS[self.op](a, b)
+        ca, cb, cr = classify(a), classify(b), classify(result)
+        differ = None
+        if actual is not None:
+            # Any NaN pattern stands for NaN
+            actual = np.asarray(actual, dtype=np.uint16)
+            differ = (actual != result) & ((classify(actual) != NAN) | (cr != NAN))
+        n = len(CLASS_NAMES)
+        self._count("class pair", ca * n + cb, differ)
+        self._count("signs", (a >> 15).astype(np.int64) * 2 + (b >> 15), differ)
+        self._count("result", cr, differ)
+
+        finite = (ca <= NORMAL) & (cb <= NORMAL)
+        nonzero = (ca != ZERO) & (cb != ZERO)
+        events = {
+            "overflow": finite & (cr == INF),
+            "underflow": (ca == NORMAL) & (cb == NORMAL) & (cr <= SUBNORMAL),
+        }
+        if self.op != "mul":
+            both = finite & nonzero
+            diff = np.abs(_exponent(a) - _exponent(b))
+            self._count("exp diff", np.digitize(diff[both], EXP_DIFF_EDGES) - 1,
+                        None if differ is None else differ[both])
+            # Effective subtraction: the signs differ for add, match for sub
+            opposite = ((a ^ b) >> 15 == 1) ^ (self.op == "sub")
+            top = np.maximum(_exponent(a), _exponent(b))
+            events["cancellation"] = both & opposite & (cr != ZERO) & \
+                (_exponent(result) <= top - CANCEL_BINADES)
+            events["exact zero"] = both & (cr == ZERO)
+        for i, name in enumerate(_EVENTS[self.op]):
+            self.bins["events"][i] += np.count_nonzero(events[name])
+            if differ is not None:
+                self.differ["events"][i] += np.count_nonzero(events[name] & differ)
+        self.vectors += len(a)
+
+    def _labels(self, group):
+        if group == "class pair":
+            return [(x, y) for x in CLASS_NAMES for y in CLASS_NAMES]
+        if group == "signs":
+            return [(x, y) for x in "+-" for y in "+-"]
+        if group == "result":
+            return list(CLASS_NAMES)
+        if group == "exp diff":
+            return list(EXP_DIFF_NAMES)
+        return list(_EVENTS[self.op])
+
+    def holes(self):
+        """(group, label) of every bin below the goal."""
+        return [(group, label)
+                for group, counts in self.bins.items()
+                for label, count in zip(self._labels(group), counts.ravel())
+                if count < self.goal]
+
+    @property
+    def closed(self):
+        return not self.holes()
+
+    def report(self):
+        """One line per group with the closed bins, and the holes."""
+        lines = []
+        for group, counts in self.bins.items():
+            line = (f"{group}: {np.count_nonzero(counts >= self.goal)}/{counts.size} bins, "
+                    f"{int(counts.min())}..{int(counts.max())} hits")
+            differ = [f"{label} {int(d)}/{int(c)}"
+                      for label, c, d in zip(self._labels(group), counts.ravel(), self.differ[group].ravel())
+                      if d]
+            if differ:
+                line += "; differ from IEEE: " + ", ".join(differ)
+            lines.append(line)
+        holes = self.holes()
+        if holes:
+            lines.append("holes: " + ", ".join(f"{group} {label}" for group, label in holes))
+        return "\n".join(lines)
+
+
+class StimulusGenerator:
+    """Batches of constrained-random fp16 operand pairs for one operation."""
+
+    def __init__(self, op, seed=None):
+        _check_op(op)
+        self.op = op
+        self.rng = np.random.default_rng(seed)
+
+    # === Operand constraints ===
+    def operands(self, cls, n, sign=None, exp=None):
+        """n operands of class cls, with random or the given sign and exponent."""
+        rng = self.rng
+        sign = rng.integers(0, 2, n) if sign is None else np.broadcast_to(sign, n)
+        mant = rng.integers(0, 1 << 10, n)
+        if cls == ZERO:
+            e, mant = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+        elif cls == SUBNORMAL:
+            e, mant = np.zeros(n, dtype=np.int64), rng.integers(1, 1 << 10, n)
+        elif cls == NORMAL:
+            e = rng.integers(1, 31, n) if exp is None else np.broadcast_to(exp, n)
+        elif cls == INF:
+            e, mant = np.full(n, 0x1F), np.zeros(n, dtype=np.int64)
+        else:
+            e, mant = np.full(n, 0x1F), rng.integers(1, 1 << 10, n)
+        return ((sign << 15) | (e << 10) | mant).astype(np.uint16)
+
+    def _classes(self, n):
+        cls = self.rng.choice(len(CLASS_NAMES), n, p=CLASS_WEIGHTS)
+        out = np.zeros(n, dtype=np.uint16)
+        for c in range(len(CLASS_NAMES)):
+            idx = np.flatnonzero(cls == c)
+            out[idx] = self.operands(c, idx.size)
+        return out
+
+    # === Scenarios: each returns n operand pairs ===
+    def mix(self, n):
+        """Both classes drawn from CLASS_WEIGHTS."""
+        return self._classes(n), self._classes(n)
+
+    def pair(self, n, cls_a, cls_b, sign_a=None, sign_b=None):
+        return self.operands(cls_a, n, sign_a), self.operands(cls_b, n, sign_b)
+
+    def exp_diff(self, n, low=0, high=24):
+        """Finite operands whose exponents differ by low..high."""
+        rng = self.rng
+        diff = rng.integers(low, high + 1, n)
+        top = rng.integers(np.minimum(diff + 1, 30), 31)
+        a = self.operands(NORMAL, n, exp=top)
+        b = self.operands(NORMAL, n, exp=np.maximum(top - diff, 1))
+        swap = rng.integers(0, 2, n).astype(bool)
+        return np.where(swap, b, a), np.where(swap, a, b)
+
+    def cancellation(self, n):
+        """B within a few ulps of -A (of A for sub), so most bits cancel."""
+        rng = self.rng
+        a = self.operands(rng.choice([SUBNORMAL, NORMAL]), n)
+        mag = (a & 0x7FFF).astype(np.int64) + rng.integers(-4, 5, n)
+        b = ((a & 0x8000) ^ (0x8000 if self.op != "sub" else 0)) | np.clip(mag, 0, 0x7BFF)
+        return a, b.astype(np.uint16)
+
+    def overflow(self, n):
+        """Products or same-direction sums just past the largest normal."""
+        sign = self.rng.integers(0, 2, n)
+        if self.op == "mul":
+            e_a = self.rng.integers(20, 31, n)
+            e_b = np.clip(46 - e_a + self.rng.integers(0, 3, n), 1, 30)
+            return (self.operands(NORMAL, n, exp=e_a),
+                    self.operands(NORMAL, n, exp=e_b))
+        sign_b = sign ^ (self.op == "sub")
+        return (self.operands(NORMAL, n, sign, exp=30),
+                self.operands(NORMAL, n, sign_b, exp=self.rng.integers(28, 31, n)))
+
+    def underflow(self, n):
+        """Normal operands whose product or difference is subnormal or zero."""
+        if self.op != "mul":
+            a = self.operands(NORMAL, n, exp=self.rng.integers(1, 3, n))
+            b = ((a & 0x8000) ^ (0x8000 if self.op != "sub" else 0)) | \
+                self.operands(NORMAL, n, sign=0, exp=1)
+            return a, b.astype(np.uint16)
+        e_a = self.rng.integers(1, 15, n)
+        e_b = np.clip(15 - e_a - self.rng.integers(0, 11, n), 1, 30)
+        return (self.operands(NORMAL, n, exp=e_a),
+                self.operands(NORMAL, n, exp=e_b))
+
+    def _target(self, hole, n):
+        group, label = hole
+        if group == "class pair":
+            return self.pair(n, CLASS_NAMES.index(label[0]), CLASS_NAMES.index(label[1]))
+        if group == "signs":
+            return self.pair(n, NORMAL, NORMAL, "+-".index(label[0]), "+-".index(label[1]))
+        if group == "exp diff":
+            i = EXP_DIFF_NAMES.index(label)
+            high = EXP_DIFF_EDGES[i + 1] - 1 if i + 1 < len(EXP_DIFF_EDGES) else 29
+            return self.exp_diff(n, EXP_DIFF_EDGES[i], high)
+        if label in ("overflow", "inf"):
+            return self.overflow(n)
+        if label in ("underflow", "subnormal"):
+            return self.underflow(n)
+        if label in ("cancellation", "exact zero", "zero"):
+            return self.cancellation(n) if self.op != "mul" else self.pair(n, ZERO, NORMAL)
+        if label == "nan":
+            return self.pair(n, NAN, NORMAL)
+        return self.mix(n)
+
+    def batch(self, n, coverage=None):
+        """n operand pairs: half the background mix, half aimed at coverage holes."""
+        holes = coverage.holes() if coverage is not None else []
+        aimed = n // 2 if holes else 0
+        parts = [self.mix(n - aimed)]
+        if aimed:
+            for hole, size in zip(holes, np.diff(np.linspace(0, aimed, len(holes) + 1).astype(int))):
+                if size:
+                    parts.append(self._target(hole, size))
+        a = np.concatenate([p[0] for p in parts])
+        b = np.concatenate([p[1] for p in parts])
+        order = self.rng.permutation(n)
+        return a[order], b[order]
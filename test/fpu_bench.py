@@ -0,0 +1,141 @@
+"""FPU performance benchmark with a stored baseline.
+
+Runs the cocotb benchmarks in fpu_bench_tests.py on their benches, in
+parallel, and collects the measurements into one JSON file:
+
+- latency: clocks from the write of B to a ready result (0x20), per opcode
+  and operand class (normal, subnormal, zero, Inf, NaN, far exponents)
+- stream: latency and sustained ops per clock at the fpu_adder / fpu_mult
+  ports, with and without the early exit
+- spi: clocks per operation and operations per second through the SPI
+  harness and tqv.py
+
+The measurements are compared against a baseline (fpu_bench_baseline.json by
+default) and every one that got worse is reported. Clock counts are exact in
+any simulator, so any change is flagged; wall-clock rates are printed but not
+compared unless --wall-tolerance is given. After an intended change, store
+the new numbers with --update-baseline.
+
+usage:
+    python3 fpu_bench.py --sim verilator
+    python3 fpu_bench.py --output bench.json --baseline old.json
+    python3 fpu_bench.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from regress import TEST_DIR, run_job
+
+MODULE = "fpu_bench_tests"
+BASELINE = os.path.join(TEST_DIR, "fpu_bench_baseline.json")
+
+# (bench in regress.BENCHES, test in fpu_bench_tests.py)
+JOBS = [
+    ("fpu", "bench_latency"),
+    ("adder", "bench_stream"),
+    ("multiplier", "bench_stream"),
+    ("top", "bench_spi"),
+]
+
+# Units where a larger value is better; the others are clocks
+HIGHER_IS_BETTER = ("ops/clock", "ops/s", "ops/s wall")
+WALL_UNITS = ("ops/s wall",)
+
+
+def run(job, build_root, sim):
+    bench, test = job
+    job_dir = os.path.join(build_root, sim, f"{bench}-{test}")
+    path = os.path.join(job_dir, "bench.json")
+    os.makedirs(job_dir, exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    _, cases, _, log = run_job((bench, test, None), build_root, False, sim, {"BENCH_JSON": path}, MODULE)
+    if cases[0].find("failure") is not None or not os.path.exists(path):
+        return job, None, log
+    with open(path) as f:
+        return job, json.load(f), log
+
+
+def compare(records, baseline, tolerance, wall_tolerance):
+    """Print the change of every measurement and return the ones that got worse."""
+    old = {(r["bench"], r["name"], r["unit"]): r["value"] for r in baseline}
+    worse = []
+    for r in records:
+        key = (r["bench"], r["name"], r["unit"])
+        if key not in old:
+            print(f"  new   {r['bench']:>8} {r['name']:<36} {r['value']:>12.6g} {r['unit']}")
+            continue
+        before, after = old.pop(key), r["value"]
+        change = (after - before) / before if before else float(after != before)
+        if r["unit"] not in HIGHER_IS_BETTER:
+            change = -change
+        limit = wall_tolerance if r["unit"] in WALL_UNITS else tolerance
+        regressed = limit is not None and change < -limit
+        if regressed:
+            worse.append(r)
+        if regressed or after != before:
+            status = "WORSE" if regressed else "      "
+            print(f"{status} {r['bench']:>8} {r['name']:<36} {before:>12.6g} -> {after:<12.6g} {r['unit']} "
+                  f"({change:+.1%})")
+    for bench, name, unit in old:
+        print(f"  gone  {bench:>8} {name:<36} {unit}")
+    return worse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sim", choices=("icarus", "verilator"), default="icarus",
+                        help="simulator backend (default: %(default)s)")
+    parser.add_argument("--output", default=os.path.join(TEST_DIR, "fpu_bench.json"),
+                        help="measurements file (default: %(default)s)")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="measurements to compare against (default: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the measurements to the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="relative loss allowed in the simulated measurements (default: %(default)s)")
+    parser.add_argument("--wall-tolerance", type=float,
+                        help="relative loss allowed in the wall-clock rates (default: not compared)")
+    parser.add_argument("--build-dir", default=os.path.join(TEST_DIR, "sim_build", "fpu_bench"),
+                        help="root of the build directories (default: %(default)s)")
+    args = parser.parse_args()
+
+    build_root = os.path.abspath(args.build_dir)
+    records = []
+    failed = False
+    with ThreadPoolExecutor(max_workers=len(JOBS)) as pool:
+        for (bench, test), result, log in pool.map(lambda job: run(job, build_root, args.sim), JOBS):
+            if result is None:
+                print(f"{bench} {test}: FAILED, see {log}", file=sys.stderr)
+                failed = True
+                continue
+            records += result
+
+    print(f"{'bench':>8} {'measurement':<36} {'value':>12} unit")
+    for r in records:
+        print(f"{r['bench']:>8} {r['name']:<36} {r['value']:>12.6g} {r['unit']}")
+
+    output = BASELINE if args.update_baseline else args.output
+    with open(output, "w") as f:
+        json.dump(records, f, indent=2)
+    print(f"{len(records)} measurements written to {output}")
+    if failed or args.update_baseline:
+        return 1 if failed else 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, nothing to compare (--update-baseline stores one)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"changes against {args.baseline}:")
+    worse = compare(records, baseline, args.tolerance, args.wall_tolerance)
+    print(f"{len(worse)} measurements worse than the baseline")
+    return 1 if worse else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""cocotb benchmarks of the FPU, run by fpu_bench.py.
+
+Each test measures one level of the design and writes its measurements as a
+list of {"bench", "name", "value", "unit"} records to the JSON file named by
+BENCH_JSON:
+
+- bench_latency (components/FPU, fpu_tb): clocks from the write of B to
+  data_ready of 0x20, per opcode and operand class
+- bench_stream (components/Adder and components/Multiplier): latency and
+  sustained ops per clock at the fpu_adder / fpu_mult ports, one operand
+  pair offered per clock
+- bench_spi (test/, tb): clocks per operation and operations per second
+  (at the 10 MHz clock of test.py, and in wall time) through the SPI
+  harness and tqv.py, for single, packed and burst access
+
+These are not part of the regression: the tests only fail when the design
+stops producing results.
+"""
+
+import json
+import os
+import time
+
+import cocotb
+import numpy as np
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+
+from tqv import TinyQV
+
+BENCH_JSON = os.environ.get("BENCH_JSON", "fpu_bench.json")
+STREAM_SIZE = int(os.environ.get("BENCH_STREAM_SIZE", "512"))
+SPI_OPS = 16
+
+# Operand classes: (A, B), B carries the class. "far" puts the operands more
+# than 21 binades apart, where the adder returns the larger one early
+ONE = 0x3C00
+CLASSES = {
+    "normal": (0x3E00, 0x4100),
+    "subnormal": (0x3E00, 0x0001),
+    "zero": (0x3E00, 0x0000),
+    "inf": (0x3E00, 0x7C00),
+    "nan": (0x3E00, 0x7E00),
+    "far": (0x6400, 0x0800),
+}
+
+# (name, address of A, address of B); unary operations start on B alone
+OPCODES = [
+    ("ADD", 0x00, 0x01),
+    ("SUB", 0x04, 0x05),
+    ("MUL", 0x08, 0x09),
+    ("FMA", 0x0C, 0x0D),
+    ("ACC", None, 0x11),
+    ("MAC", 0x14, 0x15),
+    ("DIV", 0x18, 0x19),
+    ("RECIP", None, 0x1D),
+    ("SQRT", None, 0x21),
+    ("RSQRT", None, 0x25),
+    ("CVT", 0x28, 0x29),
+    ("CMP", 0x2C, 0x2D),
+]
+CVT_F2I = 2
+FMIN = 0
+
+
+def save(records):
+    with open(BENCH_JSON, "w") as f:
+        json.dump(records, f, indent=2)
+
+
+def record(records, dut, bench, name, value, unit):
+    records.append({"bench": bench, "name": name, "value": value, "unit": unit})
+    dut._log.info(f"BENCH: {bench} {name} = {value:.6g} {unit}")
+
+
+# === Peripheral bus (fpu_tb) ===
+async def bus_write(dut, addr, data):
+    dut.address.value = addr
+    dut.data_in.value = data
+    dut.data_write_n.value = 0b10
+    await RisingEdge(dut.clk)
+    dut.data_write_n.value = 0b11
+    await RisingEdge(dut.clk)
+
+
+async def clocks_to_ready(dut, addr, data, timeout=100):
+    """Write data to addr and count the clocks until 0x20 is ready, then read it."""
+    dut.address.value = addr
+    dut.data_in.value = data
+    dut.data_write_n.value = 0b10
+    await RisingEdge(dut.clk)
+    dut.data_write_n.value = 0b11
+    dut.address.value = 0x20
+    for clocks in range(1, timeout):
+        await RisingEdge(dut.clk)
+        if dut.data_ready.value == 1:
+            dut.data_read_n.value = 0b10
+            await RisingEdge(dut.clk)
+            dut.data_read_n.value = 0b11
+            await RisingEdge(dut.clk)
+            return clocks
+    raise TimeoutError(f"Result not ready {timeout} clocks after the write of {addr:#04x}")
+
+
+@cocotb.test()
+async def bench_latency(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    dut.rst_n.value = 0
+    dut.ui_in.value = 0
+    dut.data_write_n.value = 0b11
+    dut.data_read_n.value = 0b11
+    await Timer(20, units="ns")
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+    records = []
+    await bus_write(dut, 0x0E, ONE)
+    await bus_write(dut, 0x2E, FMIN)
+    for name, addr_a, addr_b in OPCODES:
+        for cls, (a, b) in CLASSES.items():
+            if addr_a is None and cls == "far":
+                continue
+            if name in ("ACC", "MAC"):
+                await bus_write(dut, 0x30, ONE)
+            if name == "CVT":
+                a = CVT_F2I
+            if addr_a is not None:
+                await bus_write(dut, addr_a, a)
+            clocks = await clocks_to_ready(dut, addr_b, b)
+            record(records, dut, "latency", f"{name}/{cls}", clocks, "clocks")
+    save(records)
+
+
+# === Unit ports (fpu_add_tb, fpu_mult_tb) ===
+async def stream(dut, a_bits, b_bits):
+    """Offer one pair per clock and return (cycle of the first result, cycle of the last)."""
+    cycle = 0
+    out = []
+    while len(out) < len(a_bits):
+        await FallingEdge(dut.clk)
+        if cycle < len(a_bits):
+            dut.a.value = int(a_bits[cycle])
+            dut.b.value = int(b_bits[cycle])
+            dut.valid_in.value = 1
+        else:
+            dut.valid_in.value = 0
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.valid_out.value == 1:
+            out.append(cycle)
+        cycle += 1
+        if cycle > len(a_bits) + 50:
+            raise TimeoutError("Unit did not drain the pipeline in time")
+    await FallingEdge(dut.clk)
+    dut.valid_in.value = 0
+    return out[0], out[-1]
+
+
+@cocotb.test()
+async def bench_stream(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    dut.rst_n.value = 0
+    dut.valid_in.value = 0
+    dut.early_en.value = 0
+    await RisingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+    unit = "adder" if "add" in dut._name else "multiplier"
+    rng = np.random.default_rng(2025)
+    n = STREAM_SIZE
+    normal = rng.integers(0x0400, 0x7C00, (2, n), dtype=np.uint16) | rng.choice([0, 0x8000], (2, n)).astype(np.uint16)
+    specials = normal.copy()
+    specials[1] = 0x0000
+    sparse = normal.copy()
+    sparse[1, ::2] = 0x0000
+    workloads = {
+        "normal": normal,
+        "random": rng.integers(0, 1 << 16, (2, n), dtype=np.uint16),
+        "zero": specials,
+        "half-zero": sparse,
+    }
+
+    # The top level runs the units with the early exit enabled
+    records = []
+    for early in (0, 1):
+        dut.early_en.value = early
+        for cls, (a_bits, b_bits) in workloads.items():
+            first, last = await stream(dut, a_bits, b_bits)
+            mode = "early" if early else "full"
+            record(records, dut, "stream", f"{unit}/{mode}/{cls}/latency", first, "clocks")
+            record(records, dut, "stream", f"{unit}/{mode}/{cls}/throughput", n / (last - first + 1), "ops/clock")
+    save(records)
+
+
+# === SPI path (tb, through tqv.py) ===
+@cocotb.test()
+async def bench_spi(dut):
+    period = 100
+    cocotb.start_soon(Clock(dut.clk, period, units="ns").start())
+    tqv = TinyQV(dut, 0)
+    await tqv.reset()
+
+    rng = np.random.default_rng(2025)
+    pairs = [(int(a), int(b)) for a, b in rng.integers(0x3800, 0x4400, (SPI_OPS, 2))]
+
+    async def single():
+        for a, b in pairs:
+            await tqv.write_word_reg(0x00, a)
+            await tqv.write_word_reg(0x01, b)
+            await tqv.read_word_reg(0x20)
+
+    async def packed():
+        for a, b in pairs:
+            await tqv.write_operands(0x03, a, b)
+            await tqv.read_word_reg(0x20)
+
+    async def burst():
+        # As many pairs per burst as the result queue holds
+        for i in range(0, SPI_OPS, 4):
+            await tqv.write_operands_burst(0x0B, pairs[i:i + 4])
+            await tqv.read_burst(0x1C, 4, step=0)
+
+    async def dot():
+        await tqv.write_word_reg(0x30, 0)
+        await tqv.write_operands_burst(0x17, pairs)
+        await tqv.read_word_reg(0x20)
+
+    records = []
+    for name, workload in [("ADD two writes", single), ("ADD packed", packed),
+                           ("MUL packed burst", burst), ("MAC dot product", dot)]:
+        start_ns = get_sim_time(units="ns")
+        start = time.perf_counter()
+        await workload()
+        seconds = time.perf_counter() - start
+        clocks = (get_sim_time(units="ns") - start_ns) / period
+        record(records, dut, "spi", f"{name}/clocks", clocks / SPI_OPS, "clocks/op")
+        record(records, dut, "spi", f"{name}/rate", SPI_OPS * 1e9 / (clocks * period), "ops/s")
+        record(records, dut, "spi", f"{name}/wall", SPI_OPS / seconds, "ops/s wall")
+    save(records)
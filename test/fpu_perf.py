@@ -0,0 +1,11 @@
+"""Performance counters of tqvp_dsatizabal_fpu, shared by tqv.py and tqv_model.py.
+
+Plain Python, so the model can be imported without cocotb.
+"""
+
+# Counter names by their index in 0x3A: clock cycles, busy cycles, cycles
+# waiting for operand B, completed operations and completed operations per
+# opcode
+PERF_COUNTERS = ["cycles", "busy", "reading", "ops",
+                 "add", "sub", "mul", "fma", "acc", "mac", "div", "recip",
+                 "sqrt", "rsqrt", "cvt", "cmp"]
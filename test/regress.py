@@ -0,0 +1,183 @@
+"""Parallel regression runner for the cocotb testbenches.
+
+Every cocotb test of the TinyQV integration bench (test/) and the component
+benches (test/components/*) becomes a job. The randomized batch tests can be
+split into extra shards with --seeds, each shard using its own BATCH_SEED.
+Jobs run in N worker processes, each with its own sim_build directory and
+results file, and the results are merged into a single results.xml.
+
+usage:
+    python3 regress.py --jobs 8
+    python3 regress.py --benches adder,multiplier --seeds 16 -k batch
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name: (directory, test module, make target)
+BENCHES = {
+    "top": (TEST_DIR, "test.py", None),
+    "top-simd": (TEST_DIR, "test.py", None),
+    "top-lean": (TEST_DIR, "test.py", None),
+    "adder": (os.path.join(TEST_DIR, "components", "Adder"), "add_tests.py", "test"),
+    "multiplier": (os.path.join(TEST_DIR, "components", "Multiplier"), "mult_tests.py", "test"),
+    "divider": (os.path.join(TEST_DIR, "components", "Divider"), "div_tests.py", "test"),
+    "sqrt": (os.path.join(TEST_DIR, "components", "Sqrt"), "sqrt_tests.py", "test"),
+    "convert": (os.path.join(TEST_DIR, "components", "Convert"), "convert_tests.py", "test"),
+    "compare": (os.path.join(TEST_DIR, "components", "Compare"), "compare_tests.py", "test"),
+    "fpu": (os.path.join(TEST_DIR, "components", "FPU"), "fpu_tests.py", "test"),
+}
+
+# Make variables of a bench: top-simd adds the second lane to the chip's
+# build, top-lean leaves out the optional units
+BENCH_VARS = {
+    "top-simd": {"SIMD": "1"},
+    "top-lean": {"DIV_UNIT": "0", "SQRT_UNIT": "0", "CVT_UNIT": "0"},
+}
+
+# Tests whose vectors come from BATCH_SEED and can be sharded
+BATCH_TESTS = re.compile(r"_model_batch$|_coverage$")
+
+
+def discover(path):
+    """Names of the cocotb tests defined in a test module."""
+    with open(path) as f:
+        source = f.read()
+    return re.findall(r"@cocotb\.test\([^)]*\)\s*\nasync def (\w+)", source)
+
+
+def plan(benches, seeds, pattern):
+    jobs = []
+    for bench in benches:
+        directory, module, _ = BENCHES[bench]
+        for test in discover(os.path.join(directory, module)):
+            if pattern and not re.search(pattern, test):
+                continue
+            if BATCH_TESTS.search(test) and seeds > 1:
+                for seed in range(seeds):
+                    jobs.append((bench, test, seed))
+            else:
+                jobs.append((bench, test, None))
+    return jobs
+
+
+def run_job(job, build_root, waves, sim="icarus", extra_env=None, module=None):
+    bench, test, seed = job
+    directory, _, target = BENCHES[bench]
+    name = f"{bench}-{test}" + (f"-{seed}" if seed is not None else "")
+    # The component benches wipe SIM_BUILD, so results and logs sit next to it
+    job_dir = os.path.join(build_root, sim, name)
+    build = os.path.join(job_dir, "sim_build")
+    os.makedirs(job_dir, exist_ok=True)
+    results = os.path.join(job_dir, "results.xml")
+    log = os.path.join(job_dir, "sim.log")
+
+    # The Makefiles locate sources through $(PWD), so run from the bench directory
+    env = dict(os.environ, PWD=directory, TESTCASE=test, COCOTB_RESULTS_FILE=results, WAVE_DIR=job_dir,
+               **BENCH_VARS.get(bench, {}), **(extra_env or {}))
+    if seed is not None:
+        env["BATCH_SEED"] = str(seed)
+
+    cmd = ["make", f"SIM={sim}", f"SIM_BUILD={build}", f"COCOTB_RESULTS_FILE={results}",
+           f"WAVES={waves or 0}"]
+    if module:
+        # Another test module on the same bench (fpu_bench.py)
+        cmd.append(f"MODULE={module}")
+    if target:
+        cmd.append(target)
+
+    if os.path.exists(results):
+        os.remove(results)
+    start = time.monotonic()
+    with open(log, "w") as f:
+        subprocess.run(cmd, cwd=directory, env=env, stdout=f, stderr=subprocess.STDOUT)
+    elapsed = time.monotonic() - start
+
+    if os.path.exists(results):
+        cases = ET.parse(results).getroot().iter("testcase")
+        cases = [case for case in cases if case.get("name") == test]
+    else:
+        cases = []
+
+    if not cases:
+        # The simulator died or never ran the test: report it as a failure
+        case = ET.Element("testcase", name=test, classname=bench, time=f"{elapsed:.3f}")
+        ET.SubElement(case, "failure", message=f"no result, see {log}")
+        cases = [case]
+
+    for case in cases:
+        case.set("classname", f"{bench}.{case.get('classname', '')}".rstrip("."))
+        if seed is not None:
+            case.set("name", f"{test}[seed={seed}]")
+    return name, cases, elapsed, log
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="worker processes (default: %(default)s)")
+    parser.add_argument("--benches", default=",".join(BENCHES),
+                        help="comma-separated benches to run (default: %(default)s)")
+    parser.add_argument("--seeds", type=int, default=1,
+                        help="shards per randomized batch test, one BATCH_SEED each (default: %(default)s)")
+    parser.add_argument("-k", dest="pattern", help="only run tests whose name matches this regex")
+    parser.add_argument("--sim", choices=("icarus", "verilator"), default="icarus",
+                        help="simulator backend (default: %(default)s)")
+    parser.add_argument("--waves", nargs="?", const="vcd", default="0", choices=("0", "vcd", "fst", "ring"),
+                        help="waveform capture, see waves.mk: --waves keeps VCD dumps, --waves ring writes "
+                             "the last clocks before each failure next to its log (default: off)")
+    parser.add_argument("--build-dir", default=os.path.join(TEST_DIR, "sim_build", "regress"),
+                        help="root of the per-job build directories (default: %(default)s)")
+    parser.add_argument("--output", default=os.path.join(TEST_DIR, "results.xml"),
+                        help="merged results file (default: %(default)s)")
+    args = parser.parse_args()
+
+    benches = args.benches.split(",")
+    for bench in benches:
+        if bench not in BENCHES:
+            parser.error(f"unknown bench {bench!r}, expected one of {', '.join(BENCHES)}")
+
+    jobs = plan(benches, args.seeds, args.pattern)
+    if not jobs:
+        parser.error("no tests selected")
+    build_root = os.path.abspath(args.build_dir)
+
+    suite = ET.Element("testsuite", name="all", package="all")
+    failures = 0
+    total = 0.0
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(run_job, job, build_root, args.waves, args.sim) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            name, cases, elapsed, log = future.result()
+            failed = any(case.find("failure") is not None for case in cases)
+            failures += failed
+            total += elapsed
+            suite.extend(cases)
+            status = "FAIL" if failed else "PASS"
+            print(f"[{done}/{len(jobs)}] {status} {name} ({elapsed:.1f}s)" + (f", log: {log}" if failed else ""),
+                  flush=True)
+
+    wall = time.monotonic() - start
+    suite[:] = sorted(suite, key=lambda case: (case.get("classname"), case.get("name")))
+    root = ET.Element("testsuites", name="results")
+    root.append(suite)
+    ET.indent(root)
+    ET.ElementTree(root).write(args.output, encoding="utf-8", xml_declaration=True)
+
+    print(f"{len(jobs) - failures} passed, {failures} failed, {wall:.1f}s wall, "
+          f"{total:.1f}s of simulation over {args.jobs} workers, results in {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
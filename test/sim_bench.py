@@ -0,0 +1,94 @@
+"""Simulator throughput benchmark: Icarus versus Verilator.
+
+Runs the same cocotb workloads under each backend, without waveforms, and
+reports simulated cycles per second and FPU operations per second:
+
+- adder / multiplier: the streaming batch tests, one operand pair per clock
+- top: test_fpu_add through the SPI harness, 4 operations, with the SPI
+  master BFM (spi_master_bfm.v)
+- top-bitbang: the same test with SPI_BITBANG=1, every SPI edge driven from
+  Python, to measure what the BFM saves
+
+Timings come from the results.xml of each run (wall time of the test itself,
+build time excluded). Use it to pick the backend for long random campaigns.
+
+usage:
+    python3 sim_bench.py
+    python3 sim_bench.py --sims verilator --batch 100000 --json bench.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from regress import run_job
+
+# (label, bench, test, clock period in ns, operations; None = the batch size, extra environment)
+WORKLOADS = [
+    ("adder", "adder", "test_fpu_add_model_batch", 10, None, {}),
+    ("multiplier", "multiplier", "test_fpu_mul_model_batch", 10, None, {}),
+    ("top", "top", "test_fpu_add", 100, 4, {}),
+    ("top-bitbang", "top", "test_fpu_add", 100, 4, {"SPI_BITBANG": "1"}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sims", default="icarus,verilator",
+                        help="comma-separated backends to compare (default: %(default)s)")
+    parser.add_argument("--batch", type=int, default=20000,
+                        help="operand pairs per streaming batch (default: %(default)s)")
+    parser.add_argument("--build-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "sim_build", "bench"),
+                        help="root of the build directories (default: %(default)s)")
+    parser.add_argument("--json", help="also write the measurements to this file")
+    args = parser.parse_args()
+
+    rows = []
+    for sim in args.sims.split(","):
+        for label, bench, test, period, ops, env in WORKLOADS:
+            ops = ops or args.batch
+            name, cases, _, log = run_job((bench, test, None), os.path.join(os.path.abspath(args.build_dir), label),
+                                          False, sim, {"BATCH_SIZE": str(args.batch), **env})
+            case = cases[0]
+            if case.find("failure") is not None:
+                print(f"{sim:>10} {label:>12}: FAILED, see {log}", file=sys.stderr)
+                continue
+            seconds = float(case.get("time"))
+            cycles = float(case.get("sim_time_ns")) / period
+            rows.append({
+                "sim": sim,
+                "bench": label,
+                "test": test,
+                "cycles": int(cycles),
+                "ops": ops,
+                "seconds": seconds,
+                "cycles_per_s": cycles / seconds,
+                "ops_per_s": ops / seconds,
+            })
+
+    print(f"{'sim':>10} {'bench':>12} {'cycles':>10} {'seconds':>8} {'cycles/s':>10} {'ops/s':>10}")
+    for row in rows:
+        print(f"{row['sim']:>10} {row['bench']:>12} {row['cycles']:>10} {row['seconds']:>8.2f} "
+              f"{row['cycles_per_s']:>10.0f} {row['ops_per_s']:>10.0f}")
+
+    for label, *_ in WORKLOADS:
+        rates = {row["sim"]: row["cycles_per_s"] for row in rows if row["bench"] == label}
+        if "icarus" in rates and "verilator" in rates:
+            print(f"{label}: verilator is {rates['verilator'] / rates['icarus']:.1f}x icarus")
+
+    for sim in args.sims.split(","):
+        times = {row["bench"]: row["seconds"] for row in rows if row["sim"] == sim}
+        if "top" in times and "top-bitbang" in times:
+            print(f"{sim}: SPI BFM is {times['top-bitbang'] / times['top']:.1f}x faster than bit-banging")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
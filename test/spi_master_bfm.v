@@ -0,0 +1,192 @@
+`default_nettype none
+`timescale 1ns / 1ps
+
+/* SPI master bus functional model for the TinyQV test harness.
+
+   Plays the same mode 0 frames as spi_write_cpha0 / spi_read_cpha0 in
+   tqv_reg.py, with the same timing (HALF_CYCLE clocks per SPI clock phase),
+   but from the simulator: the cocotb driver sets up a transaction, pulses
+   start and waits for done instead of awaiting every SPI edge from Python.
+
+   Frame, MSB first: rw (1 = write), width[1:0], wrap, step[3:0],
+   count[7:0], 10 don't care bits, address[5:0], then 32 data bits. Reads
+   wait for data_ready after the address, then sample MISO after each rising
+   SPI clock edge.
+
+   A burst (count > 0) sends count more data words under the same CS. word
+   pulses at the end of every data word: rdata holds the word just read, and
+   a write takes wdata for the next word half an SPI clock later. Reads wait
+   SETTLE clocks and data_ready again before each further word.
+*/
+module spi_master_bfm #(
+    parameter HALF_CYCLE = 2,
+    parameter SETTLE     = 4    // Clocks for the harness to decode a read address
+) (
+    input  wire        clk,
+    input  wire        rst_n,
+
+    input  wire        start,
+    input  wire        rw,
+    input  wire [1:0]  width,
+    input  wire [5:0]  address,
+    input  wire [7:0]  count,
+    input  wire [3:0]  step,
+    input  wire        wrap,
+    input  wire [31:0] wdata,
+    output reg  [31:0] rdata,
+    output reg         busy,
+    output reg         word,
+    output reg         done,
+
+    output reg         spi_cs_n,
+    output reg         spi_clk,
+    output reg         spi_mosi,
+    input  wire        spi_miso,
+    input  wire        data_ready
+);
+
+    localparam S_IDLE   = 3'd0;
+    localparam S_SELECT = 3'd1;  // CS high, then low with the first bit
+    localparam S_LOW    = 3'd2;  // SPI clock low, MOSI set up
+    localparam S_HIGH   = 3'd3;  // SPI clock high, bit sampled
+    localparam S_READY  = 3'd4;  // Read: wait for data_ready
+    localparam S_TAIL   = 3'd5;  // Final falling edge
+    localparam S_END    = 3'd6;  // CS high
+    localparam S_NEXT   = 3'd7;  // Burst write: next data word
+
+    reg [2:0]  state;
+    reg [7:0]  timer;
+    reg [5:0]  bit_idx;
+    reg [63:0] frame;
+    reg        reading;
+    reg [7:0]  words_left;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            state    <= S_IDLE;
+            timer    <= 0;
+            bit_idx  <= 0;
+            frame    <= 0;
+            reading  <= 0;
+            words_left <= 0;
+            rdata    <= 0;
+            busy     <= 0;
+            word     <= 0;
+            done     <= 0;
+            spi_cs_n <= 1;
+            spi_clk  <= 0;
+            spi_mosi <= 0;
+        end else begin
+            done <= 0;
+            word <= 0;
+            if (timer != 0) begin
+                timer <= timer - 1;
+            end else begin
+                case (state)
+                    S_IDLE: begin
+                        if (start) begin
+                            frame    <= {rw, width, wrap, step, count, 10'b0, address, rw ? wdata : 32'b0};
+                            reading  <= !rw;
+                            words_left <= count;
+                            rdata    <= 0;
+                            busy     <= 1;
+                            spi_cs_n <= 1;
+                            timer    <= HALF_CYCLE - 1;
+                            state    <= S_SELECT;
+                        end
+                    end
+
+                    S_SELECT: begin
+                        if (spi_cs_n) begin
+                            spi_cs_n <= 0;
+                            spi_mosi <= frame[63];
+                            bit_idx  <= 63;
+                            timer    <= HALF_CYCLE - 1;
+                        end else begin
+                            spi_clk  <= 1;
+                            timer    <= HALF_CYCLE - 1;
+                            state    <= S_HIGH;
+                        end
+                    end
+
+                    S_LOW: begin
+                        spi_clk  <= 1;
+                        timer    <= HALF_CYCLE - 1;
+                        state    <= S_HIGH;
+                    end
+
+                    S_HIGH: begin
+                        if (reading && bit_idx < 32) begin
+                            rdata[bit_idx[4:0]] <= spi_miso;
+                        end
+                        if (bit_idx == 0) begin
+                            word     <= 1;
+                            if (words_left == 0) begin
+                                spi_clk  <= 0;
+                                timer    <= HALF_CYCLE - 1;
+                                state    <= S_TAIL;
+                            end else if (reading) begin
+                                // The harness fetches the next register once the
+                                // last rising edge is through its synchronizer
+                                words_left <= words_left - 1;
+                                timer    <= SETTLE - 1;
+                                state    <= S_READY;
+                            end else begin
+                                words_left <= words_left - 1;
+                                timer    <= HALF_CYCLE - 1;
+                                state    <= S_NEXT;
+                            end
+                        end else if (reading && bit_idx == 32) begin
+                            // data_ready belongs to the new address only once
+                            // the harness has decoded it
+                            timer    <= SETTLE - 1;
+                            state    <= S_READY;
+                        end else begin
+                            spi_clk  <= 0;
+                            spi_mosi <= frame[bit_idx - 1];
+                            bit_idx  <= bit_idx - 1;
+                            timer    <= HALF_CYCLE - 1;
+                            state    <= S_LOW;
+                        end
+                    end
+
+                    S_READY: begin
+                        if (data_ready) begin
+                            spi_clk  <= 0;
+                            spi_mosi <= frame[31];
+                            bit_idx  <= 31;
+                            timer    <= HALF_CYCLE - 1;
+                            state    <= S_LOW;
+                        end
+                    end
+
+                    S_NEXT: begin
+                        frame[31:0] <= wdata;
+                        spi_clk  <= 0;
+                        spi_mosi <= wdata[31];
+                        bit_idx  <= 31;
+                        timer    <= HALF_CYCLE - 1;
+                        state    <= S_LOW;
+                    end
+
+                    S_TAIL: begin
+                        spi_cs_n <= 1;
+                        timer    <= HALF_CYCLE - 1;
+                        state    <= S_END;
+                    end
+
+                    S_END: begin
+                        busy     <= 0;
+                        done     <= 1;
+                        state    <= S_IDLE;
+                    end
+
+                    default: begin
+                        state    <= S_IDLE;
+                    end
+                endcase
+            end
+        end
+    end
+
+endmodule
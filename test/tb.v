@@ -4,14 +4,26 @@
 /* This testbench just instantiates the module and makes some convenient wires
    that can be driven / tested by the cocotb test.py.
 */
-module tb ();
+module tb #(
+    // Set from test/Makefile's SIMD, DIV_UNIT, SQRT_UNIT and CVT_UNIT
+    parameter SIMD      = 0,
+    parameter DIV_UNIT  = 1,
+    parameter SQRT_UNIT = 1,
+    parameter CVT_UNIT  = 1
+) ();
 
   // Dump the signals to a VCD file. You can view it with gtkwave or surfer.
+  // +fst writes tb.fst instead (with vvp's -fst), +nowaves skips the dump.
+`ifndef NO_WAVES
   initial begin
-    $dumpfile("tb.vcd");
-    $dumpvars(0, tb);
+    if (!$test$plusargs("nowaves")) begin
+      if ($test$plusargs("fst")) $dumpfile("tb.fst");
+      else $dumpfile("tb.vcd");
+      $dumpvars(0, tb);
+    end
     #1;
   end
+`endif
 
   // Wire up the inputs and outputs:
   reg clk;
@@ -22,12 +34,65 @@ module tb ();
   wire [7:0] uo_out;
   wire [7:0] uio_out;
   wire [7:0] uio_oe;
+  wire user_interrupt = uio_out[0];
+
+  // SPI master BFM: tqv.py drives whole SPI transactions through it when
+  // spi_bfm_en is set, otherwise uio_in is bit-banged from Python
+  reg spi_bfm_en = 0;
+  reg spi_bfm_start = 0;
+  reg spi_bfm_rw = 0;
+  reg [1:0] spi_bfm_width = 0;
+  reg [5:0] spi_bfm_address = 0;
+  reg [7:0] spi_bfm_count = 0;
+  reg [3:0] spi_bfm_step = 0;
+  reg spi_bfm_wrap = 0;
+  reg [31:0] spi_bfm_wdata = 0;
+  wire [31:0] spi_bfm_rdata;
+  wire spi_bfm_busy;
+  wire spi_bfm_word;
+  wire spi_bfm_done;
+  wire spi_bfm_cs_n;
+  wire spi_bfm_clk;
+  wire spi_bfm_mosi;
+
+  spi_master_bfm spi_bfm (
+      .clk       (clk),
+      .rst_n     (rst_n),
+      .start     (spi_bfm_start),
+      .rw        (spi_bfm_rw),
+      .width     (spi_bfm_width),
+      .address   (spi_bfm_address),
+      .count     (spi_bfm_count),
+      .step      (spi_bfm_step),
+      .wrap      (spi_bfm_wrap),
+      .wdata     (spi_bfm_wdata),
+      .rdata     (spi_bfm_rdata),
+      .busy      (spi_bfm_busy),
+      .word      (spi_bfm_word),
+      .done      (spi_bfm_done),
+      .spi_cs_n  (spi_bfm_cs_n),
+      .spi_clk   (spi_bfm_clk),
+      .spi_mosi  (spi_bfm_mosi),
+      .spi_miso  (uio_out[3]),
+      .data_ready(uio_out[1])
+  );
+
+  wire [7:0] harness_uio_in = spi_bfm_en ? {uio_in[7], spi_bfm_mosi, spi_bfm_clk, spi_bfm_cs_n, uio_in[3:0]} : uio_in;
 `ifdef GL_TEST
   wire VPWR = 1'b1;
   wire VGND = 1'b0;
 `endif
 
+`ifdef GL_TEST
   tt_um_tqv_peripheral_harness test_harness (
+`else
+  tt_um_tqv_peripheral_harness #(
+      .SIMD(SIMD),
+      .DIV_UNIT(DIV_UNIT),
+      .SQRT_UNIT(SQRT_UNIT),
+      .CVT_UNIT(CVT_UNIT)
+  ) test_harness (
+`endif
 
       // Include power ports for the Gate Level test:
 `ifdef GL_TEST
@@ -37,7 +102,7 @@ module tb ();
 
       .ui_in  (ui_in),    // Dedicated inputs
       .uo_out (uo_out),   // Dedicated outputs
-      .uio_in (uio_in),   // IOs: Input path
+      .uio_in (harness_uio_in),   // IOs: Input path
       .uio_out(uio_out),  // IOs: Output path
       .uio_oe (uio_oe),   // IOs: Enable path (active high: 0=input, 1=output)
       .ena    (ena),      // enable - goes high when design is selected
@@ -45,4 +110,34 @@ module tb ();
       .rst_n  (rst_n)     // not reset
   );
 
+`ifdef WAVE_RING
+  // WAVES=ring: the last clocks of the pins, the SPI master and the bus of
+  // the peripheral, see wave_ring.v
+  wave_ring #(.WIDTH($bits(rst_n)))           ring_rst_n           (.clk(clk), .probe(rst_n));
+  wave_ring #(.WIDTH($bits(ui_in)))           ring_ui_in           (.clk(clk), .probe(ui_in));
+  wave_ring #(.WIDTH($bits(harness_uio_in)))  ring_uio_in          (.clk(clk), .probe(harness_uio_in));
+  wave_ring #(.WIDTH($bits(uo_out)))          ring_uo_out          (.clk(clk), .probe(uo_out));
+  wave_ring #(.WIDTH($bits(uio_out)))         ring_uio_out         (.clk(clk), .probe(uio_out));
+  wave_ring #(.WIDTH($bits(spi_bfm_start)))   ring_spi_bfm_start   (.clk(clk), .probe(spi_bfm_start));
+  wave_ring #(.WIDTH($bits(spi_bfm_rw)))      ring_spi_bfm_rw      (.clk(clk), .probe(spi_bfm_rw));
+  wave_ring #(.WIDTH($bits(spi_bfm_address))) ring_spi_bfm_address (.clk(clk), .probe(spi_bfm_address));
+  wave_ring #(.WIDTH($bits(spi_bfm_wdata)))   ring_spi_bfm_wdata   (.clk(clk), .probe(spi_bfm_wdata));
+  wave_ring #(.WIDTH($bits(spi_bfm_rdata)))   ring_spi_bfm_rdata   (.clk(clk), .probe(spi_bfm_rdata));
+  wave_ring #(.WIDTH($bits(spi_bfm_done)))    ring_spi_bfm_done    (.clk(clk), .probe(spi_bfm_done));
+`ifndef GL_TEST
+`define FPU test_harness.user_peripheral
+  wave_ring #(.WIDTH(6))  ring_address      (.clk(clk), .probe(`FPU.address));
+  wave_ring #(.WIDTH(32)) ring_data_in      (.clk(clk), .probe(`FPU.data_in));
+  wave_ring #(.WIDTH(2))  ring_data_write_n (.clk(clk), .probe(`FPU.data_write_n));
+  wave_ring #(.WIDTH(2))  ring_data_read_n  (.clk(clk), .probe(`FPU.data_read_n));
+  wave_ring #(.WIDTH(32)) ring_data_out     (.clk(clk), .probe(`FPU.data_out));
+  wave_ring #(.WIDTH(1))  ring_data_ready   (.clk(clk), .probe(`FPU.data_ready));
+  wave_ring #(.WIDTH(3))  ring_bus_state    (.clk(clk), .probe(`FPU.bus_state));
+  wave_ring #(.WIDTH(3))  ring_state        (.clk(clk), .probe(`FPU.state));
+  wave_ring #(.WIDTH(3))  ring_cmd_count    (.clk(clk), .probe(`FPU.cmd_count));
+  wave_ring #(.WIDTH(3))  ring_res_count    (.clk(clk), .probe(`FPU.res_count));
+`undef FPU
+`endif
+`endif
+
 endmodule
@@ -1,13 +1,28 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, RisingEdge, Timer
+from cocotb.utils import get_sim_time
 import struct
-import math
+import time
 import numpy as np
 from tqv import TinyQV
+from tqv_model import TinyQVModel
+from fp16_model import fp16_add, fp16_sub, fp16_mul, fp16_fma, fp16_div, fp16_recip, fp16_sqrt, fp16_rsqrt
+from fp16_model import int16_to_fp16, bf16_to_fp16, RNE, RTZ
+from fp16_model import fp16_class
 
 PERIPHERAL_NUM = 0
 
+# CVT conversions, written to operand A together with the rounding mode << 4
+CVT_I2F, CVT_U2F, CVT_F2I, CVT_F2BF, CVT_BF2F, CVT_F2F32 = range(6)
+
+# CMP functions, written to 0x2E
+FMIN, FMAX, FEQ, FLT, FLE, FABS, FNEG, FCLASS = range(8)
+
+# Read-only bits of the configuration register (0x38) for the optional units
+SIMD_BUILT, DIV_BUILT, SQRT_BUILT, CVT_BUILT = (1 << bit for bit in range(16, 20))
+FP16_NAN = 0x7E00
+
 def float_to_f16_hex(f):
     """Convert Python float to a 32-bit word with the lower 16 bits as IEEE-754 half-precision float."""
     f16 = np.float16(f)
@@ -25,6 +40,25 @@ async def wait_until_not_busy(tqv, timeout=100):
         await ClockCycles(tqv.dut.clk, 1)
     raise TimeoutError("FPU remained busy after timeout")
 
+async def read_result(tqv):
+    """Read the result once every posted operation has completed.
+
+    0x20 holds off data_ready while the FPU works, so no busy poll is needed."""
+    return await tqv.read_word_reg(0x20)
+
+async def check_unbuilt(tqv, name, reg, param):
+    """Packed write to reg of an operation whose unit is not built: it returns NaN at once."""
+    await tqv.write_operands(reg, float_to_f16_hex(1.0), float_to_f16_hex(4.0))
+    result = await read_result(tqv)
+    assert result == FP16_NAN, f"{name} FAIL: {result:#06x} without the unit, expected NaN"
+    tqv.dut._log.info(f"{name}: not built (make -B {param}=1 to test it)")
+
+async def wait_for_result(tqv, timeout=100):
+    """Wait for the completion interrupt, acknowledge it and return the result register."""
+    await tqv.wait_for_interrupt(timeout)
+    await tqv.write_word_reg(0x35, 0x1)  # clear DONE
+    return await tqv.read_word_reg(0x0C)
+
 @cocotb.test()
 async def test_fpu_add(dut):
     clock = Clock(dut.clk, 100, units="ns")
@@ -42,15 +76,12 @@ async def test_fpu_add(dut):
     for a, b in tests:
         await tqv.write_word_reg(0x00, float_to_f16_hex(a))  # operand_a
         await tqv.write_word_reg(0x01, float_to_f16_hex(b))  # operand_b
-
-        await wait_until_not_busy(tqv)
-
-        result = await tqv.read_word_reg(0x0C)
+        result = await read_result(tqv)
         actual = f16_hex_to_float(result)
-        expected = float(np.float16(a) + np.float16(b))
+        expected = int(fp16_add(float_to_f16_hex(a), float_to_f16_hex(b)))
 
-        dut._log.info(f"ADD: {a} + {b} = {actual}, expected {expected}")
-        assert abs(actual - expected) < 1e-2, f"ADD FAIL: {a} + {b} = {actual}, expected {expected}"
+        dut._log.info(f"ADD: {a} + {b} = {actual}, expected {f16_hex_to_float(expected)}")
+        assert result == expected, f"ADD FAIL: {a} + {b} = {result:#06x}, expected {expected:#06x}"
 
 @cocotb.test()
 async def test_fpu_sub(dut):
@@ -60,22 +91,20 @@ async def test_fpu_sub(dut):
     await tqv.reset()
 
     tests = [
-        (5.0, 2.0, 3.0),
-        (1.0, 2.0, -1.0),
-        (-2.0, -2.0, 0.0),
+        (5.0, 2.0),
+        (1.0, 2.0),
+        (-2.0, -2.0),
     ]
 
-    for a, b, expected in tests:
+    for a, b in tests:
         await tqv.write_word_reg(0x04, float_to_f16_hex(a))
         await tqv.write_word_reg(0x05, float_to_f16_hex(b))
-
-        await wait_until_not_busy(tqv)
-
-        result = await tqv.read_word_reg(0x0C)
+        result = await read_result(tqv)
         actual = f16_hex_to_float(result)
+        expected = int(fp16_sub(float_to_f16_hex(a), float_to_f16_hex(b)))
 
-        dut._log.info(f"SUB: {a} - {b} = {actual}, expected {expected}")
-        assert abs(actual - expected) < 1e-2, f"SUB FAIL: {a} - {b} = {actual}, expected {expected}"
+        dut._log.info(f"SUB: {a} - {b} = {actual}, expected {f16_hex_to_float(expected)}")
+        assert result == expected, f"SUB FAIL: {a} - {b} = {result:#06x}, expected {expected:#06x}"
 
 @cocotb.test()
 async def test_fpu_mul(dut):
@@ -85,23 +114,218 @@ async def test_fpu_mul(dut):
     await tqv.reset()
 
     tests = [
-        (2.0, 3.0, 6.0),
-        (-1.5, 2.0, -3.0),
-        (0.0, 100.0, 0.0),
-        (5.5, 0.5, 2.75)
+        (2.0, 3.0),
+        (-1.5, 2.0),
+        (0.0, 100.0),
+        (5.5, 0.5)
     ]
 
-    for a, b, expected in tests:
+    for a, b in tests:
         await tqv.write_word_reg(0x08, float_to_f16_hex(a))
         await tqv.write_word_reg(0x09, float_to_f16_hex(b))
+        result = await read_result(tqv)
+        actual = f16_hex_to_float(result)
+        expected = int(fp16_mul(float_to_f16_hex(a), float_to_f16_hex(b)))
+
+        dut._log.info(f"MUL: {a} * {b} = {actual}, expected {f16_hex_to_float(expected)}")
+        assert result == expected, f"MUL FAIL: {a} * {b} = {result:#06x}, expected {expected:#06x}"
+
+@cocotb.test()
+async def test_fpu_div(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    if not await tqv.read_word_reg(0x38) & DIV_BUILT:
+        await check_unbuilt(tqv, "DIV", 0x1B, "DIV_UNIT")
+        return
 
-        await wait_until_not_busy(tqv)
+    tests = [
+        (6.0, 3.0),
+        (-1.0, 4.0),
+        (1.0, 3.0),
+        (1.0, 0.0),
+    ]
 
-        result = await tqv.read_word_reg(0x0C)
+    for a, b in tests:
+        await tqv.write_word_reg(0x18, float_to_f16_hex(a))
+        await tqv.write_word_reg(0x19, float_to_f16_hex(b))
+        result = await read_result(tqv)
         actual = f16_hex_to_float(result)
+        expected = int(fp16_div(float_to_f16_hex(a), float_to_f16_hex(b)))
+
+        dut._log.info(f"DIV: {a} / {b} = {actual}, expected {f16_hex_to_float(expected)}")
+        assert result == expected, f"DIV FAIL: {a} / {b} = {result:#06x}, expected {expected:#06x}"
+
+    # Packed DIV, then the reciprocal estimate, which only takes B
+    await tqv.write_operands(0x1B, float_to_f16_hex(10.0), float_to_f16_hex(4.0))
+    actual = f16_hex_to_float(await read_result(tqv))
+    assert actual == 2.5, f"DIV FAIL: packed 10.0 / 4.0 = {actual}"
+
+    for b in [3.0, -0.1, 1000.0]:
+        await tqv.write_word_reg(0x1D, float_to_f16_hex(b))
+        result = await read_result(tqv)
+        model = int(fp16_recip(float_to_f16_hex(b)))
+        dut._log.info(f"RECIP: 1 / {b} ~ {f16_hex_to_float(result)}")
+        assert result == model, f"RECIP FAIL: 1 / {b} = {result:#06x}, model expected {model:#06x}"
+
+@cocotb.test()
+async def test_fpu_sqrt(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    config = await tqv.read_word_reg(0x38)
+    if not config & SQRT_BUILT:
+        await check_unbuilt(tqv, "SQRT", 0x23, "SQRT_UNIT")
+        return
+
+    # SQRT (0x21) and RSQRT (0x25) issue on their B write alone, RSQRT also needs the divider
+    for b in [4.0, 2.0, 0.01, 1000.0, -1.0, 0.0]:
+        b_hex = float_to_f16_hex(b)
+        await tqv.write_word_reg(0x21, b_hex)
+        result = await read_result(tqv)
+        model = int(fp16_sqrt(b_hex))
+        dut._log.info(f"SQRT: sqrt({b}) = {f16_hex_to_float(result)}")
+        assert result == model, f"SQRT FAIL: sqrt({b}) = {result:#06x}, model expected {model:#06x}"
+
+        await tqv.write_word_reg(0x25, b_hex)
+        result = await read_result(tqv)
+        model = int(fp16_rsqrt(b_hex)) if config & DIV_BUILT else FP16_NAN
+        dut._log.info(f"RSQRT: 1 / sqrt({b}) = {f16_hex_to_float(result)}")
+        assert result == model, f"RSQRT FAIL: 1 / sqrt({b}) = {result:#06x}, model expected {model:#06x}"
+
+    # Packed form: B in [31:16]
+    await tqv.write_operands(0x23, 0, float_to_f16_hex(9.0))
+    actual = f16_hex_to_float(await read_result(tqv))
+    assert actual == 3.0, f"SQRT FAIL: packed sqrt(9.0) = {actual}"
+
+@cocotb.test()
+async def test_fpu_convert(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    if not await tqv.read_word_reg(0x38) & CVT_BUILT:
+        await check_unbuilt(tqv, "CVT", 0x2B, "CVT_UNIT")
+        return
+
+    # The conversion is written to A once (0x28), then every B write to 0x29
+    # converts one value: int16 samples to fp16
+    samples = [0, 1, -1, 1000, -32768, 32767, 12345]
+    await tqv.write_word_reg(0x28, CVT_I2F | (RNE << 4))
+    for sample in samples:
+        await tqv.write_word_reg(0x29, sample & 0xFFFF)
+        result = await read_result(tqv)
+        model = int(int16_to_fp16(sample & 0xFFFF))
+        dut._log.info(f"CVT: int16 {sample} -> {f16_hex_to_float(result)}")
+        assert result == model, f"CVT FAIL: int16 {sample} = {result:#06x}, model expected {model:#06x}"
+
+    # Back to int16 with truncation, sign extended to 32 bits
+    await tqv.write_word_reg(0x28, CVT_F2I | (RTZ << 4))
+    for value, expected in [(2.75, 2), (-2.75, -2), (1e5, 32767), (-1e5, -32768)]:
+        await tqv.write_word_reg(0x29, float_to_f16_hex(value))
+        result = await read_result(tqv)
+        assert result == expected & 0xFFFFFFFF, f"CVT FAIL: int16({value}) = {result:#010x}, expected {expected}"
+
+    # Packed: the conversion in [15:0], the value in [31:16]
+    await tqv.write_operands(0x2B, CVT_F2BF, float_to_f16_hex(1.0))
+    result = await read_result(tqv)
+    assert result == 0x3F80, f"CVT FAIL: bf16(1.0) = {result:#06x}"
+    await tqv.write_operands(0x2B, CVT_BF2F, 0x4049)
+    result = await read_result(tqv)
+    assert result == int(bf16_to_fp16(0x4049)), f"CVT FAIL: fp16(bf16 0x4049) = {result:#06x}"
+
+    # fp16 -> fp32 fills the whole result register
+    await tqv.write_operands(0x2B, CVT_F2F32, float_to_f16_hex(-1.5))
+    result = await read_result(tqv)
+    assert result == 0xBFC00000, f"CVT FAIL: fp32(-1.5) = {result:#010x}"
 
-        dut._log.info(f"MUL: {a} * {b} = {actual}, expected {expected}")
-        assert abs(actual - expected) < 1e-2, f"MUL FAIL: {a} * {b} = {actual}, expected {expected}"
+@cocotb.test()
+async def test_fpu_compare(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    # ReLU: max(x, 0) with one packed write per element
+    await tqv.write_word_reg(0x2E, FMAX)
+    for x in [-2.5, 0.0, 3.75, -0.0, float('-inf')]:
+        await tqv.write_operands(0x2F, float_to_f16_hex(x), float_to_f16_hex(0.0))
+        actual = f16_hex_to_float(await read_result(tqv))
+        assert actual == max(x, 0.0), f"CMP FAIL: relu({x}) = {actual}"
+
+    # Clamp to [-1, 1]
+    for x, expected in [(-4.0, -1.0), (0.5, 0.5), (7.0, 1.0)]:
+        await tqv.write_word_reg(0x2E, FMIN)
+        await tqv.write_operands(0x2F, float_to_f16_hex(x), float_to_f16_hex(1.0))
+        clamped = await read_result(tqv)
+        await tqv.write_word_reg(0x2E, FMAX)
+        await tqv.write_operands(0x2F, clamped, float_to_f16_hex(-1.0))
+        actual = f16_hex_to_float(await read_result(tqv))
+        assert actual == expected, f"CMP FAIL: clamp({x}) = {actual}"
+
+    # Comparisons return 1 or 0, NaN compares false
+    for func, a, b, expected in [(FLT, 1.0, 2.0, 1), (FLE, 2.0, 2.0, 1), (FEQ, -0.0, 0.0, 1),
+                                 (FLT, float('nan'), 2.0, 0)]:
+        await tqv.write_word_reg(0x2E, func)
+        await tqv.write_word_reg(0x2C, float_to_f16_hex(a))
+        await tqv.write_word_reg(0x2D, float_to_f16_hex(b))
+        result = await read_result(tqv)
+        assert result == expected, f"CMP FAIL: func {func} of {a}, {b} = {result}"
+
+    # Unary functions only need B
+    await tqv.write_word_reg(0x2E, FABS)
+    await tqv.write_word_reg(0x2D, float_to_f16_hex(-6.0))
+    assert f16_hex_to_float(await read_result(tqv)) == 6.0, "CMP FAIL: abs(-6.0)"
+    await tqv.write_word_reg(0x2E, FNEG)
+    await tqv.write_word_reg(0x2D, float_to_f16_hex(6.0))
+    assert f16_hex_to_float(await read_result(tqv)) == -6.0, "CMP FAIL: neg(6.0)"
+    await tqv.write_word_reg(0x2E, FCLASS)
+    await tqv.write_word_reg(0x2D, 0x0001)
+    result = await read_result(tqv)
+    assert result == int(fp16_class(0x0001)), f"CMP FAIL: class(0x0001) = {result:#06x}"
+
+    # The C slot of CMP leaves the FMA addend alone
+    await tqv.write_word_reg(0x0E, float_to_f16_hex(0.5))
+    await tqv.write_word_reg(0x2E, FMIN)
+    assert f16_hex_to_float(await tqv.read_word_reg(0x14)) == 0.5, "CMP FAIL: 0x2E overwrote operand C"
+
+@cocotb.test()
+async def test_fpu_perf_counters(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    await tqv.clear_perf_counters()
+    for a, b in [(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)]:
+        await tqv.write_word_reg(0x00, float_to_f16_hex(a))
+        await tqv.write_word_reg(0x01, float_to_f16_hex(b))
+        await read_result(tqv)
+    await tqv.write_operands(0x0B, float_to_f16_hex(2.0), float_to_f16_hex(3.0))
+    await tqv.write_operands(0x0B, float_to_f16_hex(4.0), float_to_f16_hex(5.0))
+    await read_result(tqv)
+    await tqv.write_word_reg(0x2E, FMAX)
+    await tqv.write_operands(0x2F, float_to_f16_hex(-1.0), 0)
+    await read_result(tqv)
+
+    counters = await tqv.read_perf_counters()
+    dut._log.info(f"PERF: {counters}")
+    assert counters["add"] == 3 and counters["mul"] == 2 and counters["cmp"] == 1, f"PERF FAIL: {counters}"
+    assert counters["ops"] == 6, f"PERF FAIL: {counters['ops']} operations counted, expected 6"
+    # Every B waits for a whole SPI write after its A, the packed writes do not
+    assert counters["reading"] > 3 * 32, f"PERF FAIL: only {counters['reading']} cycles waiting for B"
+    assert 0 < counters["busy"] < counters["reading"] < counters["cycles"], f"PERF FAIL: {counters}"
+
+    # Clearing restarts every counter
+    await tqv.clear_perf_counters()
+    counters = await tqv.read_perf_counters()
+    assert counters["ops"] == 0 and counters["add"] == 0 and counters["reading"] == 0, f"PERF FAIL: {counters}"
+    assert counters["cycles"] < 1000, f"PERF FAIL: {counters['cycles']} cycles right after clearing"
 
 @cocotb.test()
 async def test_fpu_edge_cases(dut):
@@ -111,32 +335,461 @@ async def test_fpu_edge_cases(dut):
     await tqv.reset()
 
     edge_tests = [
-        (float('inf'), 1.0, float('inf'), 0x01, "INF + 1.0"),
-        (float('-inf'), 1.0, float('-inf'), 0x01, "-INF + 1.0"),
-        (float('inf'), float('-inf'), float('nan'), 0x01, "INF + -INF = NaN"),
-        (float('nan'), 1.0, float('nan'), 0x01, "NaN + 1.0"),
-        (0.0, -0.0, 0.0, 0x01, "+0.0 + -0.0"),
-        #(65504.0, 65504.0, float('inf'), 0x01, "Overflow to INF"),  # TODO fix this test
-        (1e-08, 1e-08, 2e-08, 0x01, "subnormal add"),
-        (1e-08, -1e-08, 0.0, 0x01, "canceling subnormals"),
+        (float('inf'), 1.0, 0x01, "INF + 1.0"),
+        (float('-inf'), 1.0, 0x01, "-INF + 1.0"),
+        (float('inf'), float('-inf'), 0x01, "INF + -INF = NaN"),
+        (float('nan'), 1.0, 0x01, "NaN + 1.0"),
+        (0.0, -0.0, 0x01, "+0.0 + -0.0"),
+        #(65504.0, 65504.0, 0x01, "Overflow to INF"),  # TODO fix this test
+        (1e-08, 1e-08, 0x01, "subnormal add"),
+        (1e-08, -1e-08, 0x01, "canceling subnormals"),
     ]
 
-    for a, b, expected, control, desc in edge_tests:
+    for a, b, control, desc in edge_tests:
         await tqv.write_word_reg(0x00, float_to_f16_hex(a))
         await tqv.write_word_reg(0x01, float_to_f16_hex(b))
+        result = await read_result(tqv)
+        expected = int(fp16_add(float_to_f16_hex(a), float_to_f16_hex(b)))
 
-        await wait_until_not_busy(tqv)
+        dut._log.info(f"EDGE: {desc} -> got {result:#06x}, expected {expected:#06x}")
+        assert result == expected, f"EDGE FAIL: {desc} produced {result:#06x}, expected {expected:#06x}"
 
-        result = await tqv.read_word_reg(0x0C)
+@cocotb.test()
+async def test_fpu_fma(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    tests = [
+        (2.0, 3.0, 1.0),
+        (1.5, -2.0, 0.5),
+        (3.0, 3.0, -9.0),
+        (0.1, 0.1, 0.01),
+        (-4.0, 0.25, 2.0)
+    ]
+
+    for a, b, c in tests:
+        await tqv.write_word_reg(0x0E, float_to_f16_hex(c))  # operand_c
+        await tqv.write_word_reg(0x0C, float_to_f16_hex(a))  # operand_a
+        await tqv.write_word_reg(0x0D, float_to_f16_hex(b))  # operand_b
+        result = await read_result(tqv)
         actual = f16_hex_to_float(result)
+        expected = int(fp16_fma(float_to_f16_hex(a), float_to_f16_hex(b), float_to_f16_hex(c)))
+
+        dut._log.info(f"FMA: {a} * {b} + {c} = {actual}, expected {f16_hex_to_float(expected)}")
+        assert result == expected, f"FMA FAIL: {a} * {b} + {c} = {result:#06x}, expected {expected:#06x}"
+
+    # Single rounding: (1 + 2^-10)^2 - (1 + 2^-9) is 2^-20, which a separate
+    # MUL (rounding the product to 1 + 2^-9) followed by an ADD would lose
+    a = 1.0 + 2.0 ** -10
+    c = -(1.0 + 2.0 ** -9)
+    await tqv.write_word_reg(0x0E, float_to_f16_hex(c))
+    await tqv.write_word_reg(0x0C, float_to_f16_hex(a))
+    await tqv.write_word_reg(0x0D, float_to_f16_hex(a))
+    actual = f16_hex_to_float(await read_result(tqv))
+    dut._log.info(f"FMA: {a} * {a} + {c} = {actual}, expected {2.0 ** -20}")
+    assert actual == 2.0 ** -20, f"FMA FAIL: {a} * {a} + {c} = {actual}, expected {2.0 ** -20}"
+
+@cocotb.test()
+async def test_fpu_accumulate(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    # ACC += B: one write per element, a single SPI frame is longer than the
+    # 8 clocks the accumulation takes, so no busy polling is needed
+    values = [1.5, 2.25, -0.5, 3.0, 0.125]
+
+    await tqv.write_word_reg(0x30, float_to_f16_hex(0.0))  # clear accumulator
+    for v in values:
+        await tqv.write_word_reg(0x11, float_to_f16_hex(v))
+
+    await wait_until_not_busy(tqv)
+
+    actual = await tqv.read_word_reg(0x30)
+    expected = 0
+    for v in values:
+        expected = int(fp16_add(expected, float_to_f16_hex(v)))
+
+    dut._log.info(f"ACC: sum({values}) = {f16_hex_to_float(actual)}, expected {f16_hex_to_float(expected)}")
+    assert actual == expected, f"ACC FAIL: sum({values}) = {actual:#06x}, expected {expected:#06x}"
+
+    # ACC += A * B: dot product starting from a preloaded accumulator
+    pairs = [(1.5, 2.0), (0.5, -4.0), (3.0, 0.25), (-1.25, -2.0)]
+
+    await tqv.write_word_reg(0x30, float_to_f16_hex(1.0))
+    for a, b in pairs:
+        await tqv.write_word_reg(0x14, float_to_f16_hex(a))
+        await tqv.write_word_reg(0x15, float_to_f16_hex(b))
+
+    await wait_until_not_busy(tqv)
+
+    actual = await tqv.read_word_reg(0x30)
+    expected = float_to_f16_hex(1.0)
+    for a, b in pairs:
+        expected = int(fp16_fma(float_to_f16_hex(a), float_to_f16_hex(b), expected))
+
+    dut._log.info(f"MAC: 1.0 + dot({pairs}) = {f16_hex_to_float(actual)}, expected {f16_hex_to_float(expected)}")
+    assert actual == expected, f"MAC FAIL: 1.0 + dot({pairs}) = {actual:#06x}, expected {expected:#06x}"
+
+    # The final value is also the last result
+    result = await tqv.read_word_reg(0x0C)
+    assert result == actual, f"MAC FAIL: result register {result:#06x} differs from accumulator {actual:#06x}"
+
+@cocotb.test()
+async def test_fpu_queue(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    # Post a batch of operations without polling busy in between
+    ops = [
+        (0x00, 1.5, 2.25, fp16_add),
+        (0x04, 5.0, 2.0, fp16_sub),
+        (0x08, -1.5, 2.0, fp16_mul),
+        (0x00, 100.0, 0.01, fp16_add),
+    ]
+
+    for base, a, b, _ in ops:
+        await tqv.write_word_reg(base, float_to_f16_hex(a))
+        await tqv.write_word_reg(base + 1, float_to_f16_hex(b))
+
+    await wait_until_not_busy(tqv)
+
+    status = await tqv.read_word_reg(0x18)
+    dut._log.info(f"QUEUE: status {status:#x}")
+    assert status & 0xFF == 0, f"QUEUE FAIL: {status & 0xFF} commands still queued"
+    assert (status >> 8) & 0xFF == len(ops), f"QUEUE FAIL: {(status >> 8) & 0xFF} results queued, expected {len(ops)}"
+    assert (status >> 16) & 0x3 == 0, "QUEUE FAIL: overflow flagged"
+
+    # Drain the results in order
+    for base, a, b, op in ops:
+        actual = await tqv.read_word_reg(0x1C)
+        expected = int(op(float_to_f16_hex(a), float_to_f16_hex(b)))
+        dut._log.info(f"QUEUE: {a} ? {b} = {f16_hex_to_float(actual)}, expected {f16_hex_to_float(expected)}")
+        assert actual == expected, f"QUEUE FAIL: {a} ? {b} = {actual:#06x}, expected {expected:#06x}"
+
+    status = await tqv.read_word_reg(0x18)
+    assert (status >> 8) & 0xFF == 0, f"QUEUE FAIL: {(status >> 8) & 0xFF} results left after draining"
+
+@cocotb.test()
+async def test_fpu_interrupt(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    assert not await tqv.is_interrupt_asserted(), "IRQ FAIL: interrupt asserted after reset"
+
+    # Completion interrupt: wait for the edge instead of polling busy
+    await tqv.write_word_reg(0x34, 0x1)
+    tests = [
+        (0x00, 1.5, 2.25, fp16_add),
+        (0x08, -1.5, 2.0, fp16_mul),
+        (0x04, 5.0, 2.0, fp16_sub),
+    ]
+
+    for base, a, b, op in tests:
+        await tqv.write_word_reg(base, float_to_f16_hex(a))
+        await tqv.write_word_reg(base + 1, float_to_f16_hex(b))
+
+        actual = await wait_for_result(tqv)
+        expected = int(op(float_to_f16_hex(a), float_to_f16_hex(b)))
+
+        dut._log.info(f"IRQ: {a} ? {b} = {f16_hex_to_float(actual)}, expected {f16_hex_to_float(expected)}")
+        assert actual == expected, f"IRQ FAIL: {a} ? {b} = {actual:#06x}, expected {expected:#06x}"
+        assert not await tqv.is_interrupt_asserted(), "IRQ FAIL: interrupt still asserted after clearing"
+
+    # Result queue threshold: interrupt once three results are waiting
+    await tqv.write_word_reg(0x3C, 0x2)
+    await tqv.write_word_reg(0x34, (3 << 8) | 0x2)
+
+    for i in range(3):
+        assert not await tqv.is_interrupt_asserted(), f"IRQ FAIL: interrupt asserted with {i} results queued"
+        await tqv.write_word_reg(0x00, float_to_f16_hex(float(i)))
+        await tqv.write_word_reg(0x01, float_to_f16_hex(1.0))
+
+    await tqv.wait_for_interrupt(100)
+    status = await tqv.read_word_reg(0x18)
+    assert (status >> 8) & 0xFF == 3, f"IRQ FAIL: {(status >> 8) & 0xFF} results queued, expected 3"
+
+    # Draining below the threshold drops the interrupt
+    for i in range(3):
+        actual = f16_hex_to_float(await tqv.read_word_reg(0x1C))
+        assert actual == i + 1.0, f"IRQ FAIL: queued result {actual}, expected {i + 1.0}"
+    assert not await tqv.is_interrupt_asserted(), "IRQ FAIL: interrupt asserted after draining the results"
+
+    # Command queue space: asserted while no more than 0 commands are queued
+    await tqv.write_word_reg(0x34, 0x4)
+    assert await tqv.is_interrupt_asserted(), "IRQ FAIL: command space interrupt not asserted"
+    pending = await tqv.read_word_reg(0x35)
+    assert pending & 0x4, f"IRQ FAIL: pending {pending:#x} does not flag command space"
+
+@cocotb.test()
+async def test_fpu_burst(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    pairs = [(1.5, 2.25), (-1.5, 2.0), (0.1, 0.1), (5.5, 0.5)]
+    words = [float_to_f16_hex(v) for pair in pairs for v in pair]
+
+    # Load A and B of one ADD in a single transaction
+    await tqv.write_burst(0x00, words[:2])
+    result = await read_result(tqv)
+    expected = int(fp16_add(words[0], words[1]))
+    assert result == expected, f"BURST FAIL: ADD {result:#06x}, expected {expected:#06x}"
+
+    # A, B and the operation read back through 0x00, 0x04 and 0x08
+    regs = await tqv.read_burst(0x00, 3, step=4)
+    assert regs == [words[0], words[1], 0], f"BURST FAIL: registers read back as {[hex(r) for r in regs]}"
+
+    # Operand pairs one frame each, then every pair of a batch in one frame
+    # (the address wraps between 0x08 and 0x09)
+    await tqv.write_word_reg(0x3C, 0x7)
+    start = get_sim_time("ns")
+    for a, b in zip(words[0::2], words[1::2]):
+        await tqv.write_word_reg(0x08, a)
+        await tqv.write_word_reg(0x09, b)
+    single_cycles = int(get_sim_time("ns") - start) // 100
+
+    await wait_until_not_busy(tqv)
+    await tqv.write_word_reg(0x3C, 0x7)
+    start = get_sim_time("ns")
+    await tqv.write_burst(0x08, words, wrap=True)
+    burst_cycles = int(get_sim_time("ns") - start) // 100
+
+    dut._log.info(f"BURST: {len(pairs)} operand pairs in {single_cycles} clocks as single writes, {burst_cycles} as a burst")
+    assert burst_cycles < 0.6 * single_cycles, f"BURST FAIL: {burst_cycles} clocks, single writes took {single_cycles}"
+
+    # Drain every queued result with one burst from 0x1C
+    await wait_until_not_busy(tqv)
+    results = await tqv.read_burst(0x1C, len(pairs), step=0)
+    for (a, b), result in zip(zip(words[0::2], words[1::2]), results):
+        expected = int(fp16_mul(a, b))
+        dut._log.info(f"BURST: {f16_hex_to_float(a)} * {f16_hex_to_float(b)} = {f16_hex_to_float(result)}")
+        assert result == expected, f"BURST FAIL: MUL {a:#06x} * {b:#06x} = {result:#06x}, expected {expected:#06x}"
+
+    status = await tqv.read_word_reg(0x18)
+    assert status == 0, f"BURST FAIL: queue status {status:#x} after draining"
+
+@cocotb.test()
+async def test_fpu_packed(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    # One write per operation: A in [15:0], B in [31:16]
+    tests = [
+        (0x03, 1.5, 2.25, fp16_add),
+        (0x07, 5.0, 2.0, fp16_sub),
+        (0x0B, -1.5, 2.0, fp16_mul),
+        (0x03, 100.0, 0.01, fp16_add),
+    ]
+
+    for reg, a, b, model in tests:
+        await tqv.write_operands(reg, float_to_f16_hex(a), float_to_f16_hex(b))
+        result = await read_result(tqv)
+        expected = int(model(float_to_f16_hex(a), float_to_f16_hex(b)))
+        dut._log.info(f"PACKED: {reg:#04x} {a} ? {b} = {f16_hex_to_float(result)}")
+        assert result == expected, f"PACKED FAIL: {reg:#04x} {a} ? {b} = {result:#06x}, expected {expected:#06x}"
+
+    # The operand registers show the unpacked operands
+    assert await tqv.read_word_reg(0x00) == float_to_f16_hex(100.0), "PACKED FAIL: operand A readback"
+    assert await tqv.read_word_reg(0x04) == float_to_f16_hex(0.01), "PACKED FAIL: operand B readback"
+
+    # FMA with the addend held in C
+    await tqv.write_word_reg(0x0E, float_to_f16_hex(1.0))
+    await tqv.write_operands(0x0F, float_to_f16_hex(2.0), float_to_f16_hex(3.0))
+    actual = f16_hex_to_float(await read_result(tqv))
+    assert actual == 7.0, f"PACKED FAIL: FMA 2.0 * 3.0 + 1.0 = {actual}"
+
+    # A halfword write to a packed address only writes A, B follows as usual
+    await tqv.write_word_reg(0x3C, 0x7)
+    await tqv.write_hword_reg(0x0B, float_to_f16_hex(1.5))
+    assert await tqv.read_word_reg(0x18) == 0, "PACKED FAIL: halfword write issued a command"
+    await tqv.write_word_reg(0x09, float_to_f16_hex(-4.0))
+    result = await read_result(tqv)
+    expected = int(fp16_mul(float_to_f16_hex(1.5), float_to_f16_hex(-4.0)))
+    assert result == expected, f"PACKED FAIL: halfword A then B = {result:#06x}, expected {expected:#06x}"
+
+    # A batch of MULs in one burst: 32 bits per operation
+    pairs = [(float_to_f16_hex(a), float_to_f16_hex(b)) for a, b in [(1.5, 2.25), (0.1, 0.1), (5.5, 0.5), (-3.0, -0.25)]]
+    await tqv.write_word_reg(0x3C, 0x7)
+    await tqv.write_operands_burst(0x0B, pairs)
+    await wait_until_not_busy(tqv)
+
+    results = await tqv.read_burst(0x1C, len(pairs), step=0)
+    for (a, b), result in zip(pairs, results):
+        expected = int(fp16_mul(a, b))
+        assert result == expected, f"PACKED FAIL: MUL {a:#06x} * {b:#06x} = {result:#06x}, expected {expected:#06x}"
+
+@cocotb.test()
+async def test_fpu_simd(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    # Bit 16 of the configuration register reports the SIMD lanes, bits 17-19 the other optional units
+    await tqv.write_word_reg(0x38, 0x1)
+    config = await tqv.read_word_reg(0x38)
+    if not config & SIMD_BUILT:
+        assert not config & 0x1, f"SIMD FAIL: config {config:#x} on a build without SIMD lanes"
+        dut._log.info("SIMD: not built (make -B SIMD=1 to test it)")
+        return
+    assert config & 0xFFFF == 1, f"SIMD FAIL: config {config:#x}"
+
+    tests = [
+        (0x00, (1.5, -3.5), (2.25, -2.5), fp16_add),
+        (0x04, (5.0, 1.0), (2.0, 2.0), fp16_sub),
+        (0x08, (-1.5, 5.5), (2.0, 0.5), fp16_mul),
+    ]
+
+    def pack(lo, hi):
+        return (float_to_f16_hex(hi) << 16) | float_to_f16_hex(lo)
+
+    # Both lanes in one operand write each, both results in one read
+    for base, a, b, model in tests:
+        await tqv.write_word_reg(base, pack(*a))
+        await tqv.write_word_reg(base + 1, pack(*b))
+        result = await read_result(tqv)
+        for lane in range(2):
+            expected = int(model(float_to_f16_hex(a[lane]), float_to_f16_hex(b[lane])))
+            actual = (result >> (16 * lane)) & 0xFFFF
+            dut._log.info(f"SIMD: lane {lane} {a[lane]} ? {b[lane]} = {f16_hex_to_float(actual)}")
+            assert actual == expected, f"SIMD FAIL: lane {lane} {a[lane]} ? {b[lane]} = {actual:#06x}, expected {expected:#06x}"
+
+    # Operations without a second lane return 0 in the upper half
+    await tqv.write_word_reg(0x0E, float_to_f16_hex(1.0))
+    await tqv.write_word_reg(0x0C, pack(2.0, 4.0))
+    await tqv.write_word_reg(0x0D, pack(3.0, 4.0))
+    result = await read_result(tqv)
+    assert result == float_to_f16_hex(7.0), f"SIMD FAIL: FMA result {result:#010x}"
+
+    # Scalar mode again: the upper half is ignored
+    await tqv.write_word_reg(0x38, 0x0)
+    await tqv.write_word_reg(0x00, pack(1.0, 8.0))
+    await tqv.write_word_reg(0x01, pack(2.0, 8.0))
+    result = await read_result(tqv)
+    assert result == float_to_f16_hex(3.0), f"SIMD FAIL: scalar result {result:#010x}"
+
+@cocotb.test()
+async def test_fpu_blocking_read(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+
+    # A dot product posted in one burst: one read returns the final value
+    pairs = [(1.5, 2.0), (0.5, -4.0), (3.0, 0.25), (-1.25, -2.0)]
+    await tqv.write_word_reg(0x30, float_to_f16_hex(1.0))
+    await tqv.write_operands_burst(0x17, [(float_to_f16_hex(a), float_to_f16_hex(b)) for a, b in pairs])
+    actual = await read_result(tqv)
+    expected = float_to_f16_hex(1.0)
+    for a, b in pairs:
+        expected = int(fp16_fma(float_to_f16_hex(a), float_to_f16_hex(b), expected))
+    dut._log.info(f"BLOCKING: 1.0 + dot({pairs}) = {f16_hex_to_float(actual)}, expected {f16_hex_to_float(expected)}")
+    assert actual == expected, f"BLOCKING FAIL: 1.0 + dot({pairs}) = {actual:#06x}, expected {expected:#06x}"
+
+    # An A waiting for its B does not hold the read off
+    await tqv.write_word_reg(0x08, float_to_f16_hex(3.0))
+    assert await read_result(tqv) == actual, "BLOCKING FAIL: read held off by a staged operand"
+    await tqv.write_word_reg(0x09, float_to_f16_hex(-2.0))
+    actual = f16_hex_to_float(await read_result(tqv))
+    assert actual == -6.0, f"BLOCKING FAIL: 3.0 * -2.0 = {actual}"
+
+async def model_program(tqv):
+    """Register traffic run on both the RTL and the Python model, returns every value read."""
+    trace = []
+
+    async def read(label, reg):
+        trace.append((label, await tqv.read_word_reg(reg)))
+
+    await tqv.reset()
+    await tqv.clear_perf_counters()
+
+    # Two-write and packed operations, including early exits
+    for base, a, b in [(0x00, 1.5, 2.25), (0x04, 5.0, 2.0), (0x08, -1.5, 2.0), (0x00, 1.0, float('inf')),
+                       (0x08, 0.0, 3.0), (0x18, 7.0, 2.0), (0x00, 1024.0, 1e-4)]:
+        await tqv.write_word_reg(base, float_to_f16_hex(a))
+        await tqv.write_word_reg(base + 1, float_to_f16_hex(b))
+        await read(f"{base:#04x} {a} {b}", 0x20)
+    await tqv.write_word_reg(0x0E, float_to_f16_hex(0.5))
+    await tqv.write_operands(0x0F, float_to_f16_hex(3.0), float_to_f16_hex(-1.25))
+    await read("FMA", 0x20)
+
+    # Unary operations start on B alone
+    for reg, b in [(0x1D, 3.0), (0x21, 2.0), (0x25, 0.25)]:
+        await tqv.write_word_reg(reg, float_to_f16_hex(b))
+        await read(f"{reg:#04x} {b}", 0x20)
+    # An ACC posted while the A of an ADD is staged leaves that A waiting
+    await tqv.write_word_reg(0x00, float_to_f16_hex(1.0))
+    await tqv.write_word_reg(0x11, float_to_f16_hex(4.0))
+    await read("ACC staged", 0x20)
+    await tqv.write_word_reg(0x01, float_to_f16_hex(4.0))
+    await read("ADD staged", 0x20)
+    await tqv.write_word_reg(0x28, CVT_F2I | (RTZ << 4))
+    await tqv.write_word_reg(0x29, float_to_f16_hex(-1000.5))
+    await read("CVT", 0x0C)
+    await tqv.write_word_reg(0x2E, FCLASS)
+    await tqv.write_word_reg(0x2D, float_to_f16_hex(-0.0))
+    await read("CMP", 0x20)
+
+    # A dot product in one burst, then queue levels while it runs
+    await tqv.write_word_reg(0x30, float_to_f16_hex(1.0))
+    await tqv.write_operands_burst(0x17, [(float_to_f16_hex(a), float_to_f16_hex(b))
+                                          for a, b in [(1.5, 2.0), (0.5, -4.0), (3.0, 0.25), (-1.25, -2.0)]])
+    await read("status", 0x18)
+    await read("busy", 0x10)
+    await read("MAC", 0x20)
+    await read("acc", 0x30)
+    trace.append(("drain", await tqv.read_burst(0x1C, 5, step=0)))
+    await read("status", 0x18)
+
+    # Completion interrupt
+    await tqv.write_word_reg(0x34, 0x1)
+    await tqv.write_word_reg(0x35, 0x1)
+    await tqv.write_operands(0x1B, float_to_f16_hex(9.0), float_to_f16_hex(3.0))
+    await tqv.wait_for_interrupt(100)
+    await read("pending", 0x35)
+    await read("DIV", 0x0C)
+
+    trace.append(("perf", await tqv.read_perf_counters()))
+    return trace
+
+@cocotb.test()
+async def test_fpu_model(dut):
+    clock = Clock(dut.clk, 100, units="ns")
+    cocotb.start_soon(clock.start())
+
+    # The model is built with the same optional units as the RTL
+    tqv = TinyQV(dut, PERIPHERAL_NUM)
+    await tqv.reset()
+    config = await tqv.read_word_reg(0x38)
+    units = {"simd": SIMD_BUILT, "div_unit": DIV_BUILT, "sqrt_unit": SQRT_BUILT, "cvt_unit": CVT_BUILT}
 
-        # NaN handling (cannot compare equality directly)
-        if math.isnan(expected):
-            assert math.isnan(actual), f"EDGE FAIL: {desc} produced {actual}, expected NaN"
-        elif math.isinf(expected):
-            assert math.isinf(actual) and math.copysign(1.0, actual) == math.copysign(1.0, expected), \
-                f"EDGE FAIL: {desc} produced {actual}, expected {expected}"
-        else:
-            assert abs(actual - expected) < 1e-2, f"EDGE FAIL: {desc} produced {actual}, expected {expected}"
+    start = time.perf_counter()
+    rtl = await model_program(tqv)
+    rtl_time = time.perf_counter() - start
+    start = time.perf_counter()
+    model = await model_program(TinyQVModel(**{unit: bool(config & bit) for unit, bit in units.items()}))
+    model_time = time.perf_counter() - start
+    dut._log.info(f"MODEL: RTL {rtl_time * 1e3:.1f} ms, model {model_time * 1e3:.1f} ms, "
+                  f"{rtl_time / model_time:.0f}x faster")
 
-        dut._log.info(f"EDGE: {desc} -> got {actual}, expected {expected}")
+    for (label, actual), (_, expected) in zip(model, rtl):
+        if label == "perf":
+            # The model counts SPI clocks to within a few per transaction. It
+            # follows the SPI master, bit-banged frames space the writes of A
+            # and B a few clocks differently
+            timed = ("cycles", "reading") if not tqv.use_bfm else ("cycles",)
+            for name in timed:
+                assert abs(actual.pop(name) - expected.pop(name)) < 64, f"MODEL FAIL: {name} {actual} vs {expected}"
+        dut._log.info(f"MODEL: {label} = {actual}")
+        assert actual == expected, f"MODEL FAIL: {label} = {actual}, RTL reads {expected}"
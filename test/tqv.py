@@ -1,18 +1,26 @@
 # SPDX-FileCopyrightText: © 2025 Michael Bell
 # SPDX-License-Identifier: Apache-2.0
 
-from cocotb.triggers import ClockCycles
+import os
 
-from tqv_reg import spi_write_cpha0, spi_read_cpha0
+from cocotb.triggers import ClockCycles, First, RisingEdge
+
+from tqv_reg import spi_write_cpha0, spi_read_cpha0, spi_bfm_write, spi_bfm_read
+from tqv_reg import spi_write_burst_cpha0, spi_read_burst_cpha0, spi_bfm_write_burst, spi_bfm_read_burst
+from fpu_perf import PERF_COUNTERS
 
 # This class provides access to the peripheral's registers.
 # This implementation uses the SPI interface embedded in this project,
 # but when the peripheral is added to TinyQV a different implementation
 # is used that reads and writes the registers using Risc-V commands:
 # https://github.com/MichaelBell/ttsky25a-tinyQV/blob/main/test/tqv.py
+#
+# Transactions go through the SPI master BFM in tb.v when it is present.
+# Set SPI_BITBANG=1 to drive every SPI edge from Python instead.
 class TinyQV:
     def __init__(self, dut, peripheral_num):
         self.dut = dut
+        self.use_bfm = hasattr(dut, "spi_bfm_en") and os.environ.get("SPI_BITBANG", "0") == "0"
 
     # Reset the design, this reset will initialize TinyQV and connect
     # all inputs and outputs to your peripheral.
@@ -22,6 +30,8 @@ class TinyQV:
         self.dut.ui_in.value = 0
         self.dut.uio_in.value = 0
         self.dut.rst_n.value = 0
+        if hasattr(self.dut, "spi_bfm_en"):
+            self.dut.spi_bfm_en.value = int(self.use_bfm)
         await ClockCycles(self.dut.clk, 10)
         self.dut.rst_n.value = 1
         assert self.dut.uio_oe.value == 0b00001011
@@ -30,38 +40,106 @@ class TinyQV:
     # reg is the address of the register in the range 0-15
     # value is the value to be written, in the range 0-255
     async def write_byte_reg(self, reg, value):
-        await spi_write_cpha0(self.dut.clk, self.dut.uio_in, reg, value, 0)
+        if self.use_bfm:
+            await spi_bfm_write(self.dut.clk, self.dut, reg, value, 0)
+        else:
+            await spi_write_cpha0(self.dut.clk, self.dut.uio_in, reg, value, 0)
 
     # Read the value of a byte register from your design
     # reg is the address of the register in the range 0-15
     # The returned value is the data read from the register, in the range 0-255
     async def read_byte_reg(self, reg):
+        if self.use_bfm:
+            return await spi_bfm_read(self.dut.clk, self.dut, reg, 0)
         return await spi_read_cpha0(self.dut.clk, self.dut.uio_in, self.dut.uio_out, self.dut.uio_out[1], reg, 0, 0)
 
     # Write a value to a half word register in your design
     # reg is the address of the register in the range 0-15
     # value is the value to be written, in the range 0-65535
     async def write_hword_reg(self, reg, value):
-        await spi_write_cpha0(self.dut.clk, self.dut.uio_in, reg, value, 1)
+        if self.use_bfm:
+            await spi_bfm_write(self.dut.clk, self.dut, reg, value, 1)
+        else:
+            await spi_write_cpha0(self.dut.clk, self.dut.uio_in, reg, value, 1)
 
     # Read the value of a half word register from your design
     # reg is the address of the register in the range 0-15
     # The returned value is the data read from the register, in the range 0-65535
     async def read_hword_reg(self, reg):
+        if self.use_bfm:
+            return await spi_bfm_read(self.dut.clk, self.dut, reg, 1)
         return await spi_read_cpha0(self.dut.clk, self.dut.uio_in, self.dut.uio_out, self.dut.uio_out[1], reg, 0, 1)
 
     # Write a value to a word register in your design
     # reg is the address of the register in the range 0-15
     # value is the value to be written
     async def write_word_reg(self, reg, value):
-        await spi_write_cpha0(self.dut.clk, self.dut.uio_in, reg, value, 2)
+        if self.use_bfm:
+            await spi_bfm_write(self.dut.clk, self.dut, reg, value, 2)
+        else:
+            await spi_write_cpha0(self.dut.clk, self.dut.uio_in, reg, value, 2)
 
     # Read the value of a word register from your design
     # reg is the address of the register in the range 0-15
     # The returned value is the data read from the register
     async def read_word_reg(self, reg):
+        if self.use_bfm:
+            return await spi_bfm_read(self.dut.clk, self.dut, reg, 2)
         return await spi_read_cpha0(self.dut.clk, self.dut.uio_in, self.dut.uio_out, self.dut.uio_out[1], reg, 0, 2)
 
+    # Write several word registers in one SPI transaction
+    # reg is the address of the first register, values the words to write (1-256)
+    # step is added to the address after every word (0-15, 0 repeats the register)
+    # wrap keeps the address within its aligned register pair, so a burst to
+    # 0x00 with step 1 writes 0x00, 0x01, 0x00, 0x01...
+    async def write_burst(self, reg, values, step=1, wrap=False):
+        assert 1 <= len(values) <= 256 and 0 <= step <= 15
+        if self.use_bfm:
+            await spi_bfm_write_burst(self.dut.clk, self.dut, reg, values, 2, step, int(wrap))
+        else:
+            await spi_write_burst_cpha0(self.dut.clk, self.dut.uio_in, reg, values, 2, step, int(wrap))
+
+    # Read count word registers in one SPI transaction
+    # The address advances as in write_burst, the words are returned as a list
+    async def read_burst(self, reg, count, step=1, wrap=False):
+        assert 1 <= count <= 256 and 0 <= step <= 15
+        if self.use_bfm:
+            return await spi_bfm_read_burst(self.dut.clk, self.dut, reg, count, 2, step, int(wrap))
+        return await spi_read_burst_cpha0(self.dut.clk, self.dut.uio_in, self.dut.uio_out, self.dut.uio_out[1], reg, count, 2, step, int(wrap))
+
+    # Write both fp16 operands of an operation in one word register write
+    # reg is a packed operand address (0x03 ADD, 0x07 SUB, 0x0B MUL, 0x0F FMA, 0x17 MAC)
+    # a goes in bits [15:0] and b in bits [31:16]; the operation starts at once
+    async def write_operands(self, reg, a, b):
+        await self.write_word_reg(reg, ((b & 0xFFFF) << 16) | (a & 0xFFFF))
+
+    # Post several (a, b) operand pairs to a packed operand address in one burst
+    async def write_operands_burst(self, reg, pairs):
+        await self.write_burst(reg, [((b & 0xFFFF) << 16) | (a & 0xFFFF) for a, b in pairs], step=0)
+
+    # Read the FPU's performance counters and return them by name
+    # Each one is selected through 0x3A, then read from 0x3C
+    async def read_perf_counters(self):
+        counters = {}
+        for index, name in enumerate(PERF_COUNTERS):
+            await self.write_word_reg(0x3A, index)
+            counters[name] = await self.read_word_reg(0x3C)
+        return counters
+
+    # Clear all performance counters (0x3C bit 3)
+    async def clear_perf_counters(self):
+        await self.write_word_reg(0x3C, 0x8)
+
     # Check whether the user interrupt is asserted
     async def is_interrupt_asserted(self):
         return self.dut.uio_out[0].value == 1
+
+    # Wait for the user interrupt to be asserted
+    # Blocks on the interrupt edge instead of polling registers over SPI.
+    # timeout is the maximum number of clock cycles to wait
+    async def wait_for_interrupt(self, timeout=1000):
+        if self.dut.user_interrupt.value == 1:
+            return
+        timer = ClockCycles(self.dut.clk, timeout)
+        if await First(RisingEdge(self.dut.user_interrupt), timer) is timer:
+            raise TimeoutError("User interrupt not asserted after timeout")
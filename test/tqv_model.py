@@ -0,0 +1,505 @@
+"""Transaction-level model of tqvp_dsatizabal_fpu behind the TinyQV SPI harness.
+
+``TinyQVModel`` has the same async interface as ``TinyQV`` in tqv.py, so
+host code and test sequences written against one run on the other, but it
+needs no simulator: ``FPUModel`` keeps the register map, the bus and
+execution FSMs, the command and result queues, interrupts and performance
+counters in plain Python, and computes results with the golden model
+(fp16_model.py, ``RTL`` mode, so they are bit-exact).
+
+Time is counted in clock edges since reset. Every operation takes the
+latency of its unit (early exits included), and every SPI transaction the
+clocks of the SPI master in tb.v, so busy, data_ready, queue levels,
+interrupts and the performance counters follow the RTL to within a clock
+or two. The execution side jumps from event to event instead of stepping
+every clock::
+
+    import asyncio
+    from tqv_model import TinyQVModel
+
+    async def main(tqv):
+        await tqv.reset()
+        await tqv.write_operands(0x03, 0x3C00, 0x4000)  # 1.0 + 2.0
+        return await tqv.read_word_reg(0x20)
+
+    asyncio.run(main(TinyQVModel()))
+"""
+
+from collections import deque
+
+from fp16_model import (fp16_add, fp16_sub, fp16_mul, fp16_fma, fp16_div, fp16_recip, fp16_sqrt, fp16_rsqrt,
+                        int16_to_fp16, uint16_to_fp16, fp16_to_int16, fp16_to_bf16, bf16_to_fp16, fp16_to_fp32,
+                        fp16_min, fp16_max, fp16_eq, fp16_lt, fp16_le, fp16_abs, fp16_neg, fp16_class)
+from fpu_perf import PERF_COUNTERS
+
+ADD, SUB, MULT, FMA, ACC, MAC, DIV, RECIP, SQRT, RSQRT, CVT, CMP = range(12)
+
+# Unit latencies in clocks, see the latency table in docs/info.md. A command
+# also spends one clock in OPERANDS_READY and one storing its result
+ADD_CLOCKS = 5
+MUL_CLOCKS = 4
+EARLY_CLOCKS = 1
+DIV_CLOCKS = 8
+RECIP_CLOCKS = 6
+SQRT_CLOCKS = 8
+CVT_CLOCKS = 1
+
+# SPI transactions through the SPI master BFM (HALF_CYCLE = 2), in clocks
+# from the call: the edge a write takes effect on, the clock a read fetches
+# its register (it then waits for data_ready), the spacing of further burst
+# words, and the clocks from the last word to the return
+WRITE_CLOCKS = 262
+WRITE_TAIL_CLOCKS = 1
+BURST_WRITE_CLOCKS = 130
+READ_CLOCKS = 134
+READ_TAIL_CLOCKS = 133
+BURST_READ_CLOCKS = 132
+
+# Registers that never stall a read (see no_wait in the RTL)
+NO_WAIT = (0x18, 0x1C, 0x34, 0x35, 0x38, 0x3A, 0x3C)
+
+# Counters 0-3 are 32 bits wide, the per-opcode counters 16 bits, all wrap
+PERF_MASKS = [0xFFFFFFFF] * 4 + [0xFFFF] * 12
+
+_CVT = {
+    0: lambda b, rm: int(int16_to_fp16(b, rm)),
+    1: lambda b, rm: int(uint16_to_fp16(b, rm)),
+    2: lambda b, rm: (int(fp16_to_int16(b, rm)) ^ 0x8000) - 0x8000 & 0xFFFFFFFF,
+    3: lambda b, rm: int(fp16_to_bf16(b, rm)),
+    4: lambda b, rm: int(bf16_to_fp16(b, rm)),
+    5: lambda b, rm: int(fp16_to_fp32(b)),
+}
+
+_CMP = (fp16_min, fp16_max, fp16_eq, fp16_lt, fp16_le,
+        lambda a, b: fp16_abs(b), lambda a, b: fp16_neg(b), lambda a, b: fp16_class(b))
+
+
+def _special(x):
+    # NaN, Inf or zero
+    return (x & 0x7C00) == 0x7C00 or (x & 0x7FFF) == 0
+
+
+def _adder_early(a, b):
+    # fpu_adder's early exit: a special operand or exponents more than 21 apart
+    exp_a = max((a >> 10) & 0x1F, 1)
+    exp_b = max((b >> 10) & 0x1F, 1)
+    return _special(a) or _special(b) or abs(exp_a - exp_b) > 21
+
+
+class FPUModel:
+    """Registers, queues and timing of tqvp_dsatizabal_fpu.
+
+    write() and read() act on the clock edge ``now``, like one data_write_n
+    or data_read_n strobe of the harness. The execution side catches up
+    with ``now`` whenever the bus looks at it.
+    """
+
+    def __init__(self, simd=False, div_unit=True, sqrt_unit=True, cvt_unit=True, queue_addr_w=2,
+                 perf_counters=2):
+        self.simd = simd
+        self.div_unit = div_unit
+        self.sqrt_unit = sqrt_unit
+        self.cvt_unit = cvt_unit
+        self.depth = 1 << queue_addr_w
+        self.perf_counters = perf_counters
+        self.reset()
+
+    def reset(self):
+        self.now = 0
+        self.operand_a = 0
+        self.operand_b = 0
+        self.operand_c = 0
+        self.accumulator = 0
+        self.operation = 0
+        self.cmp_func = 0
+        self.result = 0
+        self.simd_mode = False
+        self.cmd_overflow = False
+        self.res_overflow = False
+        self.irq_enable = 0
+        self.irq_res_level = 1
+        self.irq_cmd_level = 0
+        self.irq_done = False
+        self.perf_sel = 0
+        self.counts = [0] * len(PERF_COUNTERS)
+        self.cleared_at = 0
+        # Edge of the A write while an A waits for its B (bus side READING)
+        self.reading_since = None
+        # Queued commands: (first edge they can leave the queue, simd, op, c, a, b)
+        self.cmd_queue = deque()
+        self.res_queue = deque()
+        # Command in OPERANDS_READY/CALCULATING: (start edge, done edge, op, result)
+        self.running = None
+        # First edge on which the execution side can take the next command
+        self.free_at = 0
+        self.done_at = None
+
+    # === Execution side ===
+    def _unbuilt(self, op):
+        """An operation whose unit the build leaves out, it returns NaN at once."""
+        return ((not self.div_unit and op in (DIV, RECIP, RSQRT)) or
+                (not self.sqrt_unit and op in (SQRT, RSQRT)) or
+                (not self.cvt_unit and op == CVT))
+
+    def _latency(self, simd, op, c, a, b):
+        """Clocks from the edge that starts a command to the one that stores its result."""
+        if op in (ADD, SUB, ACC):
+            x = self.accumulator if op == ACC else a
+            unit = EARLY_CLOCKS if not simd and _adder_early(x, b) else ADD_CLOCKS
+        elif op == MULT:
+            unit = EARLY_CLOCKS if not simd and (_special(a) or _special(b)) else MUL_CLOCKS
+        elif op in (FMA, MAC):
+            # The product goes into the adder a clock after it leaves the
+            # multiplier (a product that truncates to zero counts as zero)
+            c = c if op == FMA else self.accumulator
+            mul = EARLY_CLOCKS if _special(a) or _special(b) else MUL_CLOCKS
+            add = EARLY_CLOCKS if _adder_early(c, int(fp16_mul(a, b))) else ADD_CLOCKS
+            unit = mul + 1 + add
+        elif op == DIV:
+            unit = DIV_CLOCKS
+        elif op == RECIP:
+            unit = RECIP_CLOCKS
+        elif op == SQRT:
+            unit = SQRT_CLOCKS
+        elif op == RSQRT:
+            unit = SQRT_CLOCKS + 1 + DIV_CLOCKS
+        else:
+            unit = CVT_CLOCKS
+        return unit + 2
+
+    def _compute(self, simd, op, c, a, b):
+        """32-bit result word of a command."""
+        lo_a, lo_b = a & 0xFFFF, b & 0xFFFF
+        if self._unbuilt(op):
+            return 0x7E00
+        if op == CVT:
+            func = _CVT.get(lo_a & 0x7)
+            return func(lo_b, (lo_a >> 4) & 0x7) if func else 0
+        if op == CMP:
+            return int(_CMP[c & 0x7](lo_a, lo_b))
+        lanes = [(lo_a, lo_b)]
+        if simd:
+            lanes.append((a >> 16, b >> 16))
+        words = []
+        for x, y in lanes:
+            if op == ADD:
+                r = fp16_add(x, y)
+            elif op == SUB:
+                r = fp16_sub(x, y)
+            elif op == MULT:
+                r = fp16_mul(x, y)
+            elif op == FMA:
+                r = fp16_fma(x, y, c)
+            elif op == ACC:
+                r = fp16_add(self.accumulator, y)
+            elif op == MAC:
+                r = fp16_fma(x, y, self.accumulator)
+            elif op == DIV:
+                r = fp16_div(x, y)
+            elif op == RECIP:
+                r = fp16_recip(y)
+            elif op == SQRT:
+                r = fp16_sqrt(y)
+            elif op == RSQRT:
+                r = fp16_rsqrt(y)
+            else:
+                r = 0
+            words.append(int(r))
+        return words[0] | (words[1] << 16 if simd else 0)
+
+    def _start(self, edge, simd, op, c, a, b):
+        if op == CMP or self._unbuilt(op):
+            # Single-cycle: stored on the edge that takes the command
+            self._store(edge, op, self._compute(simd, op, c, a, b))
+            self.free_at = edge + 1
+        else:
+            done = edge + self._latency(simd, op, c, a, b)
+            self.running = (edge, done, op, self._compute(simd, op, c, a, b))
+
+    def _store(self, edge, op, result):
+        self.result = result
+        if op in (ACC, MAC):
+            self.accumulator = result & 0xFFFF
+        if len(self.res_queue) == self.depth:
+            self.res_queue.popleft()
+            self.res_overflow = True
+        self.res_queue.append(result)
+        self.irq_done = True
+        self.done_at = edge
+        if edge > self.cleared_at:
+            self.counts[3] += 1
+            self.counts[4 + op] += 1
+
+    def _run(self, until):
+        """Complete and start commands on every edge up to until."""
+        while True:
+            if self.running is not None and self.running[1] <= until:
+                start, done, op, result = self.running
+                self.counts[1] += max(done - max(start, self.cleared_at), 0)
+                self._store(done, op, result)
+                self.running = None
+                self.free_at = done + 1
+            elif self.running is None and self.cmd_queue:
+                edge = max(self.free_at, self.cmd_queue[0][0])
+                if edge > until:
+                    break
+                self._start(edge, *self.cmd_queue.popleft()[1:])
+            else:
+                break
+
+    def next_event(self):
+        """Next edge on which the execution side changes state, or None."""
+        if self.running is not None:
+            return self.running[1]
+        if self.cmd_queue:
+            return max(self.free_at, self.cmd_queue[0][0])
+        return None
+
+    def advance(self, clocks):
+        self.now += clocks
+        self._run(self.now)
+
+    # === Bus side ===
+    def _busy(self):
+        return self.reading_since is not None or bool(self.cmd_queue) or self.running is not None
+
+    def data_ready(self, address):
+        self._run(self.now)
+        if address == 0x20:
+            return not self.cmd_queue and self.running is None
+        return address in NO_WAIT or not self._busy()
+
+    def irq_pending(self):
+        self._run(self.now)
+        return ((len(self.cmd_queue) <= self.irq_cmd_level) << 2 |
+                (len(self.res_queue) >= self.irq_res_level) << 1 |
+                int(self.irq_done))
+
+    def user_interrupt(self):
+        return (self.irq_pending() & self.irq_enable) != 0
+
+    def _perf(self, index):
+        if not self.perf_counters or (index >= 4 and self.perf_counters < 2):
+            return 0
+        since = self.cleared_at
+        if index == 0:
+            count = self.now - since
+        elif index == 1 and self.running is not None:
+            count = self.counts[1] + max(self.now - max(self.running[0], since), 0)
+        elif index == 2 and self.reading_since is not None:
+            count = self.counts[2] + self.now - max(self.reading_since, since)
+        else:
+            count = self.counts[index]
+        return count & PERF_MASKS[index]
+
+    def read(self, address):
+        """data_out for address, with the side effects of the read strobe."""
+        self._run(self.now)
+        status = (len(self.cmd_queue) | len(self.res_queue) << 8 |
+                  self.cmd_overflow << 16 | self.res_overflow << 17)
+        registers = {
+            0x00: self.operand_a,
+            0x04: self.operand_b,
+            0x08: self.operation,
+            0x0C: self.result,
+            0x10: int(self._busy()),
+            0x14: self.operand_c,
+            0x18: status,
+            0x1C: self.res_queue[0] if self.res_queue else 0,
+            0x20: self.result,
+            0x30: self.accumulator,
+            0x34: self.irq_cmd_level << 12 | self.irq_res_level << 8 | self.irq_enable,
+            0x35: self.irq_pending(),
+            0x38: (self.cvt_unit << 19 | self.sqrt_unit << 18 | self.div_unit << 17 | self.simd << 16 |
+                   int(self.simd_mode)),
+            0x3A: self.perf_sel,
+            0x3C: self._perf(self.perf_sel),
+        }
+        value = registers.get(address, 0)
+        if address == 0x1C and self.res_queue:
+            self.res_queue.popleft()
+        return value
+
+    def write(self, address, data, width=2):
+        """One register write on edge now, width 0/1/2 for a byte/halfword/word."""
+        self._run(self.now)
+        edge = self.now
+        data_mask = 0xFFFFFFFF if self.simd else 0xFFFF
+        slot, sel = address >> 2, address & 0x3
+
+        if address >> 4 == 0x3:
+            self._control(address, data)
+            return
+
+        reading = self.reading_since is not None
+        unary = slot in (ACC, RECIP, SQRT, RSQRT, CVT) or (slot == CMP and self.cmp_func >= 5)
+        # Only a full word carries a packed pair, narrower writes only A
+        if sel == 3 and width != 2:
+            sel = 0
+        if sel == 0 and not reading:
+            self.operation = slot
+            self.operand_a = data & data_mask
+            self.reading_since = edge
+        elif sel == 2:
+            # The C slot of CMP selects its function instead
+            if slot == CMP:
+                self.cmp_func = data & 0x7
+            else:
+                self.operand_c = data & 0xFFFF
+        elif sel == 3 or (sel == 1 and (reading or unary)):
+            if sel == 3:
+                op, a, b = slot, data & 0xFFFF, (data >> 16) & 0xFFFF
+            else:
+                op = slot if unary or not reading else self.operation
+                a, b = self.operand_a, data & data_mask
+            simd = self.simd_mode and sel != 3 and op in (ADD, SUB, MULT)
+            # A unary write leaves the staged A of another operation waiting
+            self.operand_b = b
+            if not (sel == 1 and unary and reading and slot != self.operation):
+                self.operation, self.operand_a = op, a
+                if reading:
+                    self.counts[2] += edge - max(self.reading_since, self.cleared_at)
+                    self.reading_since = None
+            # The C field of a CMP carries its function
+            c = self.cmp_func if op == CMP else self.operand_c
+            self._post(edge, simd, op, c, a, b)
+
+    def _post(self, edge, simd, op, c, a, b):
+        if self.running is None and self.free_at <= edge and not self.cmd_queue:
+            self._start(edge, simd, op, c, a, b)
+        elif len(self.cmd_queue) == self.depth:
+            self.cmd_overflow = True
+        else:
+            self.cmd_queue.append((edge + 1, simd, op, c, a, b))
+
+    def _control(self, address, data):
+        if address & 0xC == 0x0:
+            self.accumulator = data & 0xFFFF
+        elif address & 0xF == 0x4:
+            self.irq_enable = data & 0x7
+            self.irq_res_level = (data >> 8) & 0xF
+            self.irq_cmd_level = (data >> 12) & 0xF
+        elif address & 0xF == 0x5:
+            # A completion on the same edge sets DONE again
+            if data & 0x1 and self.done_at != self.now:
+                self.irq_done = False
+        elif address & 0xF == 0x8:
+            self.simd_mode = self.simd and bool(data & 0x1)
+        elif address & 0xF == 0xA:
+            self.perf_sel = data & 0xF
+        elif address & 0xC == 0xC:
+            if data & 0x1:
+                self.cmd_queue.clear()
+            if data & 0x2:
+                self.res_queue.clear()
+            if data & 0x4:
+                self.cmd_overflow = False
+                self.res_overflow = False
+            if data & 0x8:
+                self.counts = [0] * len(PERF_COUNTERS)
+                self.cleared_at = self.now
+
+
+# This class mirrors TinyQV in tqv.py on top of FPUModel. Every transaction
+# advances the model by the clocks the SPI master in tb.v needs for it.
+class TinyQVModel:
+    def __init__(self, dut=None, peripheral_num=0, simd=False, div_unit=True, sqrt_unit=True, cvt_unit=True):
+        self.dut = dut
+        self.fpu = FPUModel(simd=simd, div_unit=div_unit, sqrt_unit=sqrt_unit, cvt_unit=cvt_unit)
+
+    # Reset the model, the clock count restarts at 0
+    async def reset(self):
+        self.fpu.reset()
+
+    async def _write(self, reg, values, width):
+        fpu = self.fpu
+        fpu.advance(WRITE_CLOCKS)
+        for i, value in enumerate(values):
+            if i:
+                fpu.advance(BURST_WRITE_CLOCKS)
+            fpu.write(reg[i], value & (0xFF, 0xFFFF, 0xFFFFFFFF)[width], width)
+        fpu.advance(WRITE_TAIL_CLOCKS)
+
+    async def _read(self, regs, width):
+        fpu = self.fpu
+        values = []
+        fpu.advance(READ_CLOCKS)
+        for i, reg in enumerate(regs):
+            if i:
+                fpu.advance(BURST_READ_CLOCKS)
+            # Wait for data_ready, one execution event at a time
+            while not fpu.data_ready(reg):
+                event = fpu.next_event()
+                if event is None:
+                    raise TimeoutError(f"Read of {reg:#04x} stalls forever: operand A waits for its B")
+                fpu.advance(event - fpu.now)
+            values.append(fpu.read(reg) & (0xFF, 0xFFFF, 0xFFFFFFFF)[width])
+        fpu.advance(READ_TAIL_CLOCKS)
+        return values
+
+    async def write_byte_reg(self, reg, value):
+        await self._write([reg], [value], 0)
+
+    async def read_byte_reg(self, reg):
+        return (await self._read([reg], 0))[0]
+
+    async def write_hword_reg(self, reg, value):
+        await self._write([reg], [value], 1)
+
+    async def read_hword_reg(self, reg):
+        return (await self._read([reg], 1))[0]
+
+    async def write_word_reg(self, reg, value):
+        await self._write([reg], [value], 2)
+
+    async def read_word_reg(self, reg):
+        return (await self._read([reg], 2))[0]
+
+    # Burst addresses advance like the harness: by step, within the aligned
+    # register pair when wrap is set
+    @staticmethod
+    def _burst_addresses(reg, count, step, wrap):
+        addresses = []
+        for _ in range(count):
+            addresses.append(reg)
+            nxt = (reg + step) & 0x3F
+            reg = (reg & ~1) | (nxt & 1) if wrap else nxt
+        return addresses
+
+    async def write_burst(self, reg, values, step=1, wrap=False):
+        assert 1 <= len(values) <= 256 and 0 <= step <= 15
+        await self._write(self._burst_addresses(reg, len(values), step, wrap), values, 2)
+
+    async def read_burst(self, reg, count, step=1, wrap=False):
+        assert 1 <= count <= 256 and 0 <= step <= 15
+        return await self._read(self._burst_addresses(reg, count, step, wrap), 2)
+
+    async def write_operands(self, reg, a, b):
+        await self.write_word_reg(reg, ((b & 0xFFFF) << 16) | (a & 0xFFFF))
+
+    async def write_operands_burst(self, reg, pairs):
+        await self.write_burst(reg, [((b & 0xFFFF) << 16) | (a & 0xFFFF) for a, b in pairs], step=0)
+
+    async def read_perf_counters(self):
+        counters = {}
+        for index, name in enumerate(PERF_COUNTERS):
+            await self.write_word_reg(0x3A, index)
+            counters[name] = await self.read_word_reg(0x3C)
+        return counters
+
+    async def clear_perf_counters(self):
+        await self.write_word_reg(0x3C, 0x8)
+
+    async def is_interrupt_asserted(self):
+        return self.fpu.user_interrupt()
+
+    # Jumps to the edge that raises the interrupt
+    async def wait_for_interrupt(self, timeout=1000):
+        fpu = self.fpu
+        deadline = fpu.now + timeout
+        while not fpu.user_interrupt():
+            event = fpu.next_event()
+            if event is None or event > deadline:
+                fpu.advance(deadline - fpu.now)
+                raise TimeoutError("User interrupt not asserted after timeout")
+            fpu.advance(event - fpu.now)
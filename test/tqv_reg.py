@@ -3,7 +3,7 @@
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles
+from cocotb.triggers import ClockCycles, ReadOnly, RisingEdge
 
 def get_bit(value, bit_index):
   temp = value & (1 << bit_index)
@@ -53,6 +53,7 @@ def spi_miso_read(port):
   return (get_bit (port.value, 3) >> 3)
 
 SPI_HALF_CYCLE_DELAY = 2
+SPI_READ_SETTLE = 4
 
 async def spi_write_cpha0 (clk, port, address, data, width):
 
@@ -222,7 +223,8 @@ async def spi_read_cpha0 (clk, port_in, port_out, data_ready, address, data, wid
   miso_byte = 0
   miso_bit = 0
 
-  await ClockCycles(clk, 1)
+  # data_ready refers to the new address once the harness has decoded it
+  await ClockCycles(clk, SPI_READ_SETTLE)
   data_ready_delay = 0
   while data_ready.value == 0:
     data_ready_delay += 1
@@ -260,3 +262,175 @@ async def spi_read_cpha0 (clk, port_in, port_out, data_ready, address, data, wid
   await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
 
   return miso_byte
+
+
+# Burst transactions: count + 1 data words follow a single command under one
+# CS assertion. The command carries the number of extra words in bits 23-16,
+# the address step in bits 27-24 and, in bit 28, whether the address wraps
+# within its aligned register pair (0x00/0x01 -> 0x00/0x01/0x00...).
+# With count = 0 this is the single frame sent by the functions above.
+
+def spi_burst_command (rw, address, width, count, step, wrap):
+  return (rw << 31) | (width << 29) | (wrap << 28) | (step << 24) | (count << 16) | address
+
+async def spi_shift_out (clk, port, value, nbits):
+  # SPI clock is high on entry and exit, MOSI changes on the falling edge
+  iterator = nbits - 1
+  while iterator >= 0:
+    temp = port.value
+    result = spi_clk_invert(temp)
+    if get_bit(value, iterator) == 0:
+      result2 = spi_mosi_low(result)
+    else:
+      result2 = spi_mosi_high(result)
+    port.value = result2
+    await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+    temp = port.value
+    result = spi_clk_invert(temp)
+    port.value = result
+    await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+    iterator -= 1
+
+async def spi_burst_start (clk, port, command):
+
+  temp = port.value
+  result = pull_cs_high(temp)
+  port.value = result
+  await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+
+  # Pull CS low with the command bit, then the rest of the command word
+  temp = port.value
+  result = pull_cs_low(temp)
+  if get_bit(command, 31) == 0:
+    result2 = spi_mosi_low(result)
+  else:
+    result2 = spi_mosi_high(result)
+  port.value = result2
+  await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+  temp = port.value
+  result = spi_clk_invert(temp)
+  port.value = result
+  await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+
+  await spi_shift_out(clk, port, command, 31)
+
+async def spi_burst_end (clk, port):
+
+  temp = port.value
+  result = spi_clk_invert(temp)
+  port.value = result
+  await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+
+  temp = port.value
+  result = pull_cs_high(temp)
+  port.value = result
+  await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+
+async def spi_write_burst_cpha0 (clk, port, address, values, width, step, wrap):
+
+  await spi_burst_start(clk, port, spi_burst_command(1, address, width, len(values) - 1, step, wrap))
+  for data in values:
+    await spi_shift_out(clk, port, data, 32)
+  await spi_burst_end(clk, port)
+
+async def spi_read_burst_cpha0 (clk, port_in, port_out, data_ready, address, count, width, step, wrap):
+
+  await spi_burst_start(clk, port_in, spi_burst_command(0, address, width, count - 1, step, wrap))
+
+  values = []
+  while len(values) < count:
+    # Give the harness time to decode the (next) register address
+    await ClockCycles(clk, SPI_READ_SETTLE)
+
+    data_ready_delay = 0
+    while data_ready.value == 0:
+      data_ready_delay += 1
+      assert data_ready_delay < 100
+      await ClockCycles(clk, 1)
+
+    miso_word = 0
+    iterator = 31
+    while iterator >= 0:
+      temp = port_in.value
+      result = spi_clk_invert(temp)
+      port_in.value = spi_mosi_low(result)
+      await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+      temp = port_in.value
+      result = spi_clk_invert(temp)
+      port_in.value = result
+      await ClockCycles(clk, SPI_HALF_CYCLE_DELAY)
+      miso_word = miso_word | (spi_miso_read(port_out) << iterator)
+      iterator -= 1
+    values.append(miso_word)
+
+  await spi_burst_end(clk, port_in)
+
+  return values
+
+
+# Fast path: the SPI master BFM in tb.v (spi_master_bfm.v) plays the same
+# frames as the functions above from the simulator, so each transaction costs
+# a couple of coroutine switches instead of one per SPI clock phase.
+
+async def spi_bfm_transaction (clk, dut, rw, address, data, width):
+
+  dut.spi_bfm_rw.value = rw
+  dut.spi_bfm_width.value = width
+  dut.spi_bfm_address.value = address
+  dut.spi_bfm_count.value = 0
+  dut.spi_bfm_wdata.value = data
+  dut.spi_bfm_start.value = 1
+  await RisingEdge(clk)
+  dut.spi_bfm_start.value = 0
+  await RisingEdge(dut.spi_bfm_done)
+  return int(dut.spi_bfm_rdata.value)
+
+
+async def spi_bfm_write (clk, dut, address, data, width):
+  await spi_bfm_transaction(clk, dut, 1, address, data, width)
+
+
+async def spi_bfm_read (clk, dut, address, width):
+  return await spi_bfm_transaction(clk, dut, 0, address, 0, width)
+
+
+# Bursts hand the BFM one data word per word pulse: the next write value is
+# set up as the current word ends, and each read word is collected from rdata.
+
+async def spi_bfm_write_burst (clk, dut, address, values, width, step, wrap):
+
+  dut.spi_bfm_rw.value = 1
+  dut.spi_bfm_width.value = width
+  dut.spi_bfm_address.value = address
+  dut.spi_bfm_count.value = len(values) - 1
+  dut.spi_bfm_step.value = step
+  dut.spi_bfm_wrap.value = wrap
+  dut.spi_bfm_wdata.value = values[0]
+  dut.spi_bfm_start.value = 1
+  await RisingEdge(clk)
+  dut.spi_bfm_start.value = 0
+  for data in values[1:]:
+    await RisingEdge(dut.spi_bfm_word)
+    dut.spi_bfm_wdata.value = data
+  await RisingEdge(dut.spi_bfm_done)
+
+
+async def spi_bfm_read_burst (clk, dut, address, count, width, step, wrap):
+
+  dut.spi_bfm_rw.value = 0
+  dut.spi_bfm_width.value = width
+  dut.spi_bfm_address.value = address
+  dut.spi_bfm_count.value = count - 1
+  dut.spi_bfm_step.value = step
+  dut.spi_bfm_wrap.value = wrap
+  dut.spi_bfm_wdata.value = 0
+  dut.spi_bfm_start.value = 1
+  await RisingEdge(clk)
+  dut.spi_bfm_start.value = 0
+  values = []
+  for _ in range(count):
+    await RisingEdge(dut.spi_bfm_word)
+    await ReadOnly()
+    values.append(int(dut.spi_bfm_rdata.value))
+  await RisingEdge(dut.spi_bfm_done)
+  return values
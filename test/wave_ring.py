@@ -0,0 +1,92 @@
+"""Failure-triggered waveform window (WAVES=ring).
+
+With WAVES=ring the benches are built without a waveform dump, so long
+random runs go at full simulator speed. Instead, each ring_<signal> instance
+of wave_ring.v in the testbench keeps the last WAVE_DEPTH clocks of one
+signal. The Makefiles load this module ahead of the tests, and when a test
+fails it reads the rings back through the simulator and writes them to
+<test>_fail.vcd (in WAVE_DIR if set, regress.py puts it next to the log of
+the job). Passing tests cost no disk at all.
+"""
+
+import logging
+import os
+import re
+
+import cocotb
+
+# "<test> failed..." from the regression manager, possibly colored
+FAILED = re.compile(r"^(\w+) (?:\x1b\[[0-9;]*m)?failed")
+
+
+def rings(top):
+    """(signal name, wave_ring instance) for every ring_* instance under top."""
+    return sorted((handle._name[len("ring_"):], handle) for handle in top if handle._name.startswith("ring_"))
+
+
+def write_vcd(path, top):
+    """Write the windows of all rings under top to a VCD file; False when there are none."""
+    found = rings(top)
+    if not found:
+        return False
+
+    # All rings sample on the same edges, so the first one provides the times
+    # and the clock
+    first = found[0][1]
+    size = len(first.mem)
+    count = int(first.count.value)
+    slots = [(count - n) % size for n in range(min(count, size), 0, -1)]
+    stamps = [int(first.stamp[i].value) for i in slots]
+
+    # A sample holds the value before its edge, which is the value since the
+    # previous edge (the first edge after time 0 has no previous edge)
+    if stamps[0] == 0:
+        slots, stamps = slots[1:], stamps[1:]
+    if not stamps:
+        return False
+    step = stamps[1] - stamps[0] if len(stamps) > 1 else stamps[0]
+    times = [max(stamps[0] - step, 0)] + stamps[:-1]
+
+    with open(path, "w") as f:
+        f.write("$timescale 1ns $end\n")
+        f.write(f"$scope module {top._name} $end\n")
+        f.write("$var wire 1 ! clk $end\n")
+        codes = {}
+        for i, (name, ring) in enumerate(found, 1):
+            codes[name] = chr(33 + i % 94) * (1 + i // 94)
+            f.write(f"$var wire {len(ring.probe)} {codes[name]} {name} $end\n")
+        f.write("$upscope $end\n$enddefinitions $end\n")
+
+        levels = [str(int(first.level[i].value)) for i in slots]
+        samples = {name: [ring.mem[i].value.binstr for i in slots] for name, ring in found}
+        last = {}
+        # The clock changes at its own edge, every sample one edge earlier
+        events = {times[0]: [f"{1 - int(levels[0])}!"]}
+        for k, time in enumerate(times):
+            events.setdefault(time, [])
+            events.setdefault(stamps[k], []).append(f"{levels[k]}!")
+            for name, _ in found:
+                value = samples[name][k]
+                if last.get(name) != value:
+                    last[name] = value
+                    code = codes[name]
+                    events[time].append(f"{value}{code}" if len(value) == 1 else f"b{value} {code}")
+        for time in sorted(events):
+            if events[time]:
+                f.write(f"#{time}\n" + "\n".join(events[time]) + "\n")
+    return True
+
+
+class FailureWaves(logging.Handler):
+    """Writes the ring windows when the regression manager reports a failed test."""
+
+    def emit(self, record):
+        match = FAILED.match(record.getMessage())
+        if not match:
+            return
+        path = os.path.join(os.environ.get("WAVE_DIR", "."), f"{match.group(1)}_fail.vcd")
+        if write_vcd(path, cocotb.top):
+            logging.getLogger("cocotb.wave_ring").warning(f"Waveform window of the failure written to {path}")
+
+
+logging.getLogger("cocotb.regression").addHandler(FailureWaves())
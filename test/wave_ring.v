@@ -0,0 +1,33 @@
+`timescale 1ns / 1ps
+`default_nettype none
+
+`ifndef WAVE_DEPTH
+`define WAVE_DEPTH 1024
+`endif
+
+// Failure-triggered waveform window (WAVES=ring). Keeps the last DEPTH clocks
+// of one signal in memory, sampled just before every clock edge together
+// with the time and direction of the edge. Nothing is written to disk: when
+// a test fails, test/wave_ring.py reads every ring_<signal> instance of the
+// testbench back through the simulator and writes <test>_fail.vcd.
+module wave_ring #(
+    parameter WIDTH = 1,
+    parameter DEPTH = `WAVE_DEPTH
+) (
+    input wire             clk,
+    input wire [WIDTH-1:0] probe
+);
+
+    reg [WIDTH-1:0] mem   [0:2*DEPTH-1];
+    reg [63:0]      stamp [0:2*DEPTH-1];
+    reg             level [0:2*DEPTH-1];
+    reg [31:0]      count = 0;
+
+    always @(posedge clk or negedge clk) begin
+        mem[count % (2 * DEPTH)]   <= probe;
+        stamp[count % (2 * DEPTH)] <= $time;
+        level[count % (2 * DEPTH)] <= clk;
+        count                      <= count + 1;
+    end
+
+endmodule
@@ -0,0 +1,39 @@
+# Waveform capture of the cocotb benches, included by test/Makefile and the
+# component Makefiles after MODULE and VERILOG_SOURCES. WAVES selects it:
+#
+#   1 or vcd  every signal of the testbench in a VCD file (the default)
+#   fst       the same in FST, smaller and quicker to write
+#   ring      no dump: wave_ring.v keeps the last WAVE_DEPTH clocks of the
+#             testbench signals in memory and wave_ring.py writes them to
+#             <test>_fail.vcd when a test fails
+#   0         no waveforms (used by test/regress.py)
+#
+# Under Icarus the dump formats are chosen at run time through plusargs
+# (+nowaves, +fst together with vvp's -fst), ring needs a build.
+WAVES ?= 1
+WAVE_DEPTH ?= 1024
+
+WAVES_MK_DIR := $(dir $(abspath $(lastword $(MAKEFILE_LIST))))
+WAVE_FORMAT = $(if $(filter 1 vcd,$(WAVES)),vcd,$(filter fst,$(WAVES)))
+WAVE_PLUSARGS = $(if $(WAVE_FORMAT),$(if $(filter fst,$(WAVE_FORMAT)),-fst +fst),+nowaves)
+
+ifeq ($(WAVES),ring)
+override MODULE := wave_ring,$(MODULE)
+WAVE_RING_ARGS = -DWAVE_RING -DWAVE_DEPTH=$(WAVE_DEPTH)
+WAVE_RING_SOURCES = $(WAVES_MK_DIR)wave_ring.v
+COMPILE_ARGS += $(WAVE_RING_ARGS)
+VERILOG_SOURCES += $(WAVE_RING_SOURCES)
+endif
+
+# Verilator traces through cocotb (dump.vcd or dump.fst), not through the
+# testbench's $dumpvars
+ifeq ($(SIM),verilator)
+ifeq ($(WAVE_FORMAT),vcd)
+COMPILE_ARGS += --trace --trace-structs
+SIM_ARGS += --trace
+endif
+ifeq ($(WAVE_FORMAT),fst)
+COMPILE_ARGS += --trace-fst --trace-structs
+SIM_ARGS += --trace
+endif
+endif